@@ -0,0 +1,124 @@
+"""
+Annotate recorded games with the C++ engine: every position of every game is
+searched (cpp_gomoku.analyze_batch, on all the CPUs), and the move played is
+written next to the best move found, its score and the nodes searched.
+
+Usage: python analyze_games.py games.txt [-o annotated.tsv] [--depth 5 | --time 0.5]
+                               [--batch 256] [--threads 0]
+
+A game record holds one game per line: its type, then its moves as row,col,
+black first. The types are those of the game window: "normal" and "duo"
+(19x19, with captures) and "special" (15x15, without captures). Blank lines
+and lines starting with # are skipped. For example:
+
+    normal 9,9 9,10 10,10 8,8 11,11
+
+The records are read and the results written a batch of positions at a time,
+so the files can be larger than the memory. The output is tab-separated, one
+line per move played, the score WHITE-positive.
+"""
+import argparse
+import sys
+from itertools import groupby
+
+import numpy as np
+
+from cpp_gomoku import Gomoku, analyze_batch
+
+COLUMNS = ["game", "ply", "side", "played", "best", "score", "nodes", "depth"]
+
+# Board size of each game type, as in the game window (GomokuUi.initialize_game)
+BOARD_SIZES = {"normal": 19, "duo": 19, "special": 15}
+
+
+def parse_move(text):
+    row, col = text.split(",")
+    return int(row), int(col)
+
+
+def read_positions(lines):
+    """
+    Position before each move of each game of the record, one at a time:
+    (game index, game type, ply, move played, board, side to move, captures).
+    """
+    game_index = 0
+    for line_number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        game_type, moves = fields[0], fields[1:]
+        if game_type not in BOARD_SIZES:
+            raise ValueError(f"line {line_number}: unknown game type {game_type!r} "
+                             f"(expected one of {', '.join(BOARD_SIZES)})")
+        game = Gomoku(BOARD_SIZES[game_type], game_type)
+        for ply, text in enumerate(moves):
+            row, col = parse_move(text)
+            if not game.isLegalMove(row, col):
+                raise ValueError(f"line {line_number}: move {ply + 1} ({text}) "
+                                 f"is illegal: {game.getIllegalMoveReason(row, col)}")
+            captures = (game.getBlackPlayerPebblesTaken(), game.getWhitePlayerPebblesTaken())
+            yield (game_index, game_type, ply, (row, col), game.to_array(),
+                   game.getCurrentPlayer(), captures)
+            game.makeMove(row, col)
+            if game.getGameStatus():
+                break
+        game_index += 1
+
+
+def batches(positions, size):
+    """Lists of at most `size` positions of the same game type (so of the same board size)."""
+    for _, same_type in groupby(positions, key=lambda position: position[1]):
+        batch = []
+        for position in same_type:
+            batch.append(position)
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def annotate(lines, output, depth_or_time, batch_size=256, threads=0):
+    """Search the positions of the games of `lines` and write a line per move to `output`."""
+    output.write("\t".join(COLUMNS) + "\n")
+    for batch in batches(read_positions(lines), batch_size):
+        results = analyze_batch(
+            np.stack([position[4] for position in batch]),
+            np.array([position[5] for position in batch], dtype=np.int8),
+            np.array([position[6] for position in batch], dtype=np.int32),
+            depth_or_time,
+            game_type=batch[0][1],
+            threads=threads,
+        )
+        for position, best, score, nodes, depth in zip(
+            batch, results["moves"], results["scores"], results["nodes"], results["depths"]
+        ):
+            game_index, _, ply, played, _, side, _ = position
+            output.write(f"{game_index}\t{ply + 1}\t{'white' if side == 1 else 'black'}\t"
+                         f"{played[0]},{played[1]}\t{best[0]},{best[1]}\t{score:g}\t{nodes}\t{depth}\n")
+        output.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("games")
+    parser.add_argument("-o", "--output")
+    search = parser.add_mutually_exclusive_group()
+    search.add_argument("--depth", type=int, default=5)
+    search.add_argument("--time", type=float, help="seconds per position, instead of a fixed depth")
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=0, help="0: one per CPU")
+    args = parser.parse_args()
+
+    depth_or_time = args.time if args.time is not None else args.depth
+    with open(args.games) as lines:
+        output = open(args.output, "w") if args.output else sys.stdout
+        try:
+            annotate(lines, output, depth_or_time, args.batch, args.threads)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+
+if __name__ == "__main__":
+    main()
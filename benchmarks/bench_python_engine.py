@@ -0,0 +1,93 @@
+"""
+Compare the loop and the NumPy-vectorized versions of the pure-Python rule engine.
+
+Every rule helper is timed on the mid-game positions of bench_search.py, then both
+engines play the same random games and the time per move is reported.
+
+Usage: python benchmarks/bench_python_engine.py [--repeat 200] [--games 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.game._gomoku import Gomoku
+from src.game._vectorized_gomoku import VectorizedGomoku
+from src.game.playerTokens import PlayerToken
+
+from positions import POSITIONS
+
+ENGINES = [("loop", Gomoku), ("vectorized", VectorizedGomoku)]
+
+
+def build_position(engine, black, white):
+    gomoku = engine()
+    for row, col in black:
+        gomoku.board[row, col] = PlayerToken.BLACK.value
+    for row, col in white:
+        gomoku.board[row, col] = PlayerToken.WHITE.value
+    gomoku.current_player = PlayerToken.WHITE.value
+    return gomoku
+
+
+def time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_helpers(repeat):
+    helpers = {
+        "get_all_close_moves": lambda g: g.get_all_close_moves,
+        "_get_number_of_threats": lambda g: lambda: g._get_number_of_threats(PlayerToken.WHITE.value),
+        "_get_all_pebble_of_player": lambda g: lambda: g._get_all_pebble_of_player(PlayerToken.WHITE.value),
+        "_has_5_pebbles_aligned": lambda g: lambda: g._has_5_pebbles_aligned(9, 9),
+        "_is_double_three": lambda g: lambda: g._is_double_three(9, 9),
+    }
+    print(f"{'helper':28} " + " ".join(f"{name:>12}" for name, _ in ENGINES) + "  speedup")
+    for helper, make_call in helpers.items():
+        timings = []
+        for _, engine in ENGINES:
+            games = [build_position(engine, black, white) for black, white in POSITIONS]
+            timings.append(sum(time_call(make_call(g), repeat) for g in games) / len(games))
+        print(f"{helper:28} " + " ".join(f"{t * 1e6:10.1f}us" for t in timings)
+              + f"  x{timings[0] / max(timings[1], 1e-12):.1f}")
+
+
+def play_random_game(engine, seed, max_moves=80):
+    rng = random.Random(seed)
+    gomoku = engine()
+    moves = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while not gomoku.game_over and moves < max_moves:
+            candidates = gomoku.forced_moves or gomoku.get_all_close_moves() or [(9, 9)]
+            gomoku.process_move(*rng.choice(candidates))
+            moves += 1
+    return moves
+
+
+def bench_games(games):
+    for name, engine in ENGINES:
+        start = time.perf_counter()
+        moves = sum(play_random_game(engine, seed) for seed in range(games))
+        elapsed = time.perf_counter() - start
+        print(f"{name:>10}: {moves} moves in {elapsed:.2f}s ({elapsed / moves * 1e3:.2f} ms/move)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--games", type=int, default=3)
+    args = parser.parse_args()
+    bench_helpers(args.repeat)
+    bench_games(args.games)
+
+
+if __name__ == "__main__":
+    main()
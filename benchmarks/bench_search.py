@@ -0,0 +1,73 @@
+"""
+Measure the search speed of the C++ engine (nodes/sec) on fixed mid-game positions.
+
+Usage: python benchmarks/bench_search.py [--depths 3 4] [--repeat 1] [--time-ms 0] [--threads N] [--threats] [--no-quiescence] [--full-width]
+The cpp_gomoku module must be built and importable from the repository root.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cpp_gomoku import Gomoku, GomokuAI
+from src.game.playerTokens import PlayerToken
+
+from positions import POSITIONS
+
+
+def build_position(black, white, game_type="normal"):
+    gomoku = Gomoku(19, game_type)
+    gomoku.addTiles(black, PlayerToken.BLACK.value)
+    gomoku.addTiles(white, PlayerToken.WHITE.value)
+    gomoku.setCurrentPlayer(PlayerToken.WHITE.value)
+    return gomoku
+
+
+def bench(depth, repeat, time_ms=0):
+    total_nodes = 0
+    total_time = 0.0
+    for black, white in POSITIONS:
+        for _ in range(repeat):
+            # Every search starts from an empty transposition table
+            GomokuAI.clearHash()
+            ai = GomokuAI(build_position(black, white))
+            start = time.perf_counter()
+            score, move = ai.minmax(depth, True, True, time_ms)
+            elapsed = time.perf_counter() - start
+            nodes = ai.getNodesSearched()
+            quiescence_nodes = ai.getQuiescenceNodes()
+            total_nodes += nodes
+            total_time += elapsed
+            print(f"  depth {ai.getDepthReached()}/{depth}: move {move} score {score:.1f} nodes {nodes} "
+                  f"(+{quiescence_nodes} quiescence) "
+                  f"time {elapsed:.3f}s ({nodes / max(elapsed, 1e-9):,.0f} nodes/s)")
+    print(f"depth {depth}: {total_nodes} nodes in {total_time:.3f}s "
+          f"-> {total_nodes / max(total_time, 1e-9):,.0f} nodes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[3, 4])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--time-ms", type=int, default=0, help="time limit of each search (0: none)")
+    parser.add_argument("--threads", type=int, default=0, help="search threads (0: one per CPU)")
+    parser.add_argument("--threats", action="store_true",
+                        help="look for a win by threats before the search (the positions are won by fours)")
+    parser.add_argument("--no-quiescence", action="store_true",
+                        help="score the leaves statically, without the quiescence search")
+    parser.add_argument("--full-width", action="store_true",
+                        help="no late move reductions nor null-move pruning")
+    args = parser.parse_args()
+    GomokuAI.setThreadCount(args.threads)
+    GomokuAI.setThreatSearch(args.threats)
+    GomokuAI.setQuiescence(not args.no_quiescence)
+    GomokuAI.setSelectiveSearch(not args.full_width)
+    print(f"{GomokuAI.getThreadCount()} search thread(s)")
+    for depth in args.depths:
+        bench(depth, args.repeat, args.time_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Tactical test suite of the C++ search: the share of positions where it plays one
+of the best moves, with and without the selective search (late move reductions
+and null-move pruning), and the nodes and time it takes.
+
+Usage: python benchmarks/bench_tactics.py [--depths 4 5] [--threads 1]
+The cpp_gomoku module must be built and importable from the repository root.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cpp_gomoku import Gomoku, GomokuAI
+from src.game.playerTokens import PlayerToken
+
+from positions import TACTICS
+
+
+def solve(depth):
+    solved = []
+    nodes = reductions = researches = null_cutoffs = 0
+    start = time.perf_counter()
+    for index, (game_type, black, white, best_moves) in enumerate(TACTICS):
+        gomoku = Gomoku(19, game_type)
+        gomoku.addTiles(black, PlayerToken.BLACK.value)
+        gomoku.addTiles(white, PlayerToken.WHITE.value)
+        gomoku.setCurrentPlayer(PlayerToken.WHITE.value)
+        GomokuAI.clearHash()
+        ai = GomokuAI(gomoku)
+        _, move = ai.minmax(depth, True, False)
+        if move in best_moves:
+            solved.append(index)
+        nodes += ai.getNodesSearched()
+        reductions += ai.getReductions()
+        researches += ai.getResearches()
+        null_cutoffs += ai.getNullMoveCutoffs()
+    elapsed = time.perf_counter() - start
+    print(f"  solved {len(solved)}/{len(TACTICS)}, {nodes} nodes in {elapsed:.3f}s, "
+          f"{reductions} reduced ({researches} searched again), {null_cutoffs} null-move cut-offs")
+    return solved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[4, 5])
+    parser.add_argument("--threads", type=int, default=1, help="search threads (0: one per CPU)")
+    args = parser.parse_args()
+    GomokuAI.setThreadCount(args.threads)
+    # The threat search would solve most positions before the search starts
+    GomokuAI.setThreatSearch(False)
+    for depth in args.depths:
+        print(f"depth {depth}")
+        for selective in (False, True):
+            GomokuAI.setSelectiveSearch(selective)
+            print(" selective search" if selective else " full width")
+            solved = solve(depth)
+        missed = sorted(set(range(len(TACTICS))) - set(solved))
+        if missed:
+            print(f"  missed with the selective search: {missed}")
+
+
+if __name__ == "__main__":
+    main()
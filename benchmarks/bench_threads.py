@@ -0,0 +1,61 @@
+"""
+Measure how the C++ search scales with the number of threads: time to reach a
+fixed depth on the benchmark positions, and the speedup against one thread.
+
+Usage: python benchmarks/bench_threads.py [--depth 6] [--threads 1 2 4 8] [--repeat 3]
+The cpp_gomoku module must be built and importable from the repository root.
+The speedup is only meaningful with at least as many CPUs as threads.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cpp_gomoku import GomokuAI
+
+from bench_search import build_position
+from positions import POSITIONS
+
+
+def time_to_depth(depth, repeat):
+    """Total time and nodes to search every position to `depth`, best of `repeat` runs per position."""
+    total_time = 0.0
+    total_nodes = 0
+    for black, white in POSITIONS:
+        best = None
+        for _ in range(repeat):
+            GomokuAI.clearHash()
+            ai = GomokuAI(build_position(black, white))
+            start = time.perf_counter()
+            ai.minmax(depth, True, True)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best[0]:
+                best = (elapsed, ai.getNodesSearched())
+        total_time += best[0]
+        total_nodes += best[1]
+    return total_time, total_nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # The threat search would solve the positions before the threads start
+    GomokuAI.setThreatSearch(False)
+    print(f"{os.cpu_count()} CPU(s), depth {args.depth}")
+    reference = None
+    for threads in args.threads:
+        GomokuAI.setThreadCount(threads)
+        elapsed, nodes = time_to_depth(args.depth, args.repeat)
+        reference = reference or elapsed
+        print(f"  {threads:2d} thread(s): {elapsed:.3f}s, {nodes} nodes "
+              f"({nodes / max(elapsed, 1e-9):,.0f} nodes/s), speedup x{reference / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
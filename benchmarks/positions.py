@@ -0,0 +1,228 @@
+"""Fixed mid-game positions shared by the benchmarks."""
+
+# (black stones, white stones) of mid-game positions, white (the AI) to play
+POSITIONS = [
+    (
+        [(8, 11), (8, 12), (9, 9), (9, 10), (9, 12), (10, 8), (10, 11), (10, 12), (12, 8)],
+        [(6, 9), (7, 9), (7, 10), (7, 11), (8, 10), (8, 14), (9, 13), (11, 8), (11, 9)],
+    ),
+    (
+        [(7, 4), (7, 8), (8, 7), (9, 8), (9, 9), (9, 11), (9, 12), (10, 10), (11, 8)],
+        [(5, 8), (6, 8), (7, 5), (7, 7), (8, 6), (8, 8), (10, 7), (10, 8), (11, 7)],
+    ),
+    (
+        [(8, 7), (8, 9), (9, 9), (10, 10), (11, 9), (11, 10), (12, 8), (13, 10), (14, 10)],
+        [(6, 9), (7, 10), (8, 13), (9, 8), (9, 12), (10, 8), (10, 11), (12, 10), (15, 11)],
+    ),
+]
+
+
+# Tactical positions, white to play: (game type, black stones, white stones, best moves).
+# The best moves are the only ones a full-width search to depth 4 does not lose with:
+# the forced wins first, then the only defenses against a forced win of black.
+TACTICS = [
+    (
+        "special",
+        [(6, 10), (7, 6), (8, 8), (10, 6), (10, 8), (10, 9), (11, 12), (12, 12)],
+        [(6, 6), (6, 7), (6, 12), (7, 12), (9, 9), (9, 12), (11, 11), (12, 8)],
+        [(8, 12)],
+    ),
+    (
+        "normal",
+        [(6, 6), (7, 9), (8, 8), (9, 6), (9, 10), (10, 6), (10, 7), (10, 12), (11, 6), (12, 10)],
+        [(6, 7), (6, 9), (6, 10), (7, 7), (8, 10), (9, 7), (9, 11), (10, 9), (11, 7), (12, 11)],
+        [(6, 11)],
+    ),
+    (
+        "normal",
+        [(8, 6), (9, 6), (9, 11), (10, 8), (10, 9), (11, 6), (11, 10), (12, 7)],
+        [(6, 9), (6, 10), (7, 9), (8, 9), (9, 8), (10, 10), (11, 7), (12, 9)],
+        [(5, 9)],
+    ),
+    (
+        "special",
+        [(6, 6), (7, 6), (8, 7), (8, 9), (8, 10), (9, 9), (9, 11), (10, 12), (11, 6), (12, 6)],
+        [(6, 7), (6, 11), (7, 8), (7, 11), (7, 12), (8, 8), (10, 6), (10, 11), (11, 11), (12, 9)],
+        [(7, 9)],
+    ),
+    (
+        "special",
+        [(7, 9), (7, 11), (8, 8), (8, 9), (8, 11), (10, 6), (11, 8), (12, 7)],
+        [(7, 6), (7, 12), (9, 7), (9, 9), (9, 11), (10, 9), (10, 12), (11, 6)],
+        [(9, 10)],
+    ),
+    (
+        "normal",
+        [(8, 11), (9, 6), (9, 7), (9, 10), (10, 6), (10, 12), (12, 9)],
+        [(7, 6), (7, 12), (9, 9), (10, 9), (11, 6), (11, 7), (11, 9)],
+        [(7, 10), (8, 9), (11, 8)],
+    ),
+    (
+        "special",
+        [(6, 6), (9, 6), (9, 9), (9, 10), (9, 12), (11, 8), (11, 10), (12, 7), (12, 9)],
+        [(6, 7), (6, 10), (7, 8), (8, 7), (8, 9), (8, 10), (9, 11), (10, 9), (12, 11)],
+        [(5, 6), (8, 8), (8, 11)],
+    ),
+    (
+        "special",
+        [(6, 9), (6, 10), (6, 12), (7, 8), (7, 10), (8, 8), (8, 9), (11, 10), (12, 9), (12, 12)],
+        [(6, 8), (6, 11), (7, 9), (7, 12), (9, 8), (9, 12), (10, 8), (10, 10), (11, 6), (12, 11)],
+        [(5, 7), (9, 11)],
+    ),
+    (
+        "normal",
+        [(6, 8), (7, 7), (9, 10), (10, 6), (10, 12), (12, 6), (12, 10)],
+        [(6, 7), (6, 11), (8, 8), (8, 9), (8, 12), (10, 11), (11, 9)],
+        [(9, 11)],
+    ),
+    (
+        "normal",
+        [(6, 9), (7, 6), (7, 7), (8, 8), (8, 12), (9, 9), (12, 9), (12, 10), (12, 12)],
+        [(6, 12), (7, 12), (8, 7), (8, 11), (9, 6), (9, 10), (9, 12), (10, 10), (10, 11)],
+        [(6, 13), (10, 9)],
+    ),
+    (
+        "normal",
+        [(6, 10), (6, 11), (7, 12), (10, 11), (11, 7), (11, 11), (11, 12), (12, 12)],
+        [(6, 7), (7, 10), (8, 6), (8, 10), (9, 8), (9, 12), (10, 9), (10, 10)],
+        [(11, 10)],
+    ),
+    (
+        "normal",
+        [(6, 6), (6, 8), (9, 7), (9, 10), (9, 12), (10, 7), (10, 10), (11, 8), (11, 10), (12, 9)],
+        [(7, 6), (7, 11), (8, 9), (8, 11), (8, 12), (9, 9), (10, 12), (12, 8), (12, 10), (12, 11)],
+        [(8, 10)],
+    ),
+    (
+        "normal",
+        [(6, 7), (6, 11), (8, 10), (9, 10), (9, 11), (12, 6), (12, 9)],
+        [(6, 6), (8, 9), (9, 8), (9, 9), (10, 7), (11, 9), (12, 8)],
+        [(9, 12), (11, 6), (13, 7)],
+    ),
+    (
+        "normal",
+        [(6, 7), (7, 6), (7, 8), (7, 10), (9, 7), (9, 9), (9, 11), (10, 7), (10, 8), (12, 7)],
+        [(7, 7), (7, 12), (8, 8), (8, 10), (9, 8), (10, 10), (11, 6), (11, 8), (11, 9), (12, 6)],
+        [(11, 7)],
+    ),
+    (
+        "special",
+        [(7, 6), (8, 8), (8, 9), (9, 11), (11, 6), (12, 6), (12, 7)],
+        [(6, 9), (6, 11), (7, 10), (7, 12), (9, 9), (10, 8), (12, 8)],
+        [(6, 10), (6, 12)],
+    ),
+    (
+        "normal",
+        [(7, 7), (7, 9), (8, 9), (8, 11), (9, 11), (10, 7), (11, 9)],
+        [(8, 12), (10, 6), (10, 10), (10, 12), (11, 6), (11, 12), (12, 9)],
+        [(9, 12), (10, 9)],
+    ),
+    (
+        "normal",
+        [(6, 8), (7, 8), (7, 10), (8, 10), (10, 7), (10, 8), (11, 8), (11, 10), (12, 11)],
+        [(6, 10), (6, 11), (8, 11), (9, 10), (10, 10), (10, 12), (11, 7), (11, 11), (12, 10)],
+        [(8, 8), (9, 13), (13, 9)],
+    ),
+    (
+        "normal",
+        [(6, 7), (6, 9), (8, 11), (8, 12), (9, 12), (10, 8), (11, 6), (11, 8), (12, 12)],
+        [(6, 10), (7, 8), (8, 9), (9, 8), (9, 10), (9, 11), (11, 9), (11, 12), (12, 10)],
+        [(6, 11), (9, 9), (10, 11)],
+    ),
+    (
+        "special",
+        [(6, 8), (8, 7), (9, 10), (9, 11), (10, 8), (10, 9), (10, 10), (11, 8), (12, 10)],
+        [(6, 11), (6, 12), (7, 9), (7, 10), (9, 8), (10, 6), (11, 6), (11, 9), (12, 11)],
+        [(5, 12)],
+    ),
+    (
+        "normal",
+        [(6, 6), (7, 7), (8, 9), (9, 9), (10, 10), (10, 11), (11, 6), (11, 9), (12, 6)],
+        [(6, 9), (7, 11), (7, 12), (9, 8), (9, 11), (9, 12), (10, 8), (12, 10), (12, 11)],
+        [(8, 8)],
+    ),
+    (
+        "special",
+        [(6, 7), (7, 8), (7, 12), (8, 6), (9, 10), (9, 12), (10, 10), (11, 9), (12, 8)],
+        [(6, 8), (7, 9), (10, 6), (10, 11), (10, 12), (11, 8), (12, 7), (12, 9), (12, 12)],
+        [(9, 11)],
+    ),
+    (
+        "normal",
+        [(6, 6), (6, 8), (6, 11), (7, 6), (7, 11), (8, 7), (9, 11), (11, 10), (12, 6)],
+        [(6, 12), (7, 9), (10, 6), (10, 12), (11, 8), (11, 11), (12, 7), (12, 8), (12, 12)],
+        [(8, 11)],
+    ),
+    (
+        "normal",
+        [(7, 9), (8, 11), (9, 8), (10, 7), (11, 6), (11, 9), (12, 8), (12, 12)],
+        [(6, 11), (7, 6), (7, 8), (7, 10), (9, 9), (10, 10), (11, 7), (11, 12)],
+        [(8, 9), (12, 5)],
+    ),
+    (
+        "normal",
+        [(6, 9), (7, 12), (9, 7), (9, 10), (10, 9), (11, 7), (11, 11), (12, 7), (12, 10)],
+        [(6, 8), (6, 11), (6, 12), (7, 9), (8, 8), (9, 9), (10, 10), (10, 11), (10, 12)],
+        [(7, 7), (10, 13)],
+    ),
+    (
+        "normal",
+        [(7, 12), (8, 8), (9, 6), (9, 9), (10, 6), (10, 9), (11, 6), (11, 8), (12, 11)],
+        [(6, 6), (6, 8), (6, 11), (7, 6), (8, 12), (10, 8), (12, 9), (12, 10), (12, 12)],
+        [(8, 6), (12, 6)],
+    ),
+    (
+        "normal",
+        [(6, 9), (8, 7), (8, 8), (8, 9), (9, 6), (11, 8), (11, 11), (11, 12), (12, 6), (12, 11)],
+        [(6, 12), (7, 10), (9, 7), (9, 11), (9, 12), (10, 11), (11, 7), (11, 10), (12, 7), (12, 10)],
+        [(13, 7)],
+    ),
+    (
+        "normal",
+        [(8, 11), (8, 12), (9, 11), (10, 12), (11, 12), (12, 9), (12, 12)],
+        [(6, 6), (8, 9), (9, 7), (10, 10), (10, 11), (11, 9), (12, 6)],
+        [(9, 12)],
+    ),
+    (
+        "normal",
+        [(8, 7), (8, 8), (9, 6), (9, 8), (10, 9), (10, 11), (11, 7), (12, 10)],
+        [(7, 9), (8, 11), (9, 10), (10, 7), (10, 10), (10, 12), (11, 12), (12, 6)],
+        [(7, 6), (11, 10)],
+    ),
+    (
+        "normal",
+        [(6, 6), (6, 9), (6, 12), (8, 9), (9, 7), (10, 12), (11, 11), (12, 6), (12, 10)],
+        [(8, 6), (8, 7), (8, 11), (9, 11), (10, 6), (10, 10), (11, 12), (12, 7), (12, 12)],
+        [(9, 13), (13, 9)],
+    ),
+    (
+        "special",
+        [(6, 12), (7, 10), (8, 6), (8, 7), (9, 6), (9, 10), (10, 7), (12, 6), (12, 7), (12, 9)],
+        [(7, 6), (7, 11), (8, 10), (9, 8), (9, 12), (10, 6), (10, 8), (10, 9), (11, 11), (12, 11)],
+        [(11, 7), (11, 10), (13, 12)],
+    ),
+    (
+        "normal",
+        [(6, 7), (6, 9), (6, 10), (6, 11), (7, 8), (7, 11), (9, 10), (11, 11), (12, 6), (12, 9)],
+        [(7, 7), (8, 7), (9, 9), (9, 11), (10, 11), (10, 12), (11, 7), (11, 9), (12, 7), (12, 8)],
+        [(5, 10)],
+    ),
+    (
+        "normal",
+        [(6, 12), (8, 8), (9, 8), (10, 6), (11, 8), (11, 10), (12, 12)],
+        [(6, 9), (7, 7), (7, 9), (8, 12), (11, 11), (12, 9), (12, 10)],
+        [(7, 8), (10, 8), (12, 8)],
+    ),
+    (
+        "normal",
+        [(7, 10), (7, 11), (10, 6), (10, 10), (11, 9), (12, 8), (12, 11)],
+        [(6, 10), (8, 6), (9, 8), (9, 9), (10, 11), (11, 10), (12, 7)],
+        [(9, 11), (13, 7)],
+    ),
+    (
+        "special",
+        [(6, 9), (7, 6), (7, 11), (8, 9), (9, 8), (10, 7), (10, 10), (12, 10)],
+        [(6, 6), (6, 8), (8, 6), (9, 6), (9, 7), (10, 9), (11, 7), (12, 8)],
+        [(7, 10), (11, 6)],
+    ),
+]
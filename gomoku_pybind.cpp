@@ -1,7 +1,10 @@
 #include "gomoku.hpp"
 #include "algo.hpp"
+#include "engine_session.hpp"
+#include "batch_analysis.hpp"
 
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h> // for std::vector, std::pair, etc.
 
 namespace py = pybind11;
@@ -9,14 +12,52 @@ namespace py = pybind11;
 PYBIND11_MODULE(cpp_gomoku, m) {
 	m.doc() = "Pybind11 bindings for Gomoku C++ class";
 
-	py::class_<Gomoku>(m, "Gomoku")
+	py::class_<Gomoku>(m, "Gomoku", py::buffer_protocol())
 		.def(py::init<int, std::string>(), py::arg("boardSize") = 19, py::arg("gameType") = "normal")
+		// Read-only, zero-copy view of the board: numpy.asarray(gomoku) or gomoku.getBoard()
+		.def_buffer([](const Gomoku &self) {
+			ssize_t size = self.getBoardSize();
+			return py::buffer_info(
+				const_cast<int8_t*>(self.getBoardData()), sizeof(int8_t), py::format_descriptor<int8_t>::format(),
+				2, {size, size}, {ssize_t(BitBoard::MAX_SIZE * sizeof(int8_t)), ssize_t(sizeof(int8_t))}, true);
+		})
+		.def("getBoard", [](py::object self) {
+			return py::module_::import("numpy").attr("asarray")(self);
+		})
+		.def("to_array", [](const Gomoku &self) {
+			int size = self.getBoardSize();
+			py::array_t<int8_t> array({size, size});
+			auto out = array.mutable_unchecked<2>();
+			for (int r = 0; r < size; r++)
+				for (int c = 0; c < size; c++)
+					out(r, c) = self.getBoardData()[BitBoard::cellIndex(r, c)];
+			return array;
+		})
+		.def("from_array", [](Gomoku &self, py::array_t<int8_t, py::array::c_style | py::array::forcecast> array) {
+			int size = self.getBoardSize();
+			if (array.ndim() != 2 || array.shape(0) != size || array.shape(1) != size)
+				throw py::value_error("Expected an array of shape (" + std::to_string(size) + ", " + std::to_string(size) + ")");
+			self.setBoardValues(array.data());
+		}, py::arg("board"))
 		.def("clone", &Gomoku::clone)
 		.def("addTiles",&Gomoku::addTiles, py::arg("tiles"), py::arg("player"))
 		.def("processMove", &Gomoku::processMove)
+		.def("makeMove", &Gomoku::makeMove, py::arg("row"), py::arg("col"))
+		.def("unmakeMove", &Gomoku::unmakeMove)
+		.def("getMoveCount", &Gomoku::getMoveCount)
 		.def("process5Pebbles", &Gomoku::process5Pebbles, py::arg("row"), py::arg("col"))
 		.def("isDoubleThree", &Gomoku::isDoubleThree, py::arg("row"), py::arg("col"))
+		.def("isLegalMove", &Gomoku::isLegalMove, py::arg("row"), py::arg("col"))
+		.def("legalMoveMask", [](const Gomoku &self) {
+			int size = self.getBoardSize();
+			py::array_t<uint8_t> mask({size, size});
+			self.getLegalMoveMask(mask.mutable_data());
+			return mask;
+		})
+		.def("getIllegalMoveReason", &Gomoku::getIllegalMoveReason, py::arg("row"), py::arg("col"))
 		.def("getNumberOfThreats", &Gomoku::getNumberOfThreats, py::arg("player"))
+		.def("getNumberOf4Aligned", &Gomoku::getNumberOf4Aligned, py::arg("player"))
+		.def("verifyPatternCounts", &Gomoku::verifyPatternCounts)
 		.def("getBoardSize", &Gomoku::getBoardSize)
 		.def("getGameType", &Gomoku::getGameType)
 		.def("getBoardValue", &Gomoku::getBoardValue)
@@ -24,12 +65,144 @@ PYBIND11_MODULE(cpp_gomoku, m) {
 		.def("getWhitePlayerPebblesTaken", &Gomoku::getWhitePlayerPebblesTaken)
 		.def("getBlackPlayerPebblesTaken", &Gomoku::getBlackPlayerPebblesTaken)
 		.def("getGameStatus", &Gomoku::getGameStatus)
+		.def("getForcedMoves", &Gomoku::getForcedMoves)
 		.def("getAllPossibleMoves", &Gomoku::getAllPossibleMoves)
 		.def("getAllCloseMoves", &Gomoku::getAllCloseMoves)
+		.def("setCloseMovesRadius", &Gomoku::setCloseMovesRadius, py::arg("radius"))
+		.def("getCloseMovesRadius", &Gomoku::getCloseMovesRadius)
+		.def("getHash", &Gomoku::getHash)
+		.def("computeStateHash", &Gomoku::computeStateHash)
 		.def("setCurrentPlayer", &Gomoku::setCurrentPlayer, py::arg("player"))
 		.def("setBlackPlayerPebblesTaken", &Gomoku::setBlackPlayerPebblesTaken, py::arg("pebbles"))
 		.def("setWhitePlayerPebblesTaken", &Gomoku::setWhitePlayerPebblesTaken, py::arg("pebbles"));
 	py::class_<GomokuAI>(m, "GomokuAI")
 		.def(py::init<const Gomoku&>(), py::arg("gomoku"))
-		.def("minmax", &GomokuAI::minmax, py::arg("depth"), py::arg("is_maximizing"), py::arg("is_first") = true);
+		// The search only reads its own copy of the game: other Python threads run meanwhile
+		.def("minmax", &GomokuAI::minmax, py::arg("depth"), py::arg("is_maximizing"), py::arg("is_first") = true,
+			py::arg("time_limit_ms") = 0, py::call_guard<py::gil_scoped_release>())
+		.def("stop", &GomokuAI::stop)
+		.def("getProgress", &GomokuAI::getProgress)
+		.def("setMultiPV", &GomokuAI::setMultiPV, py::arg("count"))
+		.def("getMultiPV", &GomokuAI::getMultiPV)
+		.def("getCandidates", &GomokuAI::getCandidates)
+		.def("getPrincipalVariation", py::overload_cast<>(&GomokuAI::getPrincipalVariation, py::const_))
+		.def("getPrincipalVariation", py::overload_cast<std::pair<int,int>>(&GomokuAI::getPrincipalVariation, py::const_),
+			py::arg("move"))
+		.def("getPonderMove", &GomokuAI::getPonderMove)
+		// Both wait for the running searches to end
+		.def_static("setHashSize", &GomokuAI::setHashSize, py::arg("megabytes"), py::call_guard<py::gil_scoped_release>())
+		.def_static("getHashSize", &GomokuAI::getHashSize)
+		.def_static("clearHash", &GomokuAI::clearHash, py::call_guard<py::gil_scoped_release>())
+		.def_static("getHashfull", &GomokuAI::getHashfull)
+		.def_static("setThreadCount", &GomokuAI::setThreadCount, py::arg("threads"))
+		.def_static("getThreadCount", &GomokuAI::getThreadCount)
+		.def_static("setThreatSearch", &GomokuAI::setThreatSearch, py::arg("enabled"))
+		.def_static("getThreatSearch", &GomokuAI::getThreatSearch)
+		.def_static("setQuiescence", &GomokuAI::setQuiescence, py::arg("enabled"))
+		.def_static("getQuiescence", &GomokuAI::getQuiescence)
+		.def_static("setSelectiveSearch", &GomokuAI::setSelectiveSearch, py::arg("enabled"))
+		.def_static("getSelectiveSearch", &GomokuAI::getSelectiveSearch)
+		.def("getNodesSearched", &GomokuAI::getNodesSearched)
+		.def("getQuiescenceNodes", &GomokuAI::getQuiescenceNodes)
+		.def("getReductions", &GomokuAI::getReductions)
+		.def("getResearches", &GomokuAI::getResearches)
+		.def("getNullMoveCutoffs", &GomokuAI::getNullMoveCutoffs)
+		.def("getDepthReached", &GomokuAI::getDepthReached)
+		.def("getElapsedMs", &GomokuAI::getElapsedMs);
+	py::class_<SearchProgress>(m, "SearchProgress")
+		.def_readonly("running", &SearchProgress::running)
+		.def_readonly("depth", &SearchProgress::depth)
+		.def_readonly("best_move", &SearchProgress::best_move)
+		.def_readonly("score", &SearchProgress::score)
+		.def_readonly("nodes", &SearchProgress::nodes)
+		.def_readonly("elapsed_ms", &SearchProgress::elapsed_ms)
+		.def_readonly("nodes_per_second", &SearchProgress::nodes_per_second);
+	py::class_<AnalysisLine>(m, "AnalysisLine")
+		.def_readonly("score", &AnalysisLine::score)
+		.def_readonly("move", &AnalysisLine::move)
+		.def_readonly("pv", &AnalysisLine::pv);
+	py::class_<Analysis>(m, "Analysis")
+		.def_readonly("score", &Analysis::score)
+		.def_readonly("best_move", &Analysis::best_move)
+		.def_readonly("pv", &Analysis::pv)
+		.def_readonly("lines", &Analysis::lines)
+		.def_readonly("depth", &Analysis::depth)
+		.def_readonly("nodes", &Analysis::nodes)
+		.def_readonly("elapsed_ms", &Analysis::elapsed_ms)
+		.def_readonly("cached", &Analysis::cached);
+	py::class_<EngineSession>(m, "EngineSession")
+		.def(py::init<int, std::string>(), py::arg("boardSize") = 19, py::arg("gameType") = "normal")
+		.def(py::init<const Gomoku&>(), py::arg("gomoku"))
+		.def("push_move", &EngineSession::push_move, py::arg("row"), py::arg("col"))
+		.def("pop_move", &EngineSession::pop_move)
+		.def("game", &EngineSession::game, py::return_value_policy::reference_internal)
+		.def("best_move", &EngineSession::best_move, py::arg("time_ms"),
+			py::arg("max_depth") = EngineSession::MAX_DEPTH, py::call_guard<py::gil_scoped_release>())
+		.def("analyze", &EngineSession::analyze, py::arg("max_depth") = EngineSession::MAX_DEPTH,
+			py::arg("time_ms") = 0, py::arg("multi_pv") = 1, py::call_guard<py::gil_scoped_release>())
+		.def("stop", &EngineSession::stop)
+		.def("getProgress", &EngineSession::getProgress)
+		.def("getPonderMove", &EngineSession::getPonderMove)
+		.def("analysisCount", &EngineSession::analysisCount)
+		.def_readonly_static("MAX_ANALYSES", &EngineSession::MAX_ANALYSES);
+	py::class_<ThreatResult>(m, "ThreatResult")
+		.def_readonly("win", &ThreatResult::win)
+		.def_readonly("complete", &ThreatResult::complete)
+		.def_readonly("sequence", &ThreatResult::sequence)
+		.def_readonly("nodes", &ThreatResult::nodes)
+		.def("__bool__", [](const ThreatResult &self) { return self.win; });
+	// Stacked positions searched on a pool of native threads, without the GIL.
+	// depth_or_time: an int is the depth of every search, a float the time in seconds
+	// of each one (searched up to EngineSession::MAX_DEPTH).
+	m.def("analyze_batch", [](py::array_t<int8_t, py::array::c_style | py::array::forcecast> boards,
+			py::array_t<int8_t, py::array::c_style | py::array::forcecast> side_to_move,
+			py::array_t<int32_t, py::array::c_style | py::array::forcecast> captures,
+			py::object depth_or_time, const std::string &game_type, int threads) {
+		if (boards.ndim() != 3 || boards.shape(1) != boards.shape(2))
+			throw py::value_error("Expected boards of shape (n, size, size)");
+		py::ssize_t count = boards.shape(0);
+		if (side_to_move.ndim() != 1 || side_to_move.shape(0) != count)
+			throw py::value_error("Expected side_to_move of shape (" + std::to_string(count) + ",)");
+		if (captures.ndim() != 2 || captures.shape(0) != count || captures.shape(1) != 2)
+			throw py::value_error("Expected captures of shape (" + std::to_string(count) + ", 2)");
+
+		int depth = EngineSession::MAX_DEPTH;
+		int time_ms = 0;
+		if (py::isinstance<py::float_>(depth_or_time))
+			time_ms = std::max(1, static_cast<int>(depth_or_time.cast<double>() * 1000));
+		else
+			depth = depth_or_time.cast<int>();
+
+		BatchPositions positions;
+		positions.count = static_cast<int>(count);
+		positions.board_size = static_cast<int>(boards.shape(1));
+		positions.game_type = game_type;
+		positions.boards = boards.data();
+		positions.side_to_move = side_to_move.data();
+		positions.captures = captures.data();
+
+		py::array_t<int32_t> moves({count, py::ssize_t(2)});
+		py::array_t<double> scores(count);
+		py::array_t<uint64_t> nodes(count);
+		py::array_t<int32_t> depths(count);
+		BatchResults results{moves.mutable_data(), scores.mutable_data(), nodes.mutable_data(), depths.mutable_data()};
+		{
+			py::gil_scoped_release release;
+			analyze_batch(positions, depth, time_ms, threads, results);
+		}
+
+		py::dict out;
+		out["moves"] = moves;
+		out["scores"] = scores;
+		out["nodes"] = nodes;
+		out["depths"] = depths;
+		return out;
+	}, py::arg("boards"), py::arg("side_to_move"), py::arg("captures"), py::arg("depth_or_time"),
+		py::arg("game_type") = "normal", py::arg("threads") = 0);
+	m.def("solveVCF", &solveVCF, py::arg("game"), py::arg("max_depth") = 12, py::arg("max_nodes") = 100000,
+		py::arg("time_limit_ms") = 0);
+	m.def("solveVCT", &solveVCT, py::arg("game"), py::arg("max_depth") = 6, py::arg("max_nodes") = 100000,
+		py::arg("time_limit_ms") = 0);
+	m.def("solveCaptureRace", &solveCaptureRace, py::arg("game"), py::arg("max_depth") = 10,
+		py::arg("max_nodes") = 100000, py::arg("time_limit_ms") = 0);
 }
\ No newline at end of file
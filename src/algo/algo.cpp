@@ -3,6 +3,7 @@
 
 #include <iostream>
 #include <algorithm>    // std::max, std::min
+#include <cmath>        // std::abs
 #include <limits>       // std::numeric_limits
 #include <cstdlib>      // std::rand, std::srand
 #include <ctime>        // std::time
@@ -10,16 +11,103 @@
 #include <utility>
 #include <iostream>
 #include <thread>
-#include <future>
+#include <mutex>
+#include <shared_mutex>
 #include <random>
-#include <shared_mutex> // Include for shared_mutex
 #include <iomanip>      // Include for std::setprecision
 #include <chrono>
 #include <atomic>
-#include <unordered_map> 
+#include <memory>
 
-std::unordered_map<std::string, double> transposition_table;
-std::shared_mutex transposition_mutex; // Use shared mutex
+// Shared by every GomokuAI and every search thread, kept between searches.
+static TranspositionTable& transposition_table()
+{
+    static TranspositionTable table;
+    return table;
+}
+
+// Held shared by every search (and every read of the table out of a search), and
+// exclusively by setHashSize and clearHash: the table is not reallocated or cleared
+// under a running search, whatever pool it runs on.
+static std::shared_mutex& table_mutex()
+{
+    static std::shared_mutex mutex;
+    return mutex;
+}
+
+// Threads of the root search and their copy of the position, kept between searches.
+// State of one search thread, allocated once and reused by every search.
+struct SearchThread
+{
+    Gomoku state;
+    MoveOrdering ordering;
+    // Gomoku::getMoveCount() of the root position, to know the ply of a node
+    int root_moves = 0;
+};
+
+struct SearchWorkers
+{
+    explicit SearchWorkers(int count = ThreadPool::defaultSize()) : pool(count) {}
+
+    ThreadPool pool;
+    std::vector<SearchThread> threads{static_cast<size_t>(pool.size())};
+    // Held by a whole search: the pool and the threads serve one search at a time.
+    std::mutex mutex;
+};
+
+// Pool of setThreadCount, used by the searches of every thread without LocalSearchWorkers.
+static SearchWorkers& shared_workers()
+{
+    static SearchWorkers workers;
+    return workers;
+}
+
+// Workers of the LocalSearchWorkers living on this thread, if any.
+static thread_local SearchWorkers* t_workers = nullptr;
+
+static SearchWorkers& search_workers()
+{
+    return t_workers ? *t_workers : shared_workers();
+}
+
+LocalSearchWorkers::LocalSearchWorkers()
+    : m_workers(std::make_unique<SearchWorkers>(1)), m_previous(t_workers)
+{
+    t_workers = m_workers.get();
+}
+
+LocalSearchWorkers::~LocalSearchWorkers()
+{
+    t_workers = m_previous;
+}
+
+// Flag that interrupts the search running on this thread: time_up of the running
+// GomokuAI, or for a helper thread, the end of the root move it helps with.
+static thread_local const std::atomic<bool>* t_stop = nullptr;
+
+static bool search_stopped()
+{
+    return t_stop->load(std::memory_order_relaxed);
+}
+
+// State of the search thread running on this thread.
+static thread_local SearchThread* t_thread = nullptr;
+
+// Mixed into the position hash: the same position is scored from the other side
+// when the caller searches it with the other value of is_maximizing.
+static constexpr uint64_t MAXIMIZING_KEY = 0x9E3779B97F4A7C15ULL;
+
+// Scores are stored relative to the score of the position (the heuristic scores are
+// accumulated along the path), except wins and losses which do not depend on it.
+static int32_t score_to_table(double score, double base)
+{
+    return static_cast<int32_t>(std::abs(score) >= 1e6 ? score : score - base);
+}
+
+static double score_from_table(int32_t score, double base)
+{
+    return std::abs(score) >= 1e6 ? score : score + base;
+}
 
 GomokuAI::GomokuAI(const Gomoku& gomoku)
     : m_gomoku(gomoku.clone())
@@ -28,6 +116,115 @@ GomokuAI::GomokuAI(const Gomoku& gomoku)
     std::srand(static_cast<unsigned>(std::time(nullptr)));
 }
 
+void GomokuAI::setHashSize(size_t megabytes)
+{
+    std::unique_lock<std::shared_mutex> table_lock(table_mutex());
+    transposition_table().resize(megabytes);
+}
+
+size_t GomokuAI::getHashSize()
+{
+    return transposition_table().sizeMb();
+}
+
+void GomokuAI::clearHash()
+{
+    // Same order as minmax: the table, then the workers
+    std::unique_lock<std::shared_mutex> table_lock(table_mutex());
+    SearchWorkers& workers = shared_workers();
+    std::lock_guard<std::mutex> lock(workers.mutex);
+    transposition_table().clear();
+    for (SearchThread& thread : workers.threads)
+        thread.ordering.clear();
+}
+
+int GomokuAI::getHashfull()
+{
+    std::shared_lock<std::shared_mutex> table_lock(table_mutex());
+    return transposition_table().hashfull();
+}
+
+void GomokuAI::setThreadCount(int threads)
+{
+    SearchWorkers& workers = shared_workers();
+    std::lock_guard<std::mutex> lock(workers.mutex);
+    workers.pool.resize(threads);
+    workers.threads.resize(workers.pool.size());
+}
+
+int GomokuAI::getThreadCount()
+{
+    return shared_workers().pool.size();
+}
+
+static std::atomic<bool> threat_search_enabled = true;
+
+void GomokuAI::setThreatSearch(bool enabled)
+{
+    threat_search_enabled = enabled;
+}
+
+bool GomokuAI::getThreatSearch()
+{
+    return threat_search_enabled;
+}
+
+static std::atomic<bool> quiescence_enabled = true;
+
+void GomokuAI::setQuiescence(bool enabled)
+{
+    quiescence_enabled = enabled;
+}
+
+bool GomokuAI::getQuiescence()
+{
+    return quiescence_enabled;
+}
+
+static std::atomic<bool> selective_search_enabled = true;
+
+void GomokuAI::setSelectiveSearch(bool enabled)
+{
+    selective_search_enabled = enabled;
+}
+
+bool GomokuAI::getSelectiveSearch()
+{
+    return selective_search_enabled;
+}
+
+uint64_t GomokuAI::getNodesSearched() const
+{
+    return m_nodes.load();
+}
+
+uint64_t GomokuAI::getQuiescenceNodes() const
+{
+    return m_quiescence_nodes.load();
+}
+
+uint64_t GomokuAI::getReductions() const
+{
+    return m_reductions.load();
+}
+
+uint64_t GomokuAI::getResearches() const
+{
+    return m_researches.load();
+}
+
+uint64_t GomokuAI::getNullMoveCutoffs() const
+{
+    return m_null_cutoffs.load();
+}
+
+// One generator per thread: the root moves are searched concurrently.
+static std::mt19937& search_rng()
+{
+    thread_local std::mt19937 rng(std::random_device{}());
+    return rng;
+}
+
 std::pair<int,int> GomokuAI::random_move()
 {
     // In your Python code, random_move picks from either get_all_possible_moves(player)
@@ -82,127 +279,768 @@ double GomokuAI::get_score_for_position(const std::string& gameType)
 
     return score;
 }
-ScoredMove GomokuAI::minmax(int depth, bool is_maximizing, bool is_first)
+ScoredMove GomokuAI::minmax(int depth, bool is_maximizing, bool is_first, int time_limit_ms)
 {
-    static std::random_device rd;
-    static std::mt19937 rng(rd());
-    
+    auto start = std::chrono::steady_clock::now();
+    std::shared_lock<std::shared_mutex> table_lock(table_mutex());
+    transposition_table().newSearch();
+    m_nodes = 0;
+    m_quiescence_nodes = 0;
+    m_reductions = 0;
+    m_researches = 0;
+    m_null_cutoffs = 0;
+    // Cleared before m_stopped is read: a stop() between the two still sets time_up after it
+    time_up = false;
+    if (m_stopped.load())
+        time_up = true;
+    t_stop = &time_up;
+    m_depth_reached = 0;
+    m_elapsed_ms = 0.0;
+    m_time_limited = time_limit_ms > 0;
+    m_deadline = start + std::chrono::milliseconds(time_limit_ms);
+    m_is_maximizing = is_maximizing;
+    m_candidates.clear();
+    {
+        std::lock_guard<std::mutex> lock(m_progress_mutex);
+        m_start = start;
+        m_progress = SearchProgress();
+        m_progress.running = true;
+    }
+
     if (m_gomoku.isBoardEmpty()) {
-        return {0.0, random_move()};
+        ScoredMove opening = {0.0, random_move()};
+        m_candidates = {opening};
+        publish_progress(false, 0, opening);
+        return opening;
     }
-    
-    // Use forced moves if available; otherwise, get all close moves.
-    auto forced_moves = m_gomoku.getForcedMoves();
-    
-	std::vector<std::pair<int, int>> possible_moves = 
-		(!forced_moves.empty()) ? forced_moves : m_gomoku.getAllCloseMoves();
-	
-	if (possible_moves.empty()) {
+
+    MoveList root_moves;
+    generate_moves(m_gomoku, root_moves);
+
+	if (root_moves.empty()) {
         std::cout << "No possible moves\n";
+        publish_progress(false, 0, {0.0, {-1, -1}});
         return {0.0, {-1, -1}};
     }
-    
-    // Randomize move order
-    std::shuffle(possible_moves.begin(), possible_moves.end(), rng);
-    
+
+    // Scores of the search are seen from the side to move, the caller expects WHITE-positive ones.
+    double color = is_maximizing ? 1.0 : -1.0;
+
+    ScoredMove win;
+    if (threat_search_enabled && solve_threats(m_gomoku, root_moves, depth, time_limit_ms, win)) {
+        m_depth_reached = depth;
+        m_elapsed_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+        ScoredMove result = {color * win.first, win.second};
+        m_candidates = {result};
+        publish_progress(false, depth, result);
+        return result;
+    }
+
+    SearchWorkers& workers = search_workers();
+    std::lock_guard<std::mutex> lock(workers.mutex);
+    bool captures = m_gomoku.getGameType() != "special";
+    for (SearchThread& thread : workers.threads)
+        thread.ordering.newSearch(captures);
+    t_thread = &workers.threads[0];
+    Gomoku& state = t_thread->state;
+    state = m_gomoku;
+    t_thread->root_moves = state.getMoveCount();
+    t_thread->ordering.order(state, root_moves.moves.data(), root_moves.size, MoveOrdering::NO_MOVE, 0);
+
+    // Iterative deepening: each iteration starts with the best move of the previous one
+    // and centers its aspiration window on its score. An iteration interrupted by the
+    // time limit is thrown away.
+    ScoredMove best = {color * state.getScore(), root_moves.moves[0]};
+    std::vector<ScoredMove> candidates;
+    for (int current_depth = 1; current_depth <= depth; current_depth++) {
+        // Several exact scores need the full window
+        ScoredMove result = (m_multi_pv > 1)
+            ? search_root(state, root_moves, current_depth, -SCORE_INF, SCORE_INF, is_maximizing, is_first,
+                          m_multi_pv, &candidates)
+            : aspiration_search(state, root_moves, current_depth, best.first, is_maximizing, is_first);
+        if (time_up)
+            break;
+        best = result;
+        m_depth_reached = current_depth;
+        if (m_multi_pv == 1)
+            candidates = {best};
+        m_candidates.clear();
+        for (const ScoredMove& candidate : candidates)
+            m_candidates.push_back({color * candidate.first, candidate.second});
+        publish_progress(true, current_depth, {color * best.first, best.second});
+        // The best moves lead the next iteration, in order
+        for (auto candidate = candidates.rbegin(); candidate != candidates.rend(); ++candidate) {
+            auto move = std::find(root_moves.begin(), root_moves.end(), candidate->second);
+            std::rotate(root_moves.begin(), move, move + 1);
+        }
+        auto best_move = std::find(root_moves.begin(), root_moves.end(), best.second);
+        std::rotate(root_moves.begin(), best_move, best_move + 1);
+    }
+
+    m_elapsed_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+    ScoredMove result = {color * best.first, best.second};
+    publish_progress(false, m_depth_reached, result);
+    return result;
+}
+
+void GomokuAI::stop()
+{
+    m_stopped = true;
+    time_up = true;
+}
+
+void GomokuAI::publish_progress(bool running, int depth, const ScoredMove& best)
+{
+    std::lock_guard<std::mutex> lock(m_progress_mutex);
+    m_progress.running = running;
+    m_progress.depth = depth;
+    m_progress.best_move = best.second;
+    m_progress.score = best.first;
+    if (!running) {
+        m_best_move = best.second;
+        m_progress.elapsed_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - m_start).count();
+    }
+}
+
+std::vector<std::pair<int,int>> GomokuAI::table_line(Gomoku state, bool is_maximizing, int length)
+{
+    std::shared_lock<std::shared_mutex> table_lock(table_mutex());
+    std::vector<std::pair<int,int>> line;
+    while (static_cast<int>(line.size()) < length && !state.getGameStatus()) {
+        // The forced moves depend on the previous move: the search does not store them
+        std::pair<int,int> move;
+        const auto& forced = state.getForcedMoves();
+        TranspositionTable::Entry entry;
+        uint64_t key = state.getHash() ^ (is_maximizing ? MAXIMIZING_KEY : 0);
+        if (!forced.empty())
+            move = forced.front();
+        else if (transposition_table().probe(key, entry) && entry.move != TranspositionTable::NO_MOVE)
+            move = {BitBoard::cellRow(entry.move), BitBoard::cellCol(entry.move)};
+        else
+            break;
+        if (!state.isLegalMove(move.first, move.second) || !std::get<0>(state.makeMove(move.first, move.second)))
+            break;
+        line.push_back(move);
+        is_maximizing = !is_maximizing;
+    }
+    return line;
+}
+
+void GomokuAI::setMultiPV(int count)
+{
+    m_multi_pv = std::max(1, count);
+}
+
+int GomokuAI::getMultiPV() const
+{
+    return m_multi_pv;
+}
+
+std::vector<ScoredMove> GomokuAI::getCandidates() const
+{
+    return m_candidates;
+}
+
+void GomokuAI::publish_result(int depth, bool is_maximizing, const std::vector<ScoredMove>& candidates)
+{
+    m_is_maximizing = is_maximizing;
+    m_nodes = 0;
+    m_quiescence_nodes = 0;
+    m_reductions = 0;
+    m_researches = 0;
+    m_null_cutoffs = 0;
+    m_depth_reached = depth;
+    m_elapsed_ms = 0.0;
+    m_candidates = candidates;
+    ScoredMove best = candidates.empty() ? ScoredMove{0.0, {-1, -1}} : candidates.front();
+    {
+        std::lock_guard<std::mutex> lock(m_progress_mutex);
+        m_start = std::chrono::steady_clock::now();
+    }
+    publish_progress(false, depth, best);
+}
+
+std::vector<std::pair<int,int>> GomokuAI::getPrincipalVariation() const
+{
+    return getPrincipalVariation(m_best_move);
+}
+
+std::vector<std::pair<int,int>> GomokuAI::getPrincipalVariation(std::pair<int,int> move) const
+{
+    std::vector<std::pair<int,int>> line;
+    if (move.first < 0 || !m_gomoku.isLegalMove(move.first, move.second))
+        return line;
+    Gomoku state = m_gomoku;
+    state.makeMove(move.first, move.second);
+    line.push_back(move);
+    // The replies are searched with the other value of is_maximizing (see evaluate_move)
+    for (const auto& reply : table_line(state, !m_is_maximizing, std::max(m_depth_reached, 1) - 1))
+        line.push_back(reply);
+    return line;
+}
+
+std::pair<int,int> GomokuAI::getPonderMove() const
+{
+    std::vector<std::pair<int,int>> line = getPrincipalVariation();
+    if (line.size() == 1) {
+        // The table may know the reply beyond the depth reached
+        Gomoku state = m_gomoku;
+        state.makeMove(line[0].first, line[0].second);
+        for (const auto& move : table_line(state, !m_is_maximizing, 1))
+            line.push_back(move);
+    }
+    return line.size() >= 2 ? line[1] : std::make_pair(-1, -1);
+}
+
+SearchProgress GomokuAI::getProgress() const
+{
+    SearchProgress progress;
+    {
+        std::lock_guard<std::mutex> lock(m_progress_mutex);
+        progress = m_progress;
+        if (progress.running)
+            progress.elapsed_ms = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - m_start).count();
+    }
+    progress.nodes = m_nodes.load() + m_quiescence_nodes.load();
+    if (progress.elapsed_ms > 0)
+        progress.nodes_per_second = progress.nodes * 1000.0 / progress.elapsed_ms;
+    return progress;
+}
+
+int GomokuAI::getDepthReached() const
+{
+    return m_depth_reached;
+}
+
+double GomokuAI::getElapsedMs() const
+{
+    return m_elapsed_ms;
+}
+
+bool GomokuAI::solve_threats(const Gomoku& state, MoveList& root_moves, int depth, int time_limit_ms,
+                             ScoredMove& win)
+{
+    // A breakable five of the opponent leaves a single kind of move: the search handles it.
+    if (!state.getForcedMoves().empty())
+        return false;
+    int budget_ms = time_limit_ms > 0 ? std::max(1, time_limit_ms / 20) : 0;
+
+    // Once a player has taken 6 stones, captures win races too: the search by fours
+    // becomes a capture race, which also plays the captures and the threats to capture.
+    std::string type = state.getGameType();
+    bool capture_race = (type == "normal" || type == "duo")
+        && std::max(state.getWhitePlayerPebblesTaken(), state.getBlackPlayerPebblesTaken()) >= 6;
+    auto solve_fours = [&](const Gomoku& game, uint64_t nodes) {
+        return capture_race ? solveCaptureRace(game, 10, nodes, budget_ms) : solveVCF(game, 12, nodes, budget_ms);
+    };
+
+    ThreatResult result = solve_fours(state, THREAT_NODES);
+    // The threes widen the tree a lot: the VCT is deepened one attacking move at a
+    // time, so that a short win is found before the budget goes to the long lines.
+    for (int vct_depth = 2; vct_depth <= 6 && !result.win; vct_depth++) {
+        result = solveVCT(state, vct_depth, THREAT_NODES, budget_ms);
+        if (!result.complete)
+            break;
+    }
+    if (result.win) {
+        // Scored like the search would: the win comes (sequence size - 1) plies after the root.
+        int plies = static_cast<int>(result.sequence.size()) - 1;
+        win = {1e6 + std::max(0, depth - plies), result.sequence.front()};
+        return true;
+    }
+
+    // Would the opponent win by fours (or captures) if it were to move? Then only the
+    // root moves after which it no longer does are worth searching (the search has
+    // them all if none of them does).
+    Gomoku opponent = state.clone();
+    opponent.setCurrentPlayer(-state.getCurrentPlayer());
+    ThreatResult threat = solve_fours(opponent, THREAT_NODES);
+    if (!threat.win)
+        return false;
+
+    std::vector<std::pair<int,int>> defenses = threatDefenses(state, threat);
+    Gomoku child = state.clone();
+    int kept = 0;
+    for (const auto& mv : root_moves) {
+        if (std::find(defenses.begin(), defenses.end(), mv) == defenses.end())
+            continue;
+        if (!std::get<0>(child.makeMove(mv.first, mv.second)))
+            continue;
+        bool stops = child.getGameStatus() || !solve_fours(child, THREAT_NODES / 4).win;
+        child.unmakeMove();
+        if (stops)
+            root_moves.moves[kept++] = mv;
+    }
+    if (kept > 0)
+        root_moves.size = kept;
+    return false;
+}
+
+ScoredMove GomokuAI::aspiration_search(Gomoku& state, const MoveList& moves, int depth, double guess,
+                                       bool is_maximizing, bool break_ties)
+{
+    // The root is first searched in a small window around the guess, and the window
+    // is widened on the side that failed until the score falls inside it (or the
+    // window covers every score).
+    double delta = ASPIRATION_WINDOW;
+    double alpha = guess - delta;
+    double beta  = guess + delta;
+    while (true) {
+        ScoredMove result = search_root(state, moves, depth, alpha, beta, is_maximizing, break_ties);
+        double score = result.first;
+        bool fail_low  = score <= alpha && alpha > -SCORE_INF;
+        bool fail_high = score >= beta && beta < SCORE_INF;
+        if (time_up || (!fail_low && !fail_high))
+            return result;
+
+        delta *= 4;
+        if (fail_low)
+            alpha = (score - delta > -SCORE_INF) ? score - delta : -SCORE_INF;
+        if (fail_high)
+            beta = (score + delta < SCORE_INF) ? score + delta : SCORE_INF;
+        // Wins and losses are far from any heuristic score, open the window at once.
+        if (std::abs(score) >= 1e6) {
+            alpha = -SCORE_INF;
+            beta  = SCORE_INF;
+        }
+    }
+}
+
+void GomokuAI::generate_moves(const Gomoku& state, MoveList& moves)
+{
+    moves.size = 0;
+
+    // Use forced moves if available; otherwise, get all close moves.
+    const auto& forced_moves = state.getForcedMoves();
+    if (!forced_moves.empty()) {
+        for (const auto& mv : forced_moves)
+            moves.push(mv.first, mv.second);
+    } else {
+        // The frontier changes while the moves are searched, so it is copied first.
+        for (int cell : state.getFrontier())
+            moves.push(BitBoard::cellRow(cell), BitBoard::cellCol(cell));
+    }
+
+    // Skip the moves the rules forbid. If none is left, they are kept and the search
+    // scores them as invalid, as before.
+    int legal = 0;
+    for (const auto& mv : moves)
+        if (state.isLegalMove(mv.first, mv.second))
+            moves.moves[legal++] = mv;
+    if (legal > 0)
+        moves.size = legal;
+}
+
+ScoredMove GomokuAI::search_root(Gomoku& state, const MoveList& moves, int depth, double alpha, double beta,
+                                 bool is_maximizing, bool break_ties, int multi_pv,
+                                 std::vector<ScoredMove>* candidates)
+{
+    SearchWorkers& workers = search_workers();
     std::vector<std::pair<int, int>> best_moves;
-    double best_score = is_maximizing ? minus_infinity() : plus_infinity();
-    
-    // Initialize alpha–beta values. Mimic alpha-beta pruning
-	double alpha = -500;
-	double beta  = 500;
-    
-    // Lambda to update the best move(s)
-    auto update_best = [&](double score, const std::pair<int, int>& move) {
-        if ((is_maximizing && score > best_score) || (!is_maximizing && score < best_score)) {
+    double best_score = -SCORE_INF;
+
+    // The root moves are shared out between the threads of the pool: each thread takes
+    // the next move of the list, and the best score is shared, so every move is searched
+    // with the tightest bound known when it starts. The first move (the best one of the
+    // previous iteration) is searched first, in the full window, to get that bound.
+    //
+    // A thread that finds no move left to take helps a move still being searched
+    // (Lazy SMP): it searches the same move, one ply deeper every other thread, and
+    // throws the result away. The useful part is what it leaves in the shared
+    // transposition table, so deep searches with few root moves (or a single forced
+    // one) still use every thread. The helper stops when the owner of the move is done.
+    // done[i] is set when the owner of move i has finished searching it, and stops its helpers.
+    std::array<std::atomic<bool>, Frontier::MAX_CELLS> done;
+    std::array<std::atomic<int>, Frontier::MAX_CELLS> helpers;
+    for (int i = 0; i < moves.size; i++) {
+        done[i] = false;
+        helpers[i] = 0;
+    }
+
+    std::mutex best_mutex;
+    std::atomic<double> shared_best = -SCORE_INF;
+    // Multi-PV: the moves with an exact score, best first, and the multi_pv-th best
+    // score, which takes the place of the best one as the bound of the next moves.
+    std::vector<ScoredMove> scored;
+    std::atomic<double> kth_best = -SCORE_INF;
+    std::atomic<bool> first_done = false;
+    std::atomic<int> next_move = 1;
+
+    // Each thread plays on its own copy of the root position.
+    for (int thread = 1; thread < workers.pool.size(); thread++) {
+        workers.threads[thread].state = state;
+        workers.threads[thread].root_moves = t_thread->root_moves;
+    }
+
+    auto own_move = [&](Gomoku& local, int index) {
+        const auto& mv = moves.moves[index];
+        double score;
+        double bound = alpha;
+        if (index == 0) {
+            score = evaluate_move(local, mv.first, mv.second, depth, alpha, beta, is_maximizing);
+        } else {
+            // Only the moves at least as good as the best one matter: a null window just
+            // below the best score tells them apart, and they are searched again in the
+            // full window to get their exact score (the ties are kept to pick among them).
+            bound = std::max(alpha, (candidates ? kth_best.load() : shared_best.load()) - 1);
+            score = evaluate_move(local, mv.first, mv.second, depth, bound, bound + 1, is_maximizing);
+            if (score > bound && score < beta && !search_stopped())
+                score = evaluate_move(local, mv.first, mv.second, depth, bound, beta, is_maximizing);
+        }
+        done[index] = true;
+        if (search_stopped())
+            return;
+
+        std::lock_guard<std::mutex> lock(best_mutex);
+        if (score > best_score) {
             best_score = score;
             best_moves.clear();
-            best_moves.push_back(move);
-        } else if (score == best_score) {
-            best_moves.push_back(move);
+            best_moves.push_back(mv);
+            shared_best = score;
+        } else if (score == best_score && score > alpha) {
+            best_moves.push_back(mv);
         }
+        if (candidates && score > bound) {
+            auto position = std::upper_bound(scored.begin(), scored.end(), score,
+                                             [](double value, const ScoredMove& other) { return value > other.first; });
+            scored.insert(position, {score, mv});
+            if (static_cast<int>(scored.size()) >= multi_pv)
+                kth_best = scored[multi_pv - 1].first;
+        }
+    };
+
+    auto help_move = [&](Gomoku& local, int thread, int index) {
+        const auto& mv = moves.moves[index];
+        double bound = (index == 0) ? alpha : std::max(alpha, shared_best.load() - 1);
+        double upper = (index == 0) ? beta : bound + 1;
+        int helper_depth = depth + (thread & 1);
+
+        helpers[index]++;
+        t_stop = &done[index];
+        evaluate_move(local, mv.first, mv.second, helper_depth, bound, upper, is_maximizing);
+        t_stop = &time_up;
+        helpers[index]--;
     };
-    
-    if (is_first) {
-        // In the first layer we use parallel evaluation.
-        // (Alpha-beta pruning is not applied here since each branch is in its own thread.)
-        std::vector<std::future<ScoredMove>> futures;
-        futures.reserve(possible_moves.size());
-        
-        for (const auto& mv : possible_moves) {
-            futures.emplace_back(std::async(std::launch::async, [this, mv, depth, is_maximizing]() {
-                return evaluate_move(mv.first, mv.second, depth, is_maximizing, m_gomoku.getGameType());
-            }));
-        }
-        
-        for (auto& fut : futures) {
-            auto [score, move] = fut.get();
-            update_best(score, move);
-            // No safe way to prune here because the moves have already been launched
+
+    workers.pool.run([&](int thread) {
+        t_thread = &workers.threads[thread];
+        Gomoku& local = (thread == 0) ? state : t_thread->state;
+        t_stop = &time_up;
+        if (thread == 0) {
+            own_move(local, 0);
+            first_done = true;
         }
-    } else {
-        // Sequential evaluation with alpha–beta pruning.
-        for (const auto& mv : possible_moves) {
-            auto [score, move] = evaluate_move(mv.first, mv.second, depth, is_maximizing, m_gomoku.getGameType());
-            update_best(score, move);
-            
-            // Update alpha or beta based on the node type
-            if (is_maximizing) {
-                alpha = std::max(alpha, best_score);
-                if (alpha >= beta) {
-                    // Beta cut-off: no need to check remaining moves
-                    break;
+
+        int last_helped = -1;
+        while (!time_up) {
+            if (shared_best.load() >= beta)
+                break;
+            if (first_done) {
+                int index = next_move.fetch_add(1);
+                if (index < moves.size) {
+                    own_move(local, index);
+                    continue;
                 }
-            } else {
-                beta = std::min(beta, best_score);
-                if (beta <= alpha) {
-                    // Alpha cut-off: no need to check remaining moves
+            }
+
+            // No move left to take: help the running move with the fewest helpers
+            // (not the one just helped: its helper search would end on a table hit).
+            int target = -1;
+            bool running = false;
+            int taken = std::min(next_move.load(), moves.size);
+            for (int i = 0; i < taken; i++) {
+                if (done[i])
+                    continue;
+                running = true;
+                if (i != last_helped && (target < 0 || helpers[i] < helpers[target]))
+                    target = i;
+            }
+            if (target < 0) {
+                if (first_done && !running)
                     break;
-                }
+                last_helped = -1;
+                std::this_thread::yield();
+                continue;
             }
+            help_move(local, thread, target);
+            last_helped = target;
         }
+    });
+
+    if (best_moves.empty())
+        return {0.0, moves.moves[0]}; // Interrupted before the first move was searched
+
+    if (candidates) {
+        if (static_cast<int>(scored.size()) > multi_pv)
+            scored.resize(multi_pv);
+        *candidates = std::move(scored);
     }
-    
-    if (!best_moves.empty()) {
+
+    if (break_ties && best_moves.size() > 1) {
         std::uniform_int_distribution<> distr(0, best_moves.size() - 1);
-        return {best_score, best_moves[distr(rng)]};
+        return {best_score, best_moves[distr(search_rng())]};
     }
-    
-    return {best_score, {-1, -1}};
+    return {best_score, best_moves.front()};
 }
 
+double GomokuAI::search(Gomoku& state, int depth, double alpha, double beta, bool is_maximizing,
+                        bool allow_null)
+{
+    TranspositionTable& table = transposition_table();
+    // The forced moves depend on the previous move, not only on the position.
+    bool use_table = state.getForcedMoves().empty();
+    uint64_t key = state.getHash() ^ (is_maximizing ? MAXIMIZING_KEY : 0);
+    double base = is_maximizing ? state.getScore() : -state.getScore();
+    int hash_move = TranspositionTable::NO_MOVE;
+
+    TranspositionTable::Entry entry;
+    if (use_table && table.probe(key, entry)) {
+        hash_move = entry.move;
+        // Heuristic scores depend on the remaining depth, so only entries of the same
+        // depth can replace the search.
+        if (entry.depth == depth) {
+            double score = score_from_table(entry.score, base);
+            if (entry.bound == TranspositionTable::EXACT
+                || (entry.bound == TranspositionTable::LOWER && score >= beta)
+                || (entry.bound == TranspositionTable::UPPER && score <= alpha))
+                return score;
+        }
+    }
+
+    // A forced capture is never reduced nor passed.
+    bool selective = selective_search_enabled && state.getForcedMoves().empty();
+    int player = state.getCurrentPlayer();
+
+    // Null move: if the side to move is still above beta after letting the opponent
+    // play twice (searched shallower), the node is cut. Wins are never proven this way,
+    // and a position with a threat pending is never passed.
+    if (selective && allow_null && depth >= NULL_MOVE_MIN_DEPTH && base >= beta && beta < 1e6
+        && !threats_pending(state, t_thread->ordering)) {
+        state.setCurrentPlayer(-player);
+        double score = -search(state, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, !is_maximizing, false);
+        state.setCurrentPlayer(player);
+        if (search_stopped())
+            return 0.0;
+        if (score >= beta) {
+            m_null_cutoffs.fetch_add(1, std::memory_order_relaxed);
+            return score >= 1e6 ? beta : score;
+        }
+    }
+
+    MoveList possible_moves;
+    generate_moves(state, possible_moves);
+
+	if (possible_moves.empty()) {
+        std::cout << "No possible moves\n";
+        return 0.0;
+    }
+
+    int ply = state.getMoveCount() - t_thread->root_moves;
+    t_thread->ordering.order(state, possible_moves.moves.data(), possible_moves.size,
+                             hash_move == TranspositionTable::NO_MOVE ? MoveOrdering::NO_MOVE : hash_move, ply);
+
+    double original_alpha = alpha;
+    double best_score = -SCORE_INF;
+    std::pair<int,int> best_move = possible_moves.moves[0];
+
+    for (int index = 0; index < possible_moves.size; index++) {
+        const auto& mv = possible_moves.moves[index];
+        double score;
+        if (index == 0) {
+            score = evaluate_move(state, mv.first, mv.second, depth, alpha, beta, is_maximizing);
+        } else {
+            // Late move reductions: the quiet moves ordered last are unlikely to be best,
+            // they are searched shallower first, and at full depth only if they beat alpha.
+            int reduction = 0;
+            if (selective && depth >= LMR_MIN_DEPTH && index >= LMR_FULL_MOVES
+                && t_thread->ordering.shapeScore(state, mv.first, mv.second, player) < MoveOrdering::TACTICAL)
+                reduction = (index >= LMR_DEEP_MOVES && depth > LMR_MIN_DEPTH) ? 2 : 1;
+
+            // Principal variation search: the other moves only have to be proven worse
+            // than alpha, with a null window. They are searched again if they are not.
+            score = evaluate_move(state, mv.first, mv.second, depth - reduction, alpha, alpha + 1, is_maximizing);
+            if (reduction > 0) {
+                m_reductions.fetch_add(1, std::memory_order_relaxed);
+                if (score > alpha && !search_stopped()) {
+                    m_researches.fetch_add(1, std::memory_order_relaxed);
+                    score = evaluate_move(state, mv.first, mv.second, depth, alpha, alpha + 1, is_maximizing);
+                }
+            }
+            if (score > alpha && score < beta)
+                score = evaluate_move(state, mv.first, mv.second, depth, alpha, beta, is_maximizing);
+        }
+        if (search_stopped())
+            return 0.0;
+
+        if (score > best_score) {
+            best_score = score;
+            best_move = mv;
+            if (score > alpha)
+                alpha = score;
+            if (alpha >= beta) {
+                // Cut-off: the opponent will not allow this position
+                t_thread->ordering.onCutoff(state, mv.first, mv.second, ply, depth);
+                break;
+            }
+        }
+    }
+
+    if (use_table) {
+        TranspositionTable::Bound bound = (best_score <= original_alpha) ? TranspositionTable::UPPER
+                                        : (best_score >= beta)           ? TranspositionTable::LOWER
+                                                                         : TranspositionTable::EXACT;
+        table.store(key, depth, bound, score_to_table(best_score, base),
+                    BitBoard::cellIndex(best_move.first, best_move.second));
+    }
+    return best_score;
+}
 
+bool GomokuAI::threats_pending(const Gomoku& state, const MoveOrdering& ordering)
+{
+    int opponent = -state.getCurrentPlayer();
+    for (int cell : state.getFrontier())
+        if (ordering.shapeScore(state, BitBoard::cellRow(cell), BitBoard::cellCol(cell), opponent)
+            >= MoveOrdering::CAPTURE)
+            return true;
+    return false;
+}
 
-ScoredMove GomokuAI::evaluate_move(int row, int col, int depth, bool is_maximizing, const std::string& gameType)
+double GomokuAI::evaluate_move(Gomoku& state, int row, int col, int depth, double alpha, double beta, bool is_maximizing)
 {
-    Gomoku cloned_state = m_gomoku.clone();
+    uint64_t nodes = m_nodes.fetch_add(1, std::memory_order_relaxed);
+
+    // The clock is only read every 1024 nodes. Once the time is up, every move
+    // returns at once and the scores of the interrupted iteration are ignored.
+    if (m_time_limited && m_depth_reached > 0 && (nodes & 1023) == 0
+        && std::chrono::steady_clock::now() >= m_deadline)
+        time_up = true;
+    if (search_stopped())
+        return 0.0;
 
-    auto [valid_move, reason, move_score] = cloned_state.processMove(row, col);
+    auto [valid_move, reason, move_score] = state.makeMove(row, col);
 
-    // Invalid move - immediately discard
+    // Invalid move - immediately discard (nothing was played)
     if (!valid_move) {
-        double invalid_score = is_maximizing ? -1e6 - depth : 1e6 + depth;
-        return {invalid_score, {row, col}};
+        return -1e6 - depth;
     }
 
     // Terminal state detected
-    if (cloned_state.getGameStatus()) {
-        double terminal_score = is_maximizing ? 1e6 + depth : -1e6 - depth;
-        return {terminal_score, {row, col}};
+    if (state.getGameStatus()) {
+        state.unmakeMove();
+        return 1e6 + depth;
     }
 
     // Adjust the heuristic score based on the current player
-    double adjusted_score = cloned_state.getScore();
-    adjusted_score += (cloned_state.getCurrentPlayer() == BLACK ? 1 : -1) * (move_score + depth * 1);
-    cloned_state.setScore(adjusted_score);
+    double adjusted_score = state.getScore();
+    adjusted_score += (state.getCurrentPlayer() == BLACK ? 1 : -1) * (move_score + depth * 1);
+    state.setScore(adjusted_score);
 
-    // Terminal depth - return heuristic score
+    // Terminal depth - return heuristic score (WHITE-positive, seen from the mover),
+    // once the captures and fours left to the opponent are played out
     if (depth <= 1) {
-        return {adjusted_score, {row, col}};
+        double score = is_maximizing ? adjusted_score : -adjusted_score;
+        if (quiescence_enabled) {
+            int budget = QUIESCENCE_NODES;
+            score = -quiescence(state, QUIESCENCE_PLIES, -beta, -alpha, !is_maximizing, budget);
+        }
+        state.unmakeMove();
+        return score;
+    }
+
+    // Recursive negamax call on the same state, with the window seen from the opponent
+    double child_score = -search(state, depth - 1, -beta, -alpha, !is_maximizing);
+    state.unmakeMove();
+    return child_score;
+}
+
+double GomokuAI::quiescence(Gomoku& state, int plies, double alpha, double beta, bool is_maximizing, int& budget)
+{
+    // The side to move may stand pat on the static score, unless it has to answer
+    // a threat: the forced capture of a breakable five, or a five to block.
+    double stand_pat = is_maximizing ? state.getScore() : -state.getScore();
+    const MoveOrdering& ordering = t_thread->ordering;
+    int player = state.getCurrentPlayer();
+
+    MoveList moves;
+    int shapes[Frontier::MAX_CELLS];
+    bool quiet = true;
+    const auto& forced_moves = state.getForcedMoves();
+    if (!forced_moves.empty()) {
+        quiet = false;
+        for (const auto& mv : forced_moves) {
+            shapes[moves.size] = MoveOrdering::CAPTURE;
+            moves.push(mv.first, mv.second);
+        }
+    } else {
+        for (int cell : state.getFrontier()) {
+            int row = BitBoard::cellRow(cell);
+            int col = BitBoard::cellCol(cell);
+            int shape = ordering.shapeScore(state, row, col, player);
+            if (shape < MoveOrdering::TACTICAL)
+                continue;
+            quiet &= shape != MoveOrdering::BLOCK_FIVE;
+            shapes[moves.size] = shape;
+            moves.push(row, col);
+        }
+        // Against a five, only winning, blocking it or capturing one of its stones matter.
+        if (!quiet) {
+            int kept = 0;
+            for (int i = 0; i < moves.size; i++) {
+                if (shapes[i] == MoveOrdering::WIN || shapes[i] == MoveOrdering::BLOCK_FIVE
+                    || shapes[i] == MoveOrdering::CAPTURE) {
+                    shapes[kept] = shapes[i];
+                    moves.moves[kept++] = moves.moves[i];
+                }
+            }
+            moves.size = kept;
+        }
+    }
+
+    if (quiet && stand_pat >= beta)
+        return stand_pat;
+    if (plies == 0 || budget <= 0 || moves.empty())
+        return stand_pat;
+
+    double best_score = -SCORE_INF;
+    if (quiet) {
+        best_score = stand_pat;
+        alpha = std::max(alpha, stand_pat);
     }
 
-    // Recursive min-max call
-    GomokuAI temp_ai(cloned_state);
-    auto [child_score, _] = temp_ai.minmax(depth - 1, !is_maximizing, false);
-    return {child_score, {row, col}};
-}
\ No newline at end of file
+    // Best shapes first, in the order of the frontier among equals (selection sort:
+    // only a few moves are tactical).
+    for (int i = 0; i < moves.size && budget > 0; i++) {
+        int top = i;
+        for (int j = i + 1; j < moves.size; j++)
+            if (shapes[j] > shapes[top])
+                top = j;
+        std::swap(shapes[i], shapes[top]);
+        std::swap(moves.moves[i], moves.moves[top]);
+        const auto& mv = moves.moves[i];
+
+        budget--;
+        m_quiescence_nodes.fetch_add(1, std::memory_order_relaxed);
+        auto [valid_move, reason, move_score] = state.makeMove(mv.first, mv.second);
+        if (!valid_move)
+            continue;
+
+        double score;
+        if (state.getGameStatus()) {
+            score = 1e6;
+        } else {
+            state.setScore(state.getScore() + (state.getCurrentPlayer() == BLACK ? 1 : -1) * move_score);
+            score = -quiescence(state, plies - 1, -beta, -alpha, !is_maximizing, budget);
+        }
+        state.unmakeMove();
+
+        if (score > best_score) {
+            best_score = score;
+            if (score > alpha)
+                alpha = score;
+            if (alpha >= beta)
+                break;
+        }
+    }
+    // No move could be played: nothing better than the static score is known.
+    return best_score > -SCORE_INF ? best_score : stand_pat;
+}
@@ -1,19 +1,75 @@
 #ifndef GOMOKU_AI_HPP
 #define GOMOKU_AI_HPP
 
+#include <array>
 #include <limits>
+#include <memory>
 #include <random>
 #include <vector>
 #include <utility>
 #include "gomoku.hpp" // Include your existing Gomoku header or the header where Gomoku is declared
+#include "transposition_table.hpp"
+#include "thread_pool.hpp"
+#include "move_ordering.hpp"
+#include "threat_search.hpp"
 #include <chrono>
 #include <atomic>
+#include <mutex>
 
 // Simple helper to represent a move-evaluation result
 //   first  = numeric score
 //   second = (row, col) chosen
 typedef std::pair<double, std::pair<int,int>> ScoredMove;
 
+// Snapshot of a running (or the last) minmax call, safe to read from another thread.
+struct SearchProgress
+{
+    // minmax is running.
+    bool running = false;
+    // Deepest completed iteration, with its best move ((-1, -1) before the first one)
+    // and its score (WHITE-positive, like minmax).
+    int depth = 0;
+    std::pair<int,int> best_move = {-1, -1};
+    double score = 0.0;
+    // Moves played so far (quiescence included), time spent and their ratio.
+    uint64_t nodes = 0;
+    double elapsed_ms = 0.0;
+    double nodes_per_second = 0.0;
+};
+
+// Fixed-capacity list of moves, kept on the stack by the search (no allocation per node).
+struct MoveList
+{
+    std::array<std::pair<int,int>, Frontier::MAX_CELLS> moves;
+    int size = 0;
+
+    void push(int row, int col) { moves[size++] = {row, col}; }
+    std::pair<int,int>* begin() { return moves.data(); }
+    std::pair<int,int>* end() { return moves.data() + size; }
+    const std::pair<int,int>* begin() const { return moves.data(); }
+    const std::pair<int,int>* end() const { return moves.data() + size; }
+    bool empty() const { return size == 0; }
+};
+
+struct SearchWorkers;
+
+// While it lives, the searches run on the calling thread get a search thread of their
+// own instead of the shared pool of GomokuAI::setThreadCount, which serves one search
+// at a time: one per thread lets several threads search different positions at once
+// (see analyze_batch). The transposition table stays shared.
+class LocalSearchWorkers {
+public:
+    LocalSearchWorkers();
+    ~LocalSearchWorkers();
+
+    LocalSearchWorkers(const LocalSearchWorkers&) = delete;
+    LocalSearchWorkers& operator=(const LocalSearchWorkers&) = delete;
+
+private:
+    std::unique_ptr<SearchWorkers> m_workers;
+    SearchWorkers* m_previous;
+};
+
 /**
  * GomokuAI class:
  * - Holds a copy of the Gomoku game state.
@@ -21,6 +77,10 @@ typedef std::pair<double, std::pair<int,int>> ScoredMove;
  *     - random_move
  *     - minimax search
  *     - heuristic scoring
+ *
+ * The search never copies the game below the root: each thread of the pool
+ * copies the root position into its own preallocated state, then walks the tree
+ * with Gomoku::makeMove / Gomoku::unmakeMove.
  */
 class GomokuAI {
 public:
@@ -38,27 +98,205 @@ public:
     double get_score_for_position(const std::string& gameType);
 
     // Minimax entry point
-    // Returns (best_score, best_move)
-    ScoredMove minmax(int depth, bool is_maximizing, bool is_first=true);
+    // Looks for a forced win by threats first (see ThreatSearch), then searches with
+    // iterative deepening up to `depth`, and stops after `time_limit_ms`
+    // milliseconds if it is positive (the first iteration always completes).
+    // With `is_first`, the move is picked at random among the equal best root moves.
+    // Returns (best_score, best_move) of the deepest completed iteration.
+    ScoredMove minmax(int depth, bool is_maximizing, bool is_first=true, int time_limit_ms=0);
+
+    // Stop the running minmax call (from another thread): it returns at once with the
+    // best move of the deepest completed iteration (the first move of the ordering if
+    // none completed). The stop is final: later minmax calls of this GomokuAI return
+    // at once too (for an EngineSession, until its position changes).
+    void stop();
+
+    // Number of best moves minmax searches to their exact score (1 by default). Above
+    // 1, the root is searched in a full window instead of an aspiration window.
+    void setMultiPV(int count);
+    int getMultiPV() const;
+
+    // The getMultiPV() best moves of the deepest iteration completed by the last minmax
+    // call, best first, with their WHITE-positive scores. A single move when minmax
+    // did not search (a win by threats, an empty board).
+    std::vector<ScoredMove> getCandidates() const;
+
+    // Principal variation of `move`, a root move of the last minmax call: the move,
+    // then the best moves the transposition table holds for the positions that follow
+    // (or their first forced move), up to the depth reached.
+    std::vector<std::pair<int,int>> getPrincipalVariation(std::pair<int,int> move) const;
+
+    // Principal variation of the last minmax call: its best move, then the best moves
+    // the transposition table holds for the positions that follow (or their first
+    // forced move), up to the depth reached.
+    std::vector<std::pair<int,int>> getPrincipalVariation() const;
+
+    // Reply of the opponent the last minmax call expects to its best move (the second
+    // move of the principal variation), to search it on the opponent's time.
+    // (-1, -1) if the search does not know one.
+    std::pair<int,int> getPonderMove() const;
+
+    // Progress of the running minmax call, updated after each iteration: it can be
+    // polled from another thread while the search runs.
+    SearchProgress getProgress() const;
+
+    // The transposition table is shared by every GomokuAI and kept between searches.
+    // Resizing or clearing it waits for the running searches to end (on any thread).
+    static void setHashSize(size_t megabytes);
+    static size_t getHashSize();
+    // Forget what the previous searches learned: the table and the move ordering history.
+    static void clearHash();
+    // Permille of the table filled by the last search.
+    static int getHashfull();
+
+    // The root moves are searched by a pool of threads shared by every GomokuAI,
+    // one per CPU by default (0 or less restores the default).
+    static void setThreadCount(int threads);
+    static int getThreadCount();
+
+    // Whether minmax looks for a win by threats before searching (on by default).
+    static void setThreatSearch(bool enabled);
+    static bool getThreatSearch();
+
+    // Whether the leaves of the search are extended by a quiescence search over the
+    // captures and fours (on by default).
+    static void setQuiescence(bool enabled);
+    static bool getQuiescence();
+
+    // Whether the search prunes selectively (on by default): late quiet moves are
+    // searched at a reduced depth (and again at full depth if they beat alpha), and
+    // quiet nodes are cut when passing the move still scores above beta.
+    static void setSelectiveSearch(bool enabled);
+    static bool getSelectiveSearch();
+
+    // Number of nodes (moves played) visited by the last minmax call.
+    uint64_t getNodesSearched() const;
+
+    // Number of moves played by the quiescence searches of the last minmax call
+    // (not counted in getNodesSearched).
+    uint64_t getQuiescenceNodes() const;
+
+    // Counters of the selective search of the last minmax call: moves searched at a
+    // reduced depth, reduced moves searched again at full depth, and nodes cut by a
+    // null move.
+    uint64_t getReductions() const;
+    uint64_t getResearches() const;
+    uint64_t getNullMoveCutoffs() const;
+
+    // Depth of the deepest iteration completed by the last minmax call.
+    int getDepthReached() const;
+
+    // Duration of the last minmax call, in milliseconds.
+    double getElapsedMs() const;
 
 private:
+    // A session plays the moves of the game on m_gomoku.
+    friend class EngineSession;
+
     // Store a copy of the Gomoku board
     Gomoku m_gomoku;
     // Depth for minimax
     int m_depth;
+    // Set when the time limit is reached: every search thread stops as soon as it sees it.
 	std::atomic<bool> time_up = false;
+    // Set by stop(): every minmax call starts with time_up set.
+    std::atomic<bool> m_stopped = false;
+    std::atomic<uint64_t> m_nodes = 0;
+    std::atomic<uint64_t> m_quiescence_nodes = 0;
+    std::atomic<uint64_t> m_reductions = 0;
+    std::atomic<uint64_t> m_researches = 0;
+    std::atomic<uint64_t> m_null_cutoffs = 0;
+    bool m_time_limited = false;
+    std::chrono::steady_clock::time_point m_deadline;
+    int m_depth_reached = 0;
+    double m_elapsed_ms = 0.0;
+    std::chrono::steady_clock::time_point m_start;
+    // Result of the last minmax call, for getPonderMove.
+    std::pair<int,int> m_best_move = {-1, -1};
+    bool m_is_maximizing = true;
+    int m_multi_pv = 1;
+    std::vector<ScoredMove> m_candidates;
+    // Progress of the search (all but the counters), guarded by m_progress_mutex.
+    SearchProgress m_progress;
+    mutable std::mutex m_progress_mutex;
+
+    // Record the result of a completed iteration (or the end of the search) for getProgress.
+    void publish_progress(bool running, int depth, const ScoredMove& best);
+    // Report `candidates` as the result of a search to `depth` that did not have to run
+    // (see EngineSession, which keeps the analyses of the positions it searched).
+    void publish_result(int depth, bool is_maximizing, const std::vector<ScoredMove>& candidates);
+
+    // Candidate moves of `state`: the forced moves if any, otherwise the close moves,
+    // without the ones the rules forbid (see Gomoku::isLegalMove).
+    static void generate_moves(const Gomoku& state, MoveList& moves);
+
+    // Threat-space searches run before the alpha-beta search, on a small budget.
+    // Returns true with the winning move in `win` (score seen from the side to move)
+    // if the side to move wins by fours or threats (or captures, once a player has
+    // taken 6 stones). If the opponent would win that way, the root moves that do not
+    // stop it are removed (unless none does).
+    bool solve_threats(const Gomoku& state, MoveList& root_moves, int depth, int time_limit_ms, ScoredMove& win);
+
+    // Search the root at `depth` in aspiration windows around `guess` (see search_root).
+    ScoredMove aspiration_search(Gomoku& state, const MoveList& moves, int depth, double guess,
+                                 bool is_maximizing, bool break_ties);
+
+    // Search the root moves of `state` in the window (alpha, beta) and return the best
+    // score with one of the best moves (picked at random among ties if `break_ties`).
+    // With `candidates`, the `multi_pv` best moves are searched to their exact score
+    // and stored there, best first.
+    // Scores are negamax scores: seen from the side to move.
+    ScoredMove search_root(Gomoku& state, const MoveList& moves, int depth, double alpha, double beta,
+                           bool is_maximizing, bool break_ties, int multi_pv = 1,
+                           std::vector<ScoredMove>* candidates = nullptr);
+
+    // Negamax alpha-beta with principal variation search below the root, late move
+    // reductions and null-move pruning (not right after a null move: `allow_null`).
+    // Returns a fail-soft score seen from the side to move.
+    double search(Gomoku& state, int depth, double alpha, double beta, bool is_maximizing,
+                  bool allow_null = true);
+
+    // The moves the transposition table holds from `state` (searched with
+    // `is_maximizing`) and the positions that follow, at most `length` of them.
+    static std::vector<std::pair<int,int>> table_line(Gomoku state, bool is_maximizing, int length);
+
+    // Whether the opponent of the side to move threatens something a null move would
+    // ignore: a five, an open four or a capture (or the side to move has a five to make).
+    static bool threats_pending(const Gomoku& state, const MoveOrdering& ordering);
 
     // Evaluate a single move (similar to the python `evaluate_move` function).
-    // Returns (score, (row,col)).
-    ScoredMove evaluate_move(int row, int col, int depth, bool is_maximizing, const std::string& gameType);
+    // The move is played on `state` and reverted before returning.
+    // Returns the score of the move for the side that plays it.
+    double evaluate_move(Gomoku& state, int row, int col, int depth, double alpha, double beta, bool is_maximizing);
+
+    // Quiescence search of a leaf: only the captures, the fours and the answers to a
+    // five threat are played, until the position is quiet (the side to move may then
+    // keep the static score), `plies` moves deep or out of `budget` moves.
+    // Returns a fail-soft score seen from the side to move, like search().
+    double quiescence(Gomoku& state, int plies, double alpha, double beta, bool is_maximizing, int& budget);
 
     // Helper used in get_score_for_position() to mimic the python logic
     // This is a placeholder. You should fill it with logic that counts "threats" for the given player.
     int _get_number_of_threats(int player);
 
-    // A helper to get +∞ or -∞
-    inline double plus_infinity()  { return std::numeric_limits<double>::infinity(); }
-    inline double minus_infinity() { return -std::numeric_limits<double>::infinity(); }
+    // Bound above every score of the search (wins are worth 1e6 + depth). The library
+    // is built with -ffast-math, so the search never relies on infinities.
+    static constexpr double SCORE_INF = 1e9;
+    // Half width of the first aspiration window at the root, multiplied by 4 on each failure.
+    static constexpr double ASPIRATION_WINDOW = 50;
+    // Node budget of each threat-space search run by minmax.
+    static constexpr uint64_t THREAT_NODES = 1000;
+    // Bounds of the quiescence search of each leaf: moves deep, and moves played.
+    static constexpr int QUIESCENCE_PLIES = 6;
+    static constexpr int QUIESCENCE_NODES = 32;
+    // Late move reductions: from this depth, the quiet moves after the first
+    // LMR_FULL_MOVES ones are searched 1 ply shallower, 2 after LMR_DEEP_MOVES moves.
+    static constexpr int LMR_MIN_DEPTH = 3;
+    static constexpr int LMR_FULL_MOVES = 3;
+    static constexpr int LMR_DEEP_MOVES = 10;
+    // Null move: the opponent plays twice, searched NULL_MOVE_REDUCTION plies shallower.
+    static constexpr int NULL_MOVE_MIN_DEPTH = 4;
+    static constexpr int NULL_MOVE_REDUCTION = 2;
 };
 
 #endif // GOMOKU_AI_HPP
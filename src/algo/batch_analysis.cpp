@@ -0,0 +1,61 @@
+#include "batch_analysis.hpp"
+#include "algo.hpp"
+
+#include <algorithm>
+#include <atomic>
+#include <stdexcept>
+
+static void check_positions(const BatchPositions& positions)
+{
+    size_t cells = static_cast<size_t>(positions.board_size) * positions.board_size;
+    for (int index = 0; index < positions.count; index++) {
+        const int8_t* board = positions.boards + index * cells;
+        for (size_t cell = 0; cell < cells; cell++) {
+            if (board[cell] != EMPTY && board[cell] != BLACK && board[cell] != WHITE)
+                throw std::invalid_argument("Position " + std::to_string(index)
+                                            + ": board values must be EMPTY (0), BLACK (-1) or WHITE (1)");
+        }
+        int8_t side = positions.side_to_move[index];
+        if (side != BLACK && side != WHITE)
+            throw std::invalid_argument("Position " + std::to_string(index)
+                                        + ": the side to move must be BLACK (-1) or WHITE (1)");
+        if (positions.captures[2 * index] < 0 || positions.captures[2 * index + 1] < 0)
+            throw std::invalid_argument("Position " + std::to_string(index)
+                                        + ": the captured pebbles cannot be negative");
+    }
+}
+
+void analyze_batch(const BatchPositions& positions, int max_depth, int time_ms, int threads,
+                   const BatchResults& results)
+{
+    if (positions.count <= 0)
+        return;
+    // Inside the threads, an exception would not reach the caller
+    const Gomoku empty(positions.board_size, positions.game_type);
+    check_positions(positions);
+
+    if (threads < 1)
+        threads = ThreadPool::defaultSize();
+    ThreadPool pool(std::min(threads, positions.count));
+    size_t cells = static_cast<size_t>(positions.board_size) * positions.board_size;
+    std::atomic<int> next_position = 0;
+
+    pool.run([&](int) {
+        LocalSearchWorkers workers;
+        for (int index = next_position.fetch_add(1); index < positions.count; index = next_position.fetch_add(1)) {
+            Gomoku game = empty;
+            game.setBoardValues(positions.boards + index * cells);
+            game.setCurrentPlayer(positions.side_to_move[index]);
+            game.setBlackPlayerPebblesTaken(positions.captures[2 * index]);
+            game.setWhitePlayerPebblesTaken(positions.captures[2 * index + 1]);
+
+            GomokuAI ai(game);
+            ScoredMove best = ai.minmax(max_depth, game.getCurrentPlayer() == WHITE, false, time_ms);
+            results.moves[2 * index] = best.second.first;
+            results.moves[2 * index + 1] = best.second.second;
+            results.scores[index] = best.first;
+            results.nodes[index] = ai.getNodesSearched() + ai.getQuiescenceNodes();
+            results.depths[index] = ai.getDepthReached();
+        }
+    });
+}
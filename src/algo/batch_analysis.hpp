@@ -0,0 +1,52 @@
+#ifndef BATCH_ANALYSIS_HPP
+#define BATCH_ANALYSIS_HPP
+
+#pragma once
+
+#include <cstdint>
+#include <string>
+
+// Positions given to analyze_batch, stored one after the other (C order).
+struct BatchPositions
+{
+    int count = 0;
+    int board_size = 19;
+    std::string game_type = "normal";
+    // count x board_size x board_size cells: EMPTY (0), BLACK (-1) or WHITE (1).
+    const int8_t* boards = nullptr;
+    // count players: BLACK or WHITE.
+    const int8_t* side_to_move = nullptr;
+    // count x 2 pebbles: taken by BLACK, then taken by WHITE.
+    const int32_t* captures = nullptr;
+};
+
+// Where analyze_batch writes its results, one entry per position.
+struct BatchResults
+{
+    // count x 2: (row, col) of the best move, (-1, -1) if there is none.
+    int32_t* moves = nullptr;
+    // WHITE-positive, like GomokuAI::minmax.
+    double* scores = nullptr;
+    // Moves played by the search, quiescence included.
+    uint64_t* nodes = nullptr;
+    // Deepest completed iteration.
+    int32_t* depths = nullptr;
+};
+
+/**
+ * Search every position for its side to move, up to `max_depth`, within `time_ms`
+ * milliseconds per position if positive: the deterministic search of
+ * GomokuAI::minmax (is_first false). A position has no history: the score of the
+ * game starts from 0 on it, and no move is forced by the previous one.
+ *
+ * The positions are shared out between `threads` threads (one per CPU if not
+ * positive), each searching one position at a time on its own search thread (see
+ * LocalSearchWorkers), so the threads of GomokuAI::setThreadCount are not used.
+ * The transposition table is shared by every search.
+ *
+ * Throws std::invalid_argument, before searching, if a position is not valid.
+ */
+void analyze_batch(const BatchPositions& positions, int max_depth, int time_ms, int threads,
+                   const BatchResults& results);
+
+#endif // BATCH_ANALYSIS_HPP
@@ -0,0 +1,154 @@
+#include "engine_session.hpp"
+
+#include <algorithm>
+#include <cstdlib>
+
+EngineSession::EngineSession(int boardSize, const std::string& gameType)
+    : m_ai(Gomoku(boardSize, gameType))
+{
+}
+
+EngineSession::EngineSession(const Gomoku& game)
+    : m_ai(game)
+{
+}
+
+std::tuple<bool, std::string, int> EngineSession::push_move(int row, int col)
+{
+    // Gomoku::makeMove leaves the occupied cells and the board limits to the caller
+    if (!m_ai.m_gomoku.isLegalMove(row, col))
+        return {false, m_ai.m_gomoku.getIllegalMoveReason(row, col), 0};
+    auto result = m_ai.m_gomoku.makeMove(row, col);
+    if (std::get<0>(result))
+        on_position_changed();
+    return result;
+}
+
+bool EngineSession::pop_move()
+{
+    if (!m_ai.m_gomoku.unmakeMove())
+        return false;
+    on_position_changed();
+    return true;
+}
+
+const Gomoku& EngineSession::game() const
+{
+    return m_ai.m_gomoku;
+}
+
+bool EngineSession::maximizing() const
+{
+    // The search scores the positions from the side to move: WHITE maximizes the
+    // WHITE-positive score of the game.
+    return m_ai.m_gomoku.getCurrentPlayer() == WHITE;
+}
+
+void EngineSession::on_position_changed()
+{
+    m_ai.m_stopped = false;
+}
+
+const Analysis* EngineSession::find_analysis(int depth, int multi_pv) const
+{
+    // The forced moves depend on the previous move, not only on the position
+    if (!m_ai.m_gomoku.getForcedMoves().empty())
+        return nullptr;
+    auto stored = m_analyses.find(m_ai.m_gomoku.getHash());
+    if (stored == m_analyses.end() || stored->second.analysis.depth < depth || stored->second.multi_pv < multi_pv)
+        return nullptr;
+    return &stored->second.analysis;
+}
+
+Analysis EngineSession::store_analysis(int multi_pv)
+{
+    Analysis analysis;
+    for (const ScoredMove& candidate : m_ai.getCandidates())
+        analysis.lines.push_back({candidate.first, candidate.second, m_ai.getPrincipalVariation(candidate.second)});
+    if (!analysis.lines.empty()) {
+        analysis.score = analysis.lines.front().score;
+        analysis.best_move = analysis.lines.front().move;
+        analysis.pv = analysis.lines.front().pv;
+    }
+    analysis.depth = m_ai.getDepthReached();
+    analysis.nodes = m_ai.getNodesSearched() + m_ai.getQuiescenceNodes();
+    analysis.elapsed_ms = m_ai.getElapsedMs();
+    if (analysis.depth > 0 && !analysis.lines.empty() && m_ai.m_gomoku.getForcedMoves().empty()) {
+        m_analyses[m_ai.m_gomoku.getHash()] = {analysis, multi_pv, m_analyses_stored++};
+        trim_analyses();
+    }
+    return analysis;
+}
+
+void EngineSession::trim_analyses()
+{
+    if (m_analyses.size() <= MAX_ANALYSES)
+        return;
+    // Every analysis older than the median goes: trimming costs O(1) per analysis stored
+    std::vector<uint64_t> orders;
+    orders.reserve(m_analyses.size());
+    for (const auto& stored : m_analyses)
+        orders.push_back(stored.second.order);
+    auto median = orders.begin() + orders.size() / 2;
+    std::nth_element(orders.begin(), median, orders.end());
+    for (auto stored = m_analyses.begin(); stored != m_analyses.end();) {
+        if (stored->second.order < *median)
+            stored = m_analyses.erase(stored);
+        else
+            ++stored;
+    }
+}
+
+ScoredMove EngineSession::best_move(int time_ms, int max_depth)
+{
+    if (const Analysis* stored = find_analysis(max_depth, 1)) {
+        // Random pick among the equal best lines, like minmax
+        int ties = 1;
+        while (ties < static_cast<int>(stored->lines.size()) && stored->lines[ties].score == stored->score)
+            ties++;
+        const AnalysisLine& line = stored->lines[std::rand() % ties];
+        m_ai.publish_result(stored->depth, maximizing(), {{line.score, line.move}});
+        return {line.score, line.move};
+    }
+    ScoredMove result = m_ai.minmax(max_depth, maximizing(), true, time_ms);
+    store_analysis(1);
+    return result;
+}
+
+Analysis EngineSession::analyze(int max_depth, int time_ms, int multi_pv)
+{
+    multi_pv = std::max(1, multi_pv);
+    if (const Analysis* stored = find_analysis(max_depth, multi_pv)) {
+        Analysis analysis = *stored;
+        if (static_cast<int>(analysis.lines.size()) > multi_pv)
+            analysis.lines.resize(multi_pv);
+        analysis.nodes = 0;
+        analysis.elapsed_ms = 0.0;
+        analysis.cached = true;
+        std::vector<ScoredMove> candidates;
+        for (const AnalysisLine& line : analysis.lines)
+            candidates.push_back({line.score, line.move});
+        m_ai.publish_result(analysis.depth, maximizing(), candidates);
+        return analysis;
+    }
+    m_ai.setMultiPV(multi_pv);
+    m_ai.minmax(max_depth, maximizing(), false, time_ms);
+    m_ai.setMultiPV(1);
+    return store_analysis(multi_pv);
+}
+
+void EngineSession::stop()
+{
+    m_ai.stop();
+}
+
+SearchProgress EngineSession::getProgress() const
+{
+    return m_ai.getProgress();
+}
+
+std::pair<int,int> EngineSession::getPonderMove() const
+{
+    std::vector<std::pair<int,int>> line = GomokuAI::table_line(m_ai.m_gomoku, maximizing(), 1);
+    return line.empty() ? std::make_pair(-1, -1) : line[0];
+}
@@ -0,0 +1,124 @@
+#ifndef ENGINE_SESSION_HPP
+#define ENGINE_SESSION_HPP
+
+#pragma once
+
+#include <string>
+#include <tuple>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+#include "gomoku.hpp"
+#include "algo.hpp"
+
+// One of the best moves found by EngineSession::analyze.
+struct AnalysisLine
+{
+    // WHITE-positive, like GomokuAI::minmax.
+    double score = 0.0;
+    std::pair<int,int> move = {-1, -1};
+    // The move, then the best replies (see GomokuAI::getPrincipalVariation).
+    std::vector<std::pair<int,int>> pv;
+};
+
+// Result of EngineSession::analyze.
+struct Analysis
+{
+    // Score, move and principal variation of the first line.
+    double score = 0.0;
+    std::pair<int,int> best_move = {-1, -1};
+    std::vector<std::pair<int,int>> pv;
+    // The best moves, best first (a single one for a win by threats).
+    std::vector<AnalysisLine> lines;
+    int depth = 0;
+    uint64_t nodes = 0;
+    double elapsed_ms = 0.0;
+    // Served from the analyses of the session, without searching.
+    bool cached = false;
+};
+
+/**
+ * Engine that follows one game move by move, instead of a GomokuAI built from a
+ * copy of the game for every search.
+ *
+ * The moves are played with push_move (Gomoku::makeMove) and taken back with
+ * pop_move on the position the engine searches, and each search is run for the
+ * side to move. The transposition table and the move ordering history are shared
+ * by every search, so they carry over from a move to the next.
+ *
+ * A search (best_move, analyze) may run on another thread, and be interrupted by
+ * stop(); the moves must not be pushed or popped while it runs.
+ */
+class EngineSession {
+public:
+    // Deepest search of best_move and analyze when the depth is not given.
+    static constexpr int MAX_DEPTH = 11;
+    // Analyses kept by the session: past it, the oldest half is forgotten.
+    static constexpr size_t MAX_ANALYSES = 1024;
+
+    EngineSession(int boardSize = 19, const std::string& gameType = "normal");
+    // Start from a position (the moves already on it cannot be popped).
+    explicit EngineSession(const Gomoku& game);
+
+    // Play (row, col) for the side to move, like Gomoku::processMove. An illegal move
+    // (see Gomoku::isLegalMove) is rejected with its reason and changes nothing.
+    std::tuple<bool, std::string, int> push_move(int row, int col);
+    // Take back the last pushed move. Returns false if there is none.
+    bool pop_move();
+    // Position after the pushed moves.
+    const Gomoku& game() const;
+
+    // Move to play for the side to move: searched up to `max_depth`, within `time_ms`
+    // milliseconds if positive, picked at random among equal moves (or taken from the
+    // analysis of the position, if it was searched as deep).
+    // Returns (score, move), the score WHITE-positive.
+    ScoredMove best_move(int time_ms, int max_depth = MAX_DEPTH);
+
+    // Deterministic search of the position for the side to move: its `multi_pv` best
+    // moves (see GomokuAI::setMultiPV), each with its score and principal variation.
+    // The session keeps the analysis of every position it searched: a position already
+    // searched as deep, with as many lines, is answered without searching.
+    Analysis analyze(int max_depth = MAX_DEPTH, int time_ms = 0, int multi_pv = 1);
+
+    // Interrupt the running search (see GomokuAI::stop), and any search started
+    // before the next push_move or pop_move.
+    void stop();
+    SearchProgress getProgress() const;
+
+    // Move of the side to move the previous searches expect (the best move the
+    // transposition table holds for the position), to search it on the opponent's
+    // time. (-1, -1) if none.
+    std::pair<int,int> getPonderMove() const;
+
+    // Number of positions whose analysis the session keeps (at most MAX_ANALYSES).
+    size_t analysisCount() const { return m_analyses.size(); }
+
+private:
+    struct StoredAnalysis
+    {
+        Analysis analysis;
+        int multi_pv;
+        // Rank of the analysis among the stored ones, oldest first.
+        uint64_t order;
+    };
+
+    // The position of the session is the game of the AI: nothing is copied between searches.
+    GomokuAI m_ai;
+    // Last analysis of each position searched, by hash of the position.
+    std::unordered_map<uint64_t, StoredAnalysis> m_analyses;
+    uint64_t m_analyses_stored = 0;
+
+    // Analysis of the position searched at least `depth` deep with `multi_pv` lines, or nullptr.
+    const Analysis* find_analysis(int depth, int multi_pv) const;
+    // Analysis of the last search of m_ai, kept for the position.
+    Analysis store_analysis(int multi_pv);
+    // Forget the oldest half of the analyses once there are more than MAX_ANALYSES.
+    void trim_analyses();
+
+    // Value of is_maximizing of the searches of the position.
+    bool maximizing() const;
+    // A new position: a stop() no longer applies.
+    void on_position_changed();
+};
+
+#endif // ENGINE_SESSION_HPP
@@ -0,0 +1,161 @@
+#ifndef MOVE_ORDERING_HPP
+#define MOVE_ORDERING_HPP
+
+#pragma once
+
+#include <algorithm>
+#include <climits>
+#include <cstdint>
+#include <utility>
+
+#include "gomoku.hpp"
+#include "line_patterns.hpp"
+
+/**
+ * Order of the moves searched at a node, best candidates first:
+ *   1. the hash move (best move stored in the transposition table),
+ *   2. tactical moves: wins, blocks of a five, open fours, captures, blocked fours,
+ *   3. the two killer moves of the ply (quiet moves that caused a cut-off),
+ *   4. the other moves, by history score (cut-offs caused anywhere in the tree,
+ *      weighted by depth squared), then by a cheap static score.
+ * Equal moves keep the order they were generated in, so the search is
+ * deterministic. One instance per search thread.
+ */
+class MoveOrdering
+{
+public:
+	static constexpr int MAX_PLY = 64;
+	static constexpr int NO_MOVE = -1;
+
+	// shapeScore of the tactical moves, best first
+	static constexpr int TACTICAL = 1 << 24;
+	static constexpr int WIN = TACTICAL + 5;
+	static constexpr int BLOCK_FIVE = TACTICAL + 4;
+	static constexpr int OPEN_FOUR = TACTICAL + 3;
+	static constexpr int CAPTURE = TACTICAL + 2;
+	static constexpr int BLOCKED_FOUR = TACTICAL + 1;
+
+	MoveOrdering() { clear(); }
+
+	void clear()
+	{
+		std::fill(&killers[0][0], &killers[0][0] + MAX_PLY * 2, NO_MOVE);
+		std::fill(&history[0][0], &history[0][0] + 2 * CELLS, 0);
+	}
+
+	// Killers only make sense for one position; the history fades from a search to the next.
+	void newSearch(bool capturesEnabled)
+	{
+		captures = capturesEnabled;
+		std::fill(&killers[0][0], &killers[0][0] + MAX_PLY * 2, NO_MOVE);
+		for (auto &color : history)
+			for (int &value : color)
+				value /= 2;
+	}
+
+	// Sort the `count` moves of the side to move of `state`, `ply` moves from the root.
+	void order(const Gomoku &state, std::pair<int, int> *moves, int count, int hashMove, int ply) const
+	{
+		int player = state.getCurrentPlayer();
+		ply = std::min(ply, MAX_PLY - 1);
+		std::pair<int, int> keyed[Frontier::MAX_CELLS];
+		for (int i = 0; i < count; i++) {
+			int row = moves[i].first;
+			int col = moves[i].second;
+			int cell = BitBoard::cellIndex(row, col);
+			int key;
+			if (cell == hashMove) {
+				key = HASH;
+			} else {
+				int shape = shapeScore(state, row, col, player);
+				if (shape >= TACTICAL)
+					key = shape;
+				else if (cell == killers[ply][0])
+					key = KILLER + 1;
+				else if (cell == killers[ply][1])
+					key = KILLER;
+				else
+					key = (std::min(history[BitBoard::colorIndex(player)][cell], HISTORY_MAX) << STATIC_BITS) | shape;
+			}
+			keyed[i] = {-key, i};
+		}
+		std::sort(keyed, keyed + count);
+
+		std::pair<int, int> sorted[Frontier::MAX_CELLS];
+		for (int i = 0; i < count; i++)
+			sorted[i] = moves[keyed[i].second];
+		std::copy(sorted, sorted + count, moves);
+	}
+
+	// The move (row, col) caused a cut-off `depth` plies from the leaves (`state` is the
+	// position before the move). Tactical moves are found first anyway and are skipped.
+	void onCutoff(const Gomoku &state, int row, int col, int ply, int depth)
+	{
+		int player = state.getCurrentPlayer();
+		if (shapeScore(state, row, col, player) >= TACTICAL)
+			return;
+
+		int cell = BitBoard::cellIndex(row, col);
+		ply = std::min(ply, MAX_PLY - 1);
+		if (killers[ply][0] != cell) {
+			killers[ply][1] = killers[ply][0];
+			killers[ply][0] = cell;
+		}
+
+		int &value = history[BitBoard::colorIndex(player)][cell];
+		value += depth * depth;
+		if (value > HISTORY_MAX)
+			for (auto &color : history)
+				for (int &other : color)
+					other /= 2;
+	}
+
+	// Tactical moves score TACTICAL or more, the others a static score below 1 << STATIC_BITS.
+	int shapeScore(const Gomoku &state, int row, int col, int player) const
+	{
+		int own = 0;
+		int opponent = 0;
+		int ownThrees = 0;
+		int opponentThrees = 0;
+		uint8_t ownFlags[4];
+		uint8_t opponentFlags[4];
+		state.getLineShapes(row, col, player, ownFlags, opponentFlags);
+		for (int dir = 0; dir < 4; dir++) {
+			own |= ownFlags[dir];
+			opponent |= opponentFlags[dir];
+			ownThrees += (ownFlags[dir] & linepatterns::OPEN_THREE) != 0;
+			opponentThrees += (opponentFlags[dir] & linepatterns::OPEN_THREE) != 0;
+		}
+
+		if (own & (linepatterns::FIVE | linepatterns::OVERLINE))
+			return WIN;
+		if (opponent & linepatterns::FIVE)
+			return BLOCK_FIVE;
+		if (own & linepatterns::OPEN_FOUR)
+			return OPEN_FOUR;
+		if (captures && state.canCapture(row, col, player))
+			return CAPTURE;
+		if (own & linepatterns::BLOCKED_FOUR)
+			return BLOCKED_FOUR;
+
+		int score = 12 * ownThrees + 8 * opponentThrees;
+		if (opponent & linepatterns::OPEN_FOUR)
+			score += 16;
+		if (opponent & linepatterns::BLOCKED_FOUR)
+			score += 4;
+		return std::min(score, (1 << STATIC_BITS) - 1);
+	}
+
+private:
+	static constexpr int CELLS = BitBoard::MAX_SIZE * BitBoard::MAX_SIZE;
+	static constexpr int STATIC_BITS = 6;
+	static constexpr int HISTORY_MAX = (1 << 16) - 1;
+	static constexpr int KILLER = 1 << 23;
+	static constexpr int HASH = INT_MAX;
+
+	int killers[MAX_PLY][2];
+	int history[2][CELLS];
+	bool captures = true;
+};
+
+#endif // MOVE_ORDERING_HPP
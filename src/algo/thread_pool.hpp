@@ -0,0 +1,133 @@
+#ifndef THREAD_POOL_HPP
+#define THREAD_POOL_HPP
+
+#pragma once
+
+#include <condition_variable>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+/**
+ * Persistent pool of search threads.
+ *
+ * run(job) calls job(0) on the calling thread and job(1) .. job(size() - 1) on
+ * the workers, and returns once every call has returned. The workers are
+ * created once and sleep between two jobs, so a search does not pay for any
+ * thread creation. run() must not be called by two threads at the same time.
+ */
+class ThreadPool
+{
+public:
+	explicit ThreadPool(int threads = defaultSize())
+	{
+		start(threads);
+	}
+
+	~ThreadPool()
+	{
+		stop();
+	}
+
+	ThreadPool(const ThreadPool &) = delete;
+	ThreadPool &operator=(const ThreadPool &) = delete;
+
+	// One thread per CPU (at least one).
+	static int defaultSize()
+	{
+		unsigned int cpus = std::thread::hardware_concurrency();
+		return cpus > 0 ? static_cast<int>(cpus) : 1;
+	}
+
+	// Number of threads running a job, the calling thread included.
+	int size() const { return static_cast<int>(workers.size()) + 1; }
+
+	void resize(int threads)
+	{
+		if (threads < 1)
+			threads = defaultSize();
+		if (threads == size())
+			return;
+		stop();
+		start(threads);
+	}
+
+	void run(const std::function<void(int)> &job)
+	{
+		if (workers.empty()) {
+			job(0);
+			return;
+		}
+
+		{
+			std::lock_guard<std::mutex> lock(mutex);
+			current = &job;
+			pending = static_cast<int>(workers.size());
+			generation++;
+		}
+		wake.notify_all();
+
+		job(0);
+
+		std::unique_lock<std::mutex> lock(mutex);
+		done.wait(lock, [this]() { return pending == 0; });
+		current = nullptr;
+	}
+
+private:
+	void start(int threads)
+	{
+		exiting = false;
+		// Read here, not by the worker: a job may be posted before the worker starts.
+		unsigned long seen = generation;
+		for (int i = 1; i < threads; i++)
+			workers.emplace_back([this, i, seen]() { loop(i, seen); });
+	}
+
+	void stop()
+	{
+		{
+			std::lock_guard<std::mutex> lock(mutex);
+			exiting = true;
+		}
+		wake.notify_all();
+		for (std::thread &worker : workers)
+			worker.join();
+		workers.clear();
+	}
+
+	void loop(int index, unsigned long seen)
+	{
+		while (true) {
+			const std::function<void(int)> *job;
+			{
+				std::unique_lock<std::mutex> lock(mutex);
+				wake.wait(lock, [&]() { return exiting || generation != seen; });
+				if (exiting)
+					return;
+				seen = generation;
+				job = current;
+			}
+
+			(*job)(index);
+
+			{
+				std::lock_guard<std::mutex> lock(mutex);
+				pending--;
+			}
+			done.notify_one();
+		}
+	}
+
+	std::vector<std::thread> workers;
+	std::mutex mutex;
+	std::condition_variable wake;
+	std::condition_variable done;
+	const std::function<void(int)> *current = nullptr;
+	unsigned long generation = 0;
+	int pending = 0;
+	bool exiting = false;
+};
+
+#endif // THREAD_POOL_HPP
@@ -0,0 +1,562 @@
+#include "threat_search.hpp"
+#include "line_patterns.hpp"
+
+namespace
+{
+	using Move = std::pair<int,int>;
+
+	constexpr int CELLS = BitBoard::MAX_SIZE * BitBoard::MAX_SIZE;
+
+	// Cells of a candidate list, without duplicates.
+	struct MoveSet
+	{
+		std::vector<Move> moves;
+		bool seen[CELLS] = {};
+
+		void add(int row, int col)
+		{
+			int cell = BitBoard::cellIndex(row, col);
+			if (!seen[cell]) {
+				seen[cell] = true;
+				moves.push_back({row, col});
+			}
+		}
+	};
+
+	// Cells where a player makes a threat, found in the windows of 5 cells without
+	// stones of the opponent: 4 own stones give a five, 3 a four, 2 maybe a three.
+	struct Threats
+	{
+		MoveSet fives;
+		MoveSet fours;
+		MoveSet threes;
+		// Directions (bit mask) of the five made on each of the `fives` cells
+		uint8_t fiveDirs[CELLS] = {};
+	};
+
+	bool onBoard(int n, int row, int col)
+	{
+		return row >= 0 && row < n && col >= 0 && col < n;
+	}
+
+	bool capturesEnabled(const Gomoku &state)
+	{
+		std::string type = state.getGameType();
+		return type == "normal" || type == "duo";
+	}
+
+	void scanWindows(const Gomoku &state, int player, bool withThrees, Threats &out)
+	{
+		const int8_t *data = state.getBoardData();
+		int n = state.getBoardSize();
+		// Six or more in a row is no five in "special": only exact fives count there.
+		bool exact = state.getGameType() == "special";
+
+		for (int dir = 0; dir < 4; dir++) {
+			int dr = BitBoard::DIRECTIONS[dir][0];
+			int dc = BitBoard::DIRECTIONS[dir][1];
+			for (int row = 0; row < n; row++)
+				for (int col = 0; col < n; col++) {
+					if (!onBoard(n, row + 4 * dr, col + 4 * dc))
+						continue;
+					int own = 0;
+					bool blocked = false;
+					for (int k = 0; k < 5 && !blocked; k++) {
+						int value = data[BitBoard::cellIndex(row + k * dr, col + k * dc)];
+						blocked = value == -player;
+						own += value == player;
+					}
+					if (blocked || own < 2 || (own == 2 && !withThrees))
+						continue;
+
+					MoveSet &target = (own == 4) ? out.fives : (own == 3) ? out.fours : out.threes;
+					for (int k = 0; k < 5; k++) {
+						int r = row + k * dr;
+						int c = col + k * dc;
+						int cell = BitBoard::cellIndex(r, c);
+						if (data[cell] != EMPTY)
+							continue;
+						if (own == 4) {
+							if (exact) {
+								uint8_t ownFlags[4];
+								uint8_t opponentFlags[4];
+								state.getLineShapes(r, c, player, ownFlags, opponentFlags);
+								if (!(ownFlags[dir] & linepatterns::FIVE))
+									continue;
+							}
+							out.fiveDirs[cell] |= 1 << dir;
+						}
+						target.add(r, c);
+					}
+				}
+		}
+	}
+
+	// The five cells of scanWindows, in the windows through (row, col) only.
+	void fivesThrough(const Gomoku &state, int row, int col, int player, MoveSet &out)
+	{
+		const int8_t *data = state.getBoardData();
+		int n = state.getBoardSize();
+		bool exact = state.getGameType() == "special";
+
+		for (int dir = 0; dir < 4; dir++) {
+			int dr = BitBoard::DIRECTIONS[dir][0];
+			int dc = BitBoard::DIRECTIONS[dir][1];
+			for (int start = -4; start <= 0; start++) {
+				if (!onBoard(n, row + start * dr, col + start * dc)
+					|| !onBoard(n, row + (start + 4) * dr, col + (start + 4) * dc))
+					continue;
+				int own = 0;
+				int empty = 0;
+				bool blocked = false;
+				for (int k = start; k < start + 5 && !blocked; k++) {
+					int value = data[BitBoard::cellIndex(row + k * dr, col + k * dc)];
+					blocked = value == -player;
+					own += value == player;
+					if (value == EMPTY)
+						empty = k;
+				}
+				if (blocked || own != 4)
+					continue;
+				int r = row + empty * dr;
+				int c = col + empty * dc;
+				if (exact) {
+					uint8_t ownFlags[4];
+					uint8_t opponentFlags[4];
+					state.getLineShapes(r, c, player, ownFlags, opponentFlags);
+					if (!(ownFlags[dir] & linepatterns::FIVE))
+						continue;
+				}
+				out.add(r, c);
+			}
+		}
+	}
+
+	// Empty cells of the windows through the stone at (row, col) holding 3 stones of
+	// `player` or more, and none of the opponent. Returns their directions (bit mask).
+	int threatLines(const Gomoku &state, int row, int col, int player, MoveSet &out)
+	{
+		const int8_t *data = state.getBoardData();
+		int n = state.getBoardSize();
+		int dirs = 0;
+
+		for (int dir = 0; dir < 4; dir++) {
+			int dr = BitBoard::DIRECTIONS[dir][0];
+			int dc = BitBoard::DIRECTIONS[dir][1];
+			for (int start = -4; start <= 0; start++) {
+				if (!onBoard(n, row + start * dr, col + start * dc)
+					|| !onBoard(n, row + (start + 4) * dr, col + (start + 4) * dc))
+					continue;
+				int own = 0;
+				bool blocked = false;
+				for (int k = start; k < start + 5 && !blocked; k++) {
+					int value = data[BitBoard::cellIndex(row + k * dr, col + k * dc)];
+					blocked = value == -player;
+					own += value == player;
+				}
+				if (blocked || own < 3)
+					continue;
+				dirs |= 1 << dir;
+				for (int k = start; k < start + 5; k++)
+					if (data[BitBoard::cellIndex(row + k * dr, col + k * dc)] == EMPTY)
+						out.add(row + k * dr, col + k * dc);
+			}
+		}
+		return dirs;
+	}
+
+	// Empty cells where `player` would capture a pair.
+	void captureCells(const Gomoku &state, int player, MoveSet &out)
+	{
+		const int8_t *data = state.getBoardData();
+		int n = state.getBoardSize();
+		for (int row = 0; row < n; row++)
+			for (int col = 0; col < n; col++) {
+				if (data[BitBoard::cellIndex(row, col)] != -player)
+					continue;
+				for (int dr = -1; dr <= 1; dr++)
+					for (int dc = -1; dc <= 1; dc++) {
+						int r = row + dr;
+						int c = col + dc;
+						if (onBoard(n, r, c) && data[BitBoard::cellIndex(r, c)] == EMPTY
+							&& state.canCapture(r, c, player))
+							out.add(r, c);
+					}
+			}
+	}
+
+	/**
+	 * Empty cells where the opponent of `player` would threaten to capture a stone of
+	 * the lines through (row, col) in the directions of `dirs`: a pair of stones of
+	 * `player` with both ends empty. A five with such a stone is breakable, so it no
+	 * longer wins at once. The `fives` cells count as stones of `player`.
+	 */
+	void captureThreatCells(const Gomoku &state, int row, int col, int dirs, int player, const MoveSet &fives,
+		MoveSet &out)
+	{
+		const int8_t *data = state.getBoardData();
+		int n = state.getBoardSize();
+		auto cell = [&](int r, int c) {
+			if (!onBoard(n, r, c))
+				return -player;
+			int index = BitBoard::cellIndex(r, c);
+			return fives.seen[index] ? player : static_cast<int>(data[index]);
+		};
+
+		for (int dir = 0; dir < 4; dir++) {
+			if (!(dirs & (1 << dir)))
+				continue;
+			for (int k = -4; k <= 4; k++) {
+				int r = row + k * BitBoard::DIRECTIONS[dir][0];
+				int c = col + k * BitBoard::DIRECTIONS[dir][1];
+				if (cell(r, c) != player)
+					continue;
+				// Pairs of this stone with a neighbor, across the line
+				for (const auto &across : BitBoard::DIRECTIONS)
+					for (int sign : {1, -1}) {
+						int dr = sign * across[0];
+						int dc = sign * across[1];
+						if (cell(r + dr, c + dc) == player
+							&& cell(r - dr, c - dc) == EMPTY && cell(r + 2 * dr, c + 2 * dc) == EMPTY) {
+							out.add(r - dr, c - dc);
+							out.add(r + 2 * dr, c + 2 * dc);
+						}
+					}
+			}
+		}
+	}
+
+	// Empty cells where `player` would threaten a capture: both ends of a pair of
+	// opponent stones with both ends empty.
+	void captureSetupCells(const Gomoku &state, int player, MoveSet &out)
+	{
+		const int8_t *data = state.getBoardData();
+		int n = state.getBoardSize();
+		auto cell = [&](int r, int c) {
+			return onBoard(n, r, c) ? static_cast<int>(data[BitBoard::cellIndex(r, c)]) : player;
+		};
+
+		for (int row = 0; row < n; row++)
+			for (int col = 0; col < n; col++) {
+				if (data[BitBoard::cellIndex(row, col)] != -player)
+					continue;
+				for (const auto &dir : BitBoard::DIRECTIONS) {
+					int dr = dir[0];
+					int dc = dir[1];
+					if (cell(row + dr, col + dc) == -player
+						&& cell(row - dr, col - dc) == EMPTY && cell(row + 2 * dr, col + 2 * dc) == EMPTY) {
+						out.add(row - dr, col - dc);
+						out.add(row + 2 * dr, col + 2 * dc);
+					}
+				}
+			}
+	}
+
+	// Directions (bit mask) in which the stone at (row, col) is part of an open three.
+	int openThrees(const Gomoku &state, int row, int col, int player)
+	{
+		uint8_t own[4];
+		uint8_t opponent[4];
+		state.getLineShapes(row, col, player, own, opponent);
+		int dirs = 0;
+		for (int dir = 0; dir < 4; dir++)
+			if (own[dir] & linepatterns::OPEN_THREE)
+				dirs |= 1 << dir;
+		return dirs;
+	}
+
+	int pebblesTaken(const Gomoku &state, int player)
+	{
+		return (player == BLACK) ? state.getBlackPlayerPebblesTaken() : state.getWhitePlayerPebblesTaken();
+	}
+
+	// First move that ends the game for the side to move, played and reverted: one of
+	// its five cells, or a capture once it has taken 6 stones (a move may capture two
+	// pairs). A breakable five does not end the game.
+	bool findWin(Gomoku &state, const Threats &threats, Move &win)
+	{
+		std::vector<Move> moves = threats.fives.moves;
+		int player = state.getCurrentPlayer();
+		if (capturesEnabled(state) && pebblesTaken(state, player) >= 6) {
+			MoveSet captures;
+			captureCells(state, player, captures);
+			moves.insert(moves.end(), captures.moves.begin(), captures.moves.end());
+		}
+
+		for (const Move &mv : moves) {
+			if (!state.isLegalMove(mv.first, mv.second))
+				continue;
+			if (!std::get<0>(state.makeMove(mv.first, mv.second)))
+				continue;
+			bool over = state.getGameStatus();
+			state.unmakeMove();
+			if (over) {
+				win = mv;
+				return true;
+			}
+		}
+		return false;
+	}
+
+	// Whether `player`, who is not to move, would end the game on one of `cells`.
+	bool winsNextMove(Gomoku &state, int player, const std::vector<Move> &cells)
+	{
+		int toMove = state.getCurrentPlayer();
+		state.setCurrentPlayer(player);
+		Move win;
+		Threats threats;
+		threats.fives.moves = cells;
+		bool wins = findWin(state, threats, win);
+		state.setCurrentPlayer(toMove);
+		return wins;
+	}
+}
+
+ThreatSearch::ThreatSearch(Mode mode, int maxDepth, uint64_t maxNodes, int timeLimitMs)
+	: mode(mode), maxDepth(maxDepth), maxNodes(maxNodes), timeLimited(timeLimitMs > 0),
+	  deadline(std::chrono::steady_clock::now() + std::chrono::milliseconds(timeLimitMs))
+{
+}
+
+ThreatResult ThreatSearch::solve(const Gomoku &game)
+{
+	ThreatResult result;
+	nodes = 0;
+	aborted = false;
+	if (game.getGameStatus())
+		return result;
+
+	Gomoku state = game.clone();
+	result.win = attack(state, maxDepth, result.sequence);
+	result.complete = result.win || !aborted;
+	result.nodes = nodes;
+	return result;
+}
+
+bool ThreatSearch::outOfBudget()
+{
+	if (!aborted && (nodes >= maxNodes
+		|| (timeLimited && (nodes & 255) == 0 && std::chrono::steady_clock::now() >= deadline)))
+		aborted = true;
+	return aborted;
+}
+
+/**
+ * The side to move attacks: true if it wins at once, or if one of its threats
+ * wins against every reply, with the winning line in `line`.
+ */
+bool ThreatSearch::attack(Gomoku &state, int depth, std::vector<Move> &line)
+{
+	if (outOfBudget())
+		return false;
+	nodes++;
+
+	// The defender made a breakable five: the attacker has to capture, which is no threat.
+	if (!state.getForcedMoves().empty())
+		return false;
+
+	int player = state.getCurrentPlayer();
+	Threats threats;
+	scanWindows(state, player, mode == VCT && depth > 0, threats);
+
+	Move win;
+	if (findWin(state, threats, win)) {
+		line = {win};
+		return true;
+	}
+	if (depth == 0)
+		return false;
+
+	// A four of the defender has to be blocked, and the block has to be a threat too.
+	Threats defender;
+	scanWindows(state, -player, false, defender);
+	if (defender.fives.moves.size() > 1)
+		return false;
+
+	std::vector<Move> moves = defender.fives.moves;
+	if (moves.empty()) {
+		// Breakable fives force a capture, then fours, then (VCT) the cells of a possible
+		// three, or (CAPTURES) the captures and the threats to capture
+		moves = threats.fives.moves;
+		moves.insert(moves.end(), threats.fours.moves.begin(), threats.fours.moves.end());
+		moves.insert(moves.end(), threats.threes.moves.begin(), threats.threes.moves.end());
+		if (mode == CAPTURES) {
+			MoveSet captures;
+			captureCells(state, player, captures);
+			captureSetupCells(state, player, captures);
+			moves.insert(moves.end(), captures.moves.begin(), captures.moves.end());
+		}
+	}
+
+	int taken = pebblesTaken(state, player);
+	for (const Move &mv : moves) {
+		if (!state.isLegalMove(mv.first, mv.second))
+			continue;
+		if (!std::get<0>(state.makeMove(mv.first, mv.second)))
+			continue;
+		if (state.getGameStatus()) {
+			state.unmakeMove();
+			line = {mv};
+			return true;
+		}
+
+		// A four is a new five cell anywhere on the board (a capture may open one
+		// away from the move), where the five would win: a five the defender could
+		// break at once is no threat. A breakable five forces the capture like a four.
+		bool captured = pebblesTaken(state, player) != taken;
+		bool four = !state.getForcedMoves().empty();
+		if (!four) {
+			MoveSet after;
+			if (captured) {
+				Threats board;
+				scanWindows(state, player, false, board);
+				after = board.fives;
+			} else {
+				fivesThrough(state, mv.first, mv.second, player, after);
+			}
+			std::vector<Move> fives;
+			for (const Move &cell : after.moves)
+				if (!threats.fives.seen[BitBoard::cellIndex(cell.first, cell.second)])
+					fives.push_back(cell);
+			// In a capture race, a capture that would take the 10th stone is a four too
+			// (the attacker had none, or it would have won at once).
+			four = (!fives.empty() || mode == CAPTURES) && winsNextMove(state, player, fives);
+		}
+		// The defenses of a three are only known on its own line: not after a capture.
+		bool three = !four && mode == VCT && !captured && openThrees(state, mv.first, mv.second, player);
+
+		std::vector<Move> replies;
+		bool won = (four || three) && defend(state, depth - 1, mv, four, replies);
+		state.unmakeMove();
+		if (won) {
+			line = {mv};
+			line.insert(line.end(), replies.begin(), replies.end());
+			return true;
+		}
+		if (aborted)
+			return false;
+	}
+	return false;
+}
+
+/**
+ * The side to move defends against the threat the attacker made at `threat`
+ * (a four or a breakable five if `four`, an open three otherwise): true if the
+ * attacker wins against every reply, with the line of the first reply in `line`.
+ */
+bool ThreatSearch::defend(Gomoku &state, int depth, Move threat, bool four, std::vector<Move> &line)
+{
+	if (outOfBudget())
+		return false;
+	nodes++;
+
+	int player = state.getCurrentPlayer();
+	const int8_t *data = state.getBoardData();
+	int n = state.getBoardSize();
+
+	MoveSet replies;
+	if (!state.getForcedMoves().empty()) {
+		for (const Move &mv : state.getForcedMoves())
+			replies.add(mv.first, mv.second);
+	} else {
+		Threats threats;
+		scanWindows(state, player, false, threats);
+		Move win;
+		if (findWin(state, threats, win))
+			return false;
+		// A breakable five of the defender forces the attacker to capture
+		for (const Move &mv : threats.fives.moves)
+			replies.add(mv.first, mv.second);
+
+		bool captures = capturesEnabled(state);
+		if (four) {
+			// Take a five cell, or threaten to capture a stone of the five to come
+			Threats attacker;
+			scanWindows(state, -player, false, attacker);
+			for (const Move &mv : attacker.fives.moves) {
+				replies.add(mv.first, mv.second);
+				if (captures)
+					captureThreatCells(state, mv.first, mv.second,
+						attacker.fiveDirs[BitBoard::cellIndex(mv.first, mv.second)], -player, attacker.fives, replies);
+			}
+			// Or take the cell of the capture that would win (a capture of a stone of
+			// the attacker's pattern is added below)
+			if (mode == CAPTURES)
+				captureCells(state, -player, replies);
+		} else {
+			// An empty cell of a line the threat made (the three, but also any other
+			// window where the move left 3 stones of the attacker), a four of the
+			// defender, or a threat to capture a stone of these lines
+			int dirs = threatLines(state, threat.first, threat.second, -player, replies);
+			for (const Move &mv : threats.fours.moves)
+				replies.add(mv.first, mv.second);
+			if (captures)
+				captureThreatCells(state, threat.first, threat.second, dirs, -player, MoveSet(), replies);
+		}
+		if (captures)
+			captureCells(state, player, replies);
+	}
+
+	// A four the defender cannot legally block (double-three ban) goes through. A three
+	// without a legal reply on its line is left alone: the defender may play elsewhere.
+	bool first = true;
+	for (const Move &mv : replies.moves) {
+		if (!state.isLegalMove(mv.first, mv.second))
+			continue;
+		if (!std::get<0>(state.makeMove(mv.first, mv.second)))
+			continue;
+		if (state.getGameStatus()) {
+			state.unmakeMove();
+			return false;
+		}
+
+		std::vector<Move> continuation;
+		bool won = attack(state, depth, continuation);
+		state.unmakeMove();
+		if (!won)
+			return false;
+		if (first) {
+			line = {mv};
+			line.insert(line.end(), continuation.begin(), continuation.end());
+			first = false;
+		}
+	}
+	return !first || four;
+}
+
+std::vector<std::pair<int,int>> threatDefenses(const Gomoku &game, const ThreatResult &opponentWin)
+{
+	const int8_t *data = game.getBoardData();
+	int player = game.getCurrentPlayer();
+
+	MoveSet defenses;
+	for (const Move &mv : opponentWin.sequence)
+		if (data[BitBoard::cellIndex(mv.first, mv.second)] == EMPTY)
+			defenses.add(mv.first, mv.second);
+	Threats threats;
+	scanWindows(game, player, false, threats);
+	for (const MoveSet *set : {&threats.fives, &threats.fours})
+		for (const Move &mv : set->moves)
+			defenses.add(mv.first, mv.second);
+	if (capturesEnabled(game)) {
+		captureCells(game, player, defenses);
+		// Take the cell of a capture of the opponent (a capture race)
+		captureCells(game, -player, defenses);
+	}
+	return defenses.moves;
+}
+
+ThreatResult solveVCF(const Gomoku &game, int maxDepth, uint64_t maxNodes, int timeLimitMs)
+{
+	return ThreatSearch(ThreatSearch::VCF, maxDepth, maxNodes, timeLimitMs).solve(game);
+}
+
+ThreatResult solveVCT(const Gomoku &game, int maxDepth, uint64_t maxNodes, int timeLimitMs)
+{
+	return ThreatSearch(ThreatSearch::VCT, maxDepth, maxNodes, timeLimitMs).solve(game);
+}
+
+ThreatResult solveCaptureRace(const Gomoku &game, int maxDepth, uint64_t maxNodes, int timeLimitMs)
+{
+	return ThreatSearch(ThreatSearch::CAPTURES, maxDepth, maxNodes, timeLimitMs).solve(game);
+}
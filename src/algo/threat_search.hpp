@@ -0,0 +1,83 @@
+#ifndef THREAT_SEARCH_HPP
+#define THREAT_SEARCH_HPP
+
+#pragma once
+
+#include <chrono>
+#include <cstdint>
+#include <utility>
+#include <vector>
+
+#include "gomoku.hpp"
+
+// Outcome of a threat-space search.
+struct ThreatResult
+{
+	// A winning sequence was found for the side to move.
+	bool win = false;
+	// The whole threat space up to the maximum depth was searched, within the budget:
+	// without a win, there is no such forced win (for the defenses the solver knows).
+	bool complete = false;
+	// Attacker move, defender reply, attacker move, ..., ending with the winning move
+	// (or a four the defender has no legal move against). Against several replies,
+	// the line of the first one.
+	std::vector<std::pair<int,int>> sequence;
+	uint64_t nodes = 0;
+};
+
+/**
+ * Threat-space search: the side to move only plays threats, the opponent only
+ * the replies that can stop them, and the search looks for a win against every
+ * reply (an AND-OR tree).
+ *
+ *   VCF (victory by continuous fours): every attacking move makes a four
+ *   (a five next move). The defender must take the five cell, capture, threaten
+ *   to capture a stone of the five (which makes it breakable), or win.
+ *   VCT (victory by continuous threats): open threes are allowed too. The
+ *   defender may also take a cell of the line of the three, or make a four of its own.
+ *   CAPTURES (capture race, "normal" and "duo"): like VCF, but captures and threats to
+ *   capture are attacking moves too, and a move that would take the 10th stone is a
+ *   four. The defender may also take the cell of that capture.
+ *
+ * Every move goes through Gomoku::makeMove, so captures, the double-three ban,
+ * overlines in "special" and breakable fives (the opponent is then forced to
+ * capture) follow the rules of the game. The search stops at `maxDepth`
+ * attacking moves, `maxNodes` nodes or `timeLimitMs` milliseconds (0: no limit).
+ */
+class ThreatSearch
+{
+public:
+	enum Mode { VCF, VCT, CAPTURES };
+
+	ThreatSearch(Mode mode, int maxDepth, uint64_t maxNodes, int timeLimitMs = 0);
+
+	ThreatResult solve(const Gomoku &game);
+
+private:
+	using Move = std::pair<int,int>;
+
+	bool attack(Gomoku &state, int depth, std::vector<Move> &line);
+	bool defend(Gomoku &state, int depth, Move threat, bool four, std::vector<Move> &line);
+	bool outOfBudget();
+
+	Mode mode;
+	int maxDepth;
+	uint64_t maxNodes;
+	bool timeLimited;
+	std::chrono::steady_clock::time_point deadline;
+	uint64_t nodes = 0;
+	bool aborted = false;
+};
+
+ThreatResult solveVCF(const Gomoku &game, int maxDepth = 12, uint64_t maxNodes = 100000, int timeLimitMs = 0);
+ThreatResult solveVCT(const Gomoku &game, int maxDepth = 6, uint64_t maxNodes = 100000, int timeLimitMs = 0);
+// Only useful once a player has taken 6 stones or more (see CAPTURES).
+ThreatResult solveCaptureRace(const Gomoku &game, int maxDepth = 10, uint64_t maxNodes = 100000, int timeLimitMs = 0);
+
+// Moves of the side to move of `game` that may stop `opponentWin`, a win the
+// opponent would have if it were to move: the cells of its winning line and of the
+// captures of the opponent, and the fours and captures of the side to move. Any
+// other move leaves the line playable.
+std::vector<std::pair<int,int>> threatDefenses(const Gomoku &game, const ThreatResult &opponentWin);
+
+#endif // THREAT_SEARCH_HPP
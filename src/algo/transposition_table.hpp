@@ -0,0 +1,185 @@
+#ifndef TRANSPOSITION_TABLE_HPP
+#define TRANSPOSITION_TABLE_HPP
+
+#pragma once
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+/**
+ * Fixed-size transposition table shared by the search threads.
+ *
+ * The table is a power-of-two array of 64-byte buckets (one cache line) of 4
+ * entries, indexed by the low bits of the 64-bit position hash. An entry is two
+ * 64-bit words: the packed data (score, best move, depth, bound, age) and the
+ * hash XOR the data. Both words are written and read without any lock, and a
+ * probe only trusts an entry whose words XOR back to the probed hash, so an
+ * entry torn by two threads writing at the same time is simply a miss.
+ *
+ * When a bucket is full, the entry of the same position is replaced first,
+ * then the one with the lowest depth, entries of older searches counting as
+ * shallower (see newSearch).
+ */
+class TranspositionTable
+{
+public:
+	enum Bound : uint8_t { NONE = 0, UPPER = 1, LOWER = 2, EXACT = 3 };
+
+	static constexpr int NO_MOVE = 0x1FF;
+	static constexpr size_t DEFAULT_SIZE_MB = 16;
+
+	struct Entry
+	{
+		int32_t score;
+		int move;  // BitBoard::cellIndex of the best move, or NO_MOVE
+		int depth;
+		Bound bound;
+	};
+
+	explicit TranspositionTable(size_t megabytes = DEFAULT_SIZE_MB)
+	{
+		resize(megabytes);
+	}
+
+	// Reallocate the table with the largest power-of-two number of buckets that fits
+	// in `megabytes` (at least one bucket). Every entry is lost.
+	void resize(size_t megabytes)
+	{
+		size_t count = 1;
+		while (count * 2 * sizeof(Bucket) <= megabytes * 1024 * 1024)
+			count *= 2;
+		buckets = std::vector<Bucket>(count);
+		mask = count - 1;
+		age.store(0, std::memory_order_relaxed);
+	}
+
+	size_t sizeMb() const { return buckets.size() * sizeof(Bucket) / (1024 * 1024); }
+	size_t bucketCount() const { return buckets.size(); }
+
+	void clear()
+	{
+		for (Bucket &bucket : buckets)
+			for (Slot &slot : bucket.slots) {
+				slot.check.store(0, std::memory_order_relaxed);
+				slot.data.store(0, std::memory_order_relaxed);
+			}
+		age.store(0, std::memory_order_relaxed);
+	}
+
+	// Start a new search: the entries of the previous ones become easier to replace.
+	// Searches may start at once on several threads (analyze_batch): the counter
+	// only grows, and is read modulo AGE_MASK + 1.
+	void newSearch() { age.fetch_add(1, std::memory_order_relaxed); }
+
+	bool probe(uint64_t key, Entry &out) const
+	{
+		const Bucket &bucket = buckets[key & mask];
+		for (const Slot &slot : bucket.slots) {
+			uint64_t data = slot.data.load(std::memory_order_relaxed);
+			uint64_t check = slot.check.load(std::memory_order_relaxed);
+			if (data != 0 && (check ^ data) == key) {
+				out = unpack(data);
+				return true;
+			}
+		}
+		return false;
+	}
+
+	void store(uint64_t key, int depth, Bound bound, int32_t score, int move)
+	{
+		Bucket &bucket = buckets[key & mask];
+		Slot *target = nullptr;
+		int targetWorth = 0;
+		for (Slot &slot : bucket.slots) {
+			uint64_t data = slot.data.load(std::memory_order_relaxed);
+			uint64_t check = slot.check.load(std::memory_order_relaxed);
+			if (data != 0 && (check ^ data) == key) {
+				// Same position: keep the best move we had if the new search has none.
+				if (move == NO_MOVE)
+					move = unpack(data).move;
+				target = &slot;
+				break;
+			}
+			int worth = (data == 0) ? -1000 : replacementWorth(data);
+			if (target == nullptr || worth < targetWorth) {
+				target = &slot;
+				targetWorth = worth;
+			}
+		}
+
+		uint64_t data = pack(depth, bound, score, move);
+		target->data.store(data, std::memory_order_relaxed);
+		target->check.store(key ^ data, std::memory_order_relaxed);
+	}
+
+	// Permille of the entries used by the current search (sampled on the first buckets).
+	int hashfull() const
+	{
+		size_t sample = buckets.size() < 250 ? buckets.size() : 250;
+		int used = 0;
+		for (size_t i = 0; i < sample; i++)
+			for (const Slot &slot : buckets[i].slots) {
+				uint64_t data = slot.data.load(std::memory_order_relaxed);
+				if (data != 0 && ((data >> AGE_SHIFT) & AGE_MASK) == currentAge())
+					used++;
+			}
+		return sample ? static_cast<int>(used * 1000 / (sample * BUCKET_SIZE)) : 0;
+	}
+
+private:
+	static constexpr int BUCKET_SIZE = 4;
+	// Layout of the data word: score (32 bits) | move (9) | depth (7) | bound (2) | age (8)
+	static constexpr int MOVE_SHIFT = 32;
+	static constexpr int DEPTH_SHIFT = 41;
+	static constexpr int BOUND_SHIFT = 48;
+	static constexpr int AGE_SHIFT = 50;
+	static constexpr uint64_t AGE_MASK = 0xFF;
+
+	struct Slot
+	{
+		std::atomic<uint64_t> check{0};
+		std::atomic<uint64_t> data{0};
+	};
+
+	struct alignas(64) Bucket
+	{
+		Slot slots[BUCKET_SIZE];
+	};
+
+	uint64_t pack(int depth, Bound bound, int32_t score, int move) const
+	{
+		return static_cast<uint32_t>(score)
+			| (static_cast<uint64_t>(move & 0x1FF) << MOVE_SHIFT)
+			| (static_cast<uint64_t>(depth & 0x7F) << DEPTH_SHIFT)
+			| (static_cast<uint64_t>(bound & 0x3) << BOUND_SHIFT)
+			| (currentAge() << AGE_SHIFT);
+	}
+
+	static Entry unpack(uint64_t data)
+	{
+		Entry entry;
+		entry.score = static_cast<int32_t>(static_cast<uint32_t>(data));
+		entry.move = static_cast<int>((data >> MOVE_SHIFT) & 0x1FF);
+		entry.depth = static_cast<int>((data >> DEPTH_SHIFT) & 0x7F);
+		entry.bound = static_cast<Bound>((data >> BOUND_SHIFT) & 0x3);
+		return entry;
+	}
+
+	// Entries of older searches are worth 4 plies less per search.
+	int replacementWorth(uint64_t data) const
+	{
+		int entryDepth = static_cast<int>((data >> DEPTH_SHIFT) & 0x7F);
+		int entryAge = static_cast<int>((currentAge() - ((data >> AGE_SHIFT) & AGE_MASK)) & AGE_MASK);
+		return entryDepth - 4 * entryAge;
+	}
+
+	uint64_t currentAge() const { return age.load(std::memory_order_relaxed) & AGE_MASK; }
+
+	std::vector<Bucket> buckets;
+	size_t mask = 0;
+	std::atomic<uint64_t> age{0};
+};
+
+#endif // TRANSPOSITION_TABLE_HPP
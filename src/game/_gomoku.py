@@ -10,6 +10,40 @@ def debug(func):
 			return func(*args, **kwargs)
 	return wrapper
 
+# Cells of a line window: blocked (opponent or off-board), own stone or empty
+_BLOCKED, _OWN, _EMPTY = 0, 1, 2
+# Open three shapes (_XXX_, _XX_X_, _X_XX_), the reversed shapes are the same set
+_OPEN_THREE_SHAPES = (
+	(_EMPTY, _OWN, _OWN, _OWN, _EMPTY),
+	(_EMPTY, _OWN, _OWN, _EMPTY, _OWN, _EMPTY),
+	(_EMPTY, _OWN, _EMPTY, _OWN, _OWN, _EMPTY),
+)
+# Neighbours of a stone along a line, the stone itself being in the middle of the 9-cell window
+_LINE_OFFSETS = (-4, -3, -2, -1, 1, 2, 3, 4)
+
+def _build_open_three_table() -> bytes:
+	"""
+	For every 9-cell window around an own stone, encoded in base 3 (one digit per
+	neighbour, in the order of _LINE_OFFSETS), tell if the stone is part of an open three.
+	"""
+	table = bytearray(3 ** len(_LINE_OFFSETS))
+	for index in range(len(table)):
+		cells = []
+		digits = index
+		for _ in _LINE_OFFSETS:
+			cells.append(digits % 3)
+			digits //= 3
+		cells.insert(4, _OWN)
+		for shape in _OPEN_THREE_SHAPES:
+			length = len(shape)
+			# Only the windows that contain the stone
+			for start in range(max(0, 5 - length), min(4, 9 - length) + 1):
+				if tuple(cells[start:start + length]) == shape:
+					table[index] = 1
+	return bytes(table)
+
+_OPEN_THREE_TABLE = _build_open_three_table()
+
 class Gomoku:
 	"""Gomoku game class."""
 
@@ -272,32 +306,10 @@ class Gomoku:
 		"""Check if the move creates a double-three configuration.
 		Le mouvement a déjà été effectué, row et col sont les positions du mouvement."""
 		threats = 0
-		color_sequence = []
 		directions = [(0, 1), (1, 0), (1, 1), (1, -1)] # Horizontal, vertical, and diagonals
 
 		for dr, dc in directions:
-			# Check one direction (e.g., left or up)
-			i_pos = 0
-			color_sequence = []
-			color_sequence.append(self.board[row, col])
-			for i in range(1, 5):
-				r, c = row + i * dr, col + i * dc
-				if 0 <= r < self.board_size and 0 <= c < self.board_size:
-					color_sequence.append(self.board[r, c])
-				else :
-					break
-
-			# Check the opposite direction (e.g., right or down)
-			for i in range(1, 5):
-				r, c = row - i * dr, col - i * dc
-				if 0 <= r < self.board_size and 0 <= c < self.board_size:
-					i_pos += 1
-					#add at the beginning of the list
-					color_sequence.insert(0, self.board[r, c])
-				else :
-					break
-
-			if self._analyze_sequence_for_threats(color_sequence, self.current_player, i_pos):
+			if self._analyze_sequence_for_threats(row, col, dr, dc, self.current_player):
 				threats += 1
 
 			# Early exit if more than one threat is found (double-three condition)
@@ -306,30 +318,21 @@ class Gomoku:
 		
 		return False
 
-	def _analyze_sequence_for_threats(self, sequence, player, middle_index):
-		"""Analyze a sequence to find specific open three threats ensuring the played stone is part of the pattern."""
-		seq_len = len(sequence)
-
-		# Define patterns where the middle stone is part of an "open three"
-		# Patterns are checked with the middle stone as part of the three
-		patterns = [
-			(0, player, player, player, 0),
-			(0, player, player, 0, player, 0),
-			(0, player, 0, player, player, 0)
-		]
-
-		# Check patterns ensuring the middle stone is within the "three" part
-		for pattern in patterns:
-			start_index = middle_index - 2  # Start a bit left of the middle stone
-			pattern_length = len(pattern)
-			
-			# Slide the window of pattern length around the middle stone
-			for offset in range(-2, 3):
-				if 0 <= start_index + offset < seq_len - pattern_length + 1:
-					if tuple(sequence[start_index + offset:start_index + offset + pattern_length]) == pattern:
-						return True
-
-		return False
+	def _analyze_sequence_for_threats(self, row, col, dr, dc, player):
+		"""Check if the stone of `player` at (row, col) is part of an open three along (dr, dc).
+		The 9-cell window around the stone is encoded in base 3 and looked up in _OPEN_THREE_TABLE."""
+		index = 0
+		power = 1
+		for offset in _LINE_OFFSETS:
+			r, c = row + offset * dr, col + offset * dc
+			if 0 <= r < self.board_size and 0 <= c < self.board_size:
+				value = self.board[r, c]
+				if value == player:
+					index += _OWN * power
+				elif value == PlayerToken.EMPTY.value:
+					index += _EMPTY * power
+			power *= 3
+		return _OPEN_THREE_TABLE[index] == 1
 
 	def _get_number_of_threats(self, player):
 		"""
@@ -344,63 +347,17 @@ class Gomoku:
 		"""
 		pebbles = self._get_all_pebble_of_player(player)
 		threats = 0
-		patterns = [
-			(0, player, player, player, 0),
-			(0, player, player, 0, player, 0),
-			(0, player, 0, player, player, 0)
-		]
 
 		# Precompute the directions
 		directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
 
 		for row, col in pebbles:
 			for dr, dc in directions:
-				for pattern in patterns:
-					# Check both directions simultaneously
-					if self._check_pattern(row, col, dr, dc, pattern) or self._check_pattern(row, col, -dr, -dc, pattern):
-						threats += 1
-						break  # No need to check further for this direction/pattern
+				if self._analyze_sequence_for_threats(row, col, dr, dc, player):
+					threats += 1
 
 		return threats
 
-	def _check_pattern(self, start_row, start_col, dr, dc, pattern):
-		"""
-		Check if a specific pattern exists starting from (start_row, start_col)
-		and following the direction given by (dr, dc).
-
-		Args:
-			start_row (int): Starting row index.
-			start_col (int): Starting column index.
-			dr (int): Row direction (delta row).
-			dc (int): Column direction (delta column).
-			pattern (tuple): The pattern to match.
-
-		Returns:
-			bool: True if the pattern matches, False otherwise.
-		"""
-		pattern_length = len(pattern)
-
-		# Precompute the pattern indices and deltas
-		offsets = [(i * dr, i * dc) for i in range(pattern_length)]
-
-		# Iterate over all possible alignment offsets for the pattern
-		for shift in range(-pattern_length + 1, 1):
-			match = True
-
-			for idx, (row_delta, col_delta) in enumerate(offsets):
-				row = start_row + row_delta + shift * dr
-				col = start_col + col_delta + shift * dc
-
-				# Ensure the position is within bounds and matches the pattern
-				if not self._is_within_bounds(row, col) or self.board[row, col] != pattern[idx]:
-					match = False
-					break
-
-			if match:
-				return True
-
-		return False
-
 	### VICTORY CONDITIONS ###
 	def _has_10_pebbles(self) -> bool:
 		"""Check if a player has captured at least 10 opponent pebbles."""
@@ -448,29 +405,75 @@ class Gomoku:
 
 		return False
 
+	def _get_aligned_stones(self, placed_row: int, placed_col: int) -> set[tuple[int, int]]:
+		"""Stones of the lines of at least five pebbles of the current player going through the given position."""
+		aligned = set()
+		for d_row, d_col in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+			line = [(placed_row, placed_col)]
+			for sign in (1, -1):
+				row, col = placed_row + sign * d_row, placed_col + sign * d_col
+				while self._is_within_bounds(row, col) and self.board[row, col] == self.current_player:
+					line.append((row, col))
+					row += sign * d_row
+					col += sign * d_col
+			if len(line) >= 5:
+				aligned.update(line)
+		return aligned
+
+	def _get_captured_stones(self, placed_row: int, placed_col: int, player: int) -> list[tuple[int, int]]:
+		"""Stones that `player` would capture by playing at the given position (the board is not modified)."""
+		captured = []
+		for d_row, d_col in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+			for sign in (1, -1):
+				first = (placed_row + sign * d_row, placed_col + sign * d_col)
+				second = (placed_row + 2 * sign * d_row, placed_col + 2 * sign * d_col)
+				closing = (placed_row + 3 * sign * d_row, placed_col + 3 * sign * d_col)
+				if (self._is_within_bounds(*closing)
+						and self.board[first] == -player and self.board[second] == -player
+						and self.board[closing] == player):
+					captured += [first, second]
+		return captured
+
 	def _is_5_pebbles_aligned_breakable(self, placed_row: int, placed_col: int) -> bool:
 		"""
-		Check all possible ways the opponent can break a line of five pebbles
-		"""
+		Check all possible ways the opponent can break a line of five pebbles.
 
-		# temp swich player
-		self.current_player = -self.current_player
-		moves = self.get_all_possible_moves()
-		self.current_player = -self.current_player
-
-		for row, col in moves:
-			# Process the move
-			Gomoku_copy = self.copy()
-			Gomoku_copy.current_player = -self.current_player
-			Gomoku_copy.board[row, col] = Gomoku_copy.current_player
-			Gomoku_copy._process_capture(row, col)
-
-			# Check if the original player can still win
-			Gomoku_copy.current_player = self.current_player
-			if not Gomoku_copy._has_5_pebbles_aligned(placed_row, placed_col):
+		Only a capture can break the line, and only if it takes a stone of the line.
+		The candidates are the empty ends of the pairs that contain a stone of the
+		line and are closed by an opponent stone on the other end. Each candidate is
+		then checked by removing its captures from the board and putting them back.
+		"""
+		player = self.current_player
+		opponent = -player
+
+		candidates = set()
+		for row, col in self._get_aligned_stones(placed_row, placed_col):
+			for d_row, d_col in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+				for sign in (1, -1):
+					# The pair made of this stone and the next one, then the cells at both ends
+					partner = (row + sign * d_row, col + sign * d_col)
+					if not self._is_within_bounds(*partner) or self.board[partner] != player:
+						continue
+					ends = [(row - sign * d_row, col - sign * d_col), (partner[0] + sign * d_row, partner[1] + sign * d_col)]
+					if not all(self._is_within_bounds(*end) for end in ends):
+						continue
+					for move, closing in (ends, ends[::-1]):
+						if self.board[move] == PlayerToken.EMPTY.value and self.board[closing] == opponent:
+							candidates.add(move)
+
+		# Same order as a scan of the board
+		for row, col in sorted(candidates):
+			captured = self._get_captured_stones(row, col, opponent)
+			for stone in captured:
+				self.board[stone] = PlayerToken.EMPTY.value
+			broken = not self._has_5_pebbles_aligned(placed_row, placed_col)
+			for stone in captured:
+				self.board[stone] = player
+
+			if broken:
 				self.forced_moves.append((row, col))
 				debug(lambda: print(f"Moves to break the line: {self.forced_moves}"))()
-									
+
 		# Return True if at least one move can break the line
 		return len(self.forced_moves) > 0
 
@@ -0,0 +1,155 @@
+import functools
+
+import numpy as np
+from src.game.playerTokens import PlayerToken
+from src.game._gomoku import Gomoku, _OPEN_THREE_TABLE, _LINE_OFFSETS, _OWN, _EMPTY
+
+# Value read outside of the board: never a stone of a player, never empty
+_OFF_BOARD = 2
+
+# Horizontal, vertical, and diagonals (same order as the loop version)
+_DIRECTIONS = np.array([(0, 1), (1, 0), (1, 1), (1, -1)], dtype=np.intp)
+# Each direction followed by its opposite, for the captures
+_DIRECTIONS_8 = np.concatenate([_DIRECTIONS, -_DIRECTIONS])
+
+# Base-3 weights of the neighbours of a stone, in the order of _LINE_OFFSETS
+_LINE_WEIGHTS = 3 ** np.arange(len(_LINE_OFFSETS))
+_LINE_TABLE = np.frombuffer(_OPEN_THREE_TABLE, dtype=np.uint8)
+
+# The board is padded with _OFF_BOARD cells so that every neighbour can be read without bound checks
+_PAD = max(_LINE_OFFSETS)
+# Columns of the neighbours along a direction: after the stone (1, 2, 3, 4), before it (-1, -2, -3, -4)
+_AFTER = [_LINE_OFFSETS.index(offset) for offset in range(1, _PAD + 1)]
+_BEFORE = [_LINE_OFFSETS.index(-offset) for offset in range(1, _PAD + 1)]
+
+@functools.lru_cache(maxsize=None)
+def _line_neighbours(size: int) -> np.ndarray:
+	"""
+	Flat indexes, in the padded board, of the neighbours of every cell along the
+	4 directions, shape (4 directions, len(_LINE_OFFSETS), size * size).
+	"""
+	rows, cols = np.divmod(np.arange(size * size), size)
+	offsets = np.array(_LINE_OFFSETS)[None, :, None]
+	neighbour_rows = rows + _DIRECTIONS[:, 0, None, None] * offsets + _PAD
+	neighbour_cols = cols + _DIRECTIONS[:, 1, None, None] * offsets + _PAD
+	return neighbour_rows * (size + 2 * _PAD) + neighbour_cols
+
+
+class VectorizedGomoku(Gomoku):
+	"""
+	Gomoku with the same rules as the loop version, computed with NumPy.
+
+	The board is an int8 array. Close moves are a dilation of the occupied cells,
+	captures, alignments and double-threes look at the lines around a stone with a
+	single fancy-indexing gather in a padded copy of the board, and the threat
+	count does the same gather for all the stones of a player at once.
+	"""
+
+	def __init__(self):
+		"""Initialize Gomoku game."""
+		super().__init__()
+		self.board: np.ndarray = np.zeros((self.board_size, self.board_size), dtype=np.int8)
+
+	def copy(self) -> "VectorizedGomoku":
+		"""Create a copy of the current game state."""
+		new_copy = VectorizedGomoku()
+		new_copy.board = np.copy(self.board)
+		new_copy.current_player = self.current_player
+		new_copy.white_player_pebbles_taken = self.white_player_pebbles_taken
+		new_copy.black_player_pebbles_taken = self.black_player_pebbles_taken
+		new_copy.forced_moves = self.forced_moves.copy()
+		new_copy.game_over = self.game_over
+		return new_copy
+
+	### Public utils ###
+	def get_all_possible_moves(self) -> list[tuple[int, int]]:
+		"""Get all the empty positions, in row-major order."""
+		return [tuple(move) for move in np.argwhere(self.board == PlayerToken.EMPTY.value).tolist()]
+
+	def get_all_close_moves(self) -> list[tuple[int, int]]:
+		"""Get all the empty positions next to a stone (8 neighbours), in row-major order."""
+		occupied = np.pad(self.board != PlayerToken.EMPTY.value, 1)
+		size = self.board_size
+
+		near = np.zeros((size, size), dtype=bool)
+		for dr in (-1, 0, 1):
+			for dc in (-1, 0, 1):
+				if dr or dc:
+					near |= occupied[1 + dr:1 + dr + size, 1 + dc:1 + dc + size]
+
+		near &= ~occupied[1:-1, 1:-1]
+		return [tuple(move) for move in np.argwhere(near).tolist()]
+
+	def _get_all_pebble_of_player(self, player: int) -> list[tuple[int, int]]:
+		"""Get all the pebbles of the player."""
+		return [tuple(pebble) for pebble in np.argwhere(self.board == player).tolist()]
+
+	### Private utils #####
+	def _line_values(self, cells) -> np.ndarray:
+		"""
+		Values of the neighbours along the 4 directions of the given flat cell
+		index(es), shape (4, len(_LINE_OFFSETS)) + shape of `cells`.
+		Cells outside the board read as _OFF_BOARD.
+		"""
+		size = self.board_size
+		padded = np.full((size + 2 * _PAD, size + 2 * _PAD), _OFF_BOARD, dtype=np.int8)
+		padded[_PAD:-_PAD, _PAD:-_PAD] = self.board
+		return padded.ravel()[_line_neighbours(size)[:, :, cells]]
+
+	@staticmethod
+	def _open_three_flags(values: np.ndarray, player: int) -> np.ndarray:
+		"""Open three lookup for line neighbours returned by _line_values."""
+		digits = np.where(values == player, _OWN, np.where(values == PlayerToken.EMPTY.value, _EMPTY, 0))
+		return _LINE_TABLE[np.tensordot(_LINE_WEIGHTS, digits, axes=(0, 1))] == 1
+
+	### Captures ###
+	def _process_capture(self, placed_row: int, placed_col: int) -> bool:
+		"""
+		Capture the pairs of opponent stones enclosed by the placed stone and
+		another stone of the current player, in the 8 directions at once.
+		The rays of the 8 directions never share a cell, so checking them
+		together gives the same result as checking them one by one.
+		"""
+		values = self._line_values(placed_row * self.board_size + placed_col)
+		cells = np.concatenate([values[:, _AFTER[:3]], values[:, _BEFORE[:3]]])
+		opponent_token = -self.current_player
+		captured = (cells[:, 0] == opponent_token) & (cells[:, 1] == opponent_token) & (cells[:, 2] == self.current_player)
+		if not captured.any():
+			return False
+
+		directions = _DIRECTIONS_8[captured]
+		for offset in (1, 2):
+			self.board[placed_row + directions[:, 0] * offset, placed_col + directions[:, 1] * offset] = PlayerToken.EMPTY.value
+
+		if self.current_player == PlayerToken.BLACK.value:
+			self.black_player_pebbles_taken += 2 * len(directions)
+		else:
+			self.white_player_pebbles_taken += 2 * len(directions)
+		return True
+
+	### Double-three detection ###
+	def _is_double_three(self, row: int, col: int) -> bool:
+		"""Check if the move creates a double-three configuration (the move is already on the board)."""
+		values = self._line_values(row * self.board_size + col)
+		return np.count_nonzero(self._open_three_flags(values, self.current_player)) >= 2
+
+	def _get_number_of_threats(self, player):
+		"""
+		Number of (stone, direction) pairs where a stone of `player` is part of an open three.
+		The lines around all the stones of the player are gathered and looked up at once.
+		"""
+		stones = np.flatnonzero(self.board.ravel() == player)
+		if len(stones) == 0:
+			return 0
+		return int(np.count_nonzero(self._open_three_flags(self._line_values(stones), player)))
+
+	### VICTORY CONDITIONS ###
+	def _has_5_pebbles_aligned(self, placed_row: int, placed_col: int) -> bool:
+		"""
+		Check if the pebble at the given position is part of a line of at least five
+		pebbles of the current player, in the 4 directions at once.
+		"""
+		own = self._line_values(placed_row * self.board_size + placed_col) == self.current_player
+		# Consecutive stones of the player after the pebble, then before it
+		runs = np.cumprod(own[:, _AFTER], axis=1).sum(axis=1) + np.cumprod(own[:, _BEFORE], axis=1).sum(axis=1)
+		return bool((1 + runs >= 5).any())
@@ -0,0 +1,165 @@
+#ifndef BITBOARD_HPP
+#define BITBOARD_HPP
+
+#pragma once
+
+#include <cstdint>
+
+// Player token definitions
+constexpr int EMPTY = 0;
+constexpr int BLACK = -1;
+constexpr int WHITE = 1;
+
+/**
+ * Bitboard representation of a Gomoku board (up to 19x19).
+ *
+ * Every line of the board is stored as one 32-bit mask per color, for the four
+ * directions: the rows (the plain bitboard) and the "rotated" columns, diagonals
+ * and anti-diagonals. A whole line can then be checked with a few shifts and masks.
+ *
+ * A plain int8 copy of the board (row stride MAX_SIZE) is kept next to the masks,
+ * for single cell reads and to expose the board to Python without conversion.
+ *
+ * Inside a line, bit i is the cell reached after i steps along the direction,
+ * so moving one step forward is always a shift by one bit:
+ *   ROW  (0, 1)  : line = row,                   bit = col
+ *   COL  (1, 0)  : line = col,                   bit = row
+ *   DIAG (1, 1)  : line = col - row + size - 1,  bit = row
+ *   ANTI (1, -1) : line = row + col,             bit = row
+ */
+class BitBoard
+{
+public:
+	static constexpr int MAX_SIZE = 19;
+	static constexpr int MAX_LINES = 2 * MAX_SIZE - 1;
+
+	enum Direction { ROW = 0, COL = 1, DIAG = 2, ANTI = 3 };
+	static constexpr int DIRECTIONS[4][2] = { {0,1}, {1,0}, {1,1}, {1,-1} };
+
+	explicit BitBoard(int size = MAX_SIZE) : n(size), stones(0), lines{}, cells{} {}
+
+	int size() const { return n; }
+	int stoneCount() const { return stones; }
+	bool empty() const { return stones == 0; }
+
+	int get(int r, int c) const
+	{
+		return cells[cellIndex(r, c)];
+	}
+
+	// Row-major cells of the board, with a row stride of MAX_SIZE.
+	const int8_t* data() const { return cells; }
+
+	void set(int r, int c, int player)
+	{
+		clear(r, c);
+		if (player == EMPTY)
+			return;
+		int color = colorIndex(player);
+		lines[ROW][color][r] |= 1u << c;
+		lines[COL][color][c] |= 1u << r;
+		lines[DIAG][color][c - r + n - 1] |= 1u << r;
+		lines[ANTI][color][r + c] |= 1u << r;
+		cells[cellIndex(r, c)] = static_cast<int8_t>(player);
+		stones++;
+	}
+
+	void clear(int r, int c)
+	{
+		int current = get(r, c);
+		if (current == EMPTY)
+			return;
+		int color = colorIndex(current);
+		lines[ROW][color][r] &= ~(1u << c);
+		lines[COL][color][c] &= ~(1u << r);
+		lines[DIAG][color][c - r + n - 1] &= ~(1u << r);
+		lines[ANTI][color][r + c] &= ~(1u << r);
+		cells[cellIndex(r, c)] = EMPTY;
+		stones--;
+	}
+
+	// Index of the line of direction `dir` going through (r, c).
+	int lineIndex(int dir, int r, int c) const
+	{
+		switch (dir) {
+			case ROW:  return r;
+			case COL:  return c;
+			case DIAG: return c - r + n - 1;
+			default:   return r + c;
+		}
+	}
+
+	// Bit of (r, c) inside its line of direction `dir`.
+	static int linePos(int dir, int r, int c)
+	{
+		return (dir == ROW) ? c : r;
+	}
+
+	// Stones of `player` on the line `index` of direction `dir`.
+	uint32_t line(int dir, int player, int index) const
+	{
+		return lines[dir][colorIndex(player)][index];
+	}
+
+	uint32_t occupied(int dir, int index) const
+	{
+		return lines[dir][0][index] | lines[dir][1][index];
+	}
+
+	// Bits of the line that are inside the board.
+	uint32_t validMask(int dir, int index) const
+	{
+		int lo = 0;
+		int hi = n - 1;
+		if (dir == DIAG) {
+			lo = (n - 1 - index > 0) ? n - 1 - index : 0;
+			hi = (2 * (n - 1) - index < n - 1) ? 2 * (n - 1) - index : n - 1;
+		} else if (dir == ANTI) {
+			lo = (index - (n - 1) > 0) ? index - (n - 1) : 0;
+			hi = (index < n - 1) ? index : n - 1;
+		}
+		return ((1u << (hi + 1)) - 1) & ~((1u << lo) - 1);
+	}
+
+	// Empty cells of a line (cells outside the board are never empty).
+	uint32_t emptyMask(int dir, int index) const
+	{
+		return validMask(dir, index) & ~occupied(dir, index);
+	}
+
+	// Number of consecutive set bits of `mask` right after / right before `pos`.
+	static int runForward(uint32_t mask, int pos)
+	{
+		return __builtin_ctz(~(mask >> (pos + 1)));
+	}
+
+	static int runBackward(uint32_t mask, int pos)
+	{
+		return (pos == 0) ? 0 : __builtin_clz(~(mask << (32 - pos)));
+	}
+
+	// Bounds-checked bit test, bits outside [0, 32) are never set.
+	static bool bit(uint32_t mask, int pos)
+	{
+		return pos >= 0 && pos < 32 && ((mask >> pos) & 1u);
+	}
+
+	static int colorIndex(int player)
+	{
+		return player > 0 ? 1 : 0;
+	}
+
+	// Cells are also identified by a single index, row * MAX_SIZE + col.
+	static int cellIndex(int r, int c) { return r * MAX_SIZE + c; }
+	static int cellRow(int cell) { return cell / MAX_SIZE; }
+	static int cellCol(int cell) { return cell % MAX_SIZE; }
+
+private:
+	int n;
+	int stones;
+	// lines[direction][color][line index], color 0 = BLACK, 1 = WHITE
+	uint32_t lines[4][2][MAX_LINES];
+	int8_t cells[MAX_SIZE * MAX_SIZE];
+};
+
+#endif // BITBOARD_HPP
@@ -0,0 +1,117 @@
+#ifndef FRONTIER_HPP
+#define FRONTIER_HPP
+
+#pragma once
+
+#include <array>
+#include <cstdint>
+
+#include "bitboard.hpp"
+
+/**
+ * Candidate moves of the search: the empty cells that have at least one stone
+ * within `radius` cells (Chebyshev distance, so radius 1 = the 8 neighbors).
+ *
+ * For every cell we keep the number of stones around it, and the frontier is a
+ * dense array of cells with a reverse index, so placing or removing a stone
+ * updates it in O(radius^2) and it can be iterated without any allocation.
+ * The board must be updated before calling onPlace / onRemove.
+ */
+class Frontier
+{
+public:
+	static constexpr int MAX_CELLS = BitBoard::MAX_SIZE * BitBoard::MAX_SIZE;
+	static constexpr int MAX_RADIUS = 2;
+
+	explicit Frontier(int boardSize = BitBoard::MAX_SIZE, int radius = 1)
+		: n(boardSize), r(radius), count(0), neighbors{}, cells{}
+	{
+		index.fill(-1);
+	}
+
+	int radius() const { return r; }
+	int size() const { return count; }
+	const int16_t* begin() const { return cells.data(); }
+	const int16_t* end() const { return cells.data() + count; }
+	bool contains(int cell) const { return index[cell] >= 0; }
+
+	// Rebuild everything from the board, possibly with a new radius.
+	void reset(const BitBoard &board, int radius)
+	{
+		r = radius;
+		count = 0;
+		neighbors.fill(0);
+		index.fill(-1);
+		for (int row = 0; row < n; row++)
+			for (int col = 0; col < n; col++)
+				if (board.get(row, col) != EMPTY)
+					onPlace(board, row, col);
+	}
+
+	void onPlace(const BitBoard &board, int row, int col)
+	{
+		remove(BitBoard::cellIndex(row, col));
+		for (int dr = -r; dr <= r; dr++)
+		{
+			for (int dc = -r; dc <= r; dc++)
+			{
+				int nr = row + dr;
+				int nc = col + dc;
+				if ((dr == 0 && dc == 0) || nr < 0 || nr >= n || nc < 0 || nc >= n)
+					continue;
+				int cell = BitBoard::cellIndex(nr, nc);
+				if (neighbors[cell]++ == 0 && board.get(nr, nc) == EMPTY)
+					add(cell);
+			}
+		}
+	}
+
+	void onRemove(int row, int col)
+	{
+		for (int dr = -r; dr <= r; dr++)
+		{
+			for (int dc = -r; dc <= r; dc++)
+			{
+				int nr = row + dr;
+				int nc = col + dc;
+				if ((dr == 0 && dc == 0) || nr < 0 || nr >= n || nc < 0 || nc >= n)
+					continue;
+				int cell = BitBoard::cellIndex(nr, nc);
+				if (--neighbors[cell] == 0)
+					remove(cell);
+			}
+		}
+		int cell = BitBoard::cellIndex(row, col);
+		if (neighbors[cell] > 0)
+			add(cell);
+	}
+
+private:
+	int n;
+	int r;
+	int count;
+	std::array<uint8_t, MAX_CELLS> neighbors;  // stones within the radius of each cell
+	std::array<int16_t, MAX_CELLS> cells;      // the frontier cells, cells[0 .. count)
+	std::array<int16_t, MAX_CELLS> index;      // position of a cell in `cells`, -1 if absent
+
+	void add(int cell)
+	{
+		if (index[cell] >= 0)
+			return;
+		index[cell] = static_cast<int16_t>(count);
+		cells[count++] = static_cast<int16_t>(cell);
+	}
+
+	void remove(int cell)
+	{
+		int pos = index[cell];
+		if (pos < 0)
+			return;
+		int last = cells[--count];
+		cells[pos] = static_cast<int16_t>(last);
+		index[last] = static_cast<int16_t>(pos);
+		index[cell] = -1;
+	}
+};
+
+#endif // FRONTIER_HPP
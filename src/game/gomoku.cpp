@@ -1,9 +1,12 @@
 #include "gomoku.hpp"
+#include "line_patterns.hpp"
+#include "zobrist.hpp"
 
 #include <iostream>
 #include <algorithm>
 #include <cstring>
 #include <set>
+#include <stdexcept>
 
 // Definition of the global debug flag
 bool DEBUG = false;
@@ -15,29 +18,26 @@ void debugCall(const std::function<void()>& func)
     }
 }
 
+// Directions: horizontal, vertical, diagonals (same order as BitBoard::Direction)
+static const int DIRECTIONS[4][2] = { {0,1}, {1,0}, {1,1}, {1,-1} };
+
 Gomoku::Gomoku(int boardSize, const std::string& gameType)
-    : boardSize(boardSize), gameType(gameType) {
-    board.resize(boardSize, std::vector<int>(boardSize, EMPTY));
+    : boardSize(boardSize), gameType(gameType), board(boardSize), frontier(boardSize) {
+    if (boardSize < 5 || boardSize > BitBoard::MAX_SIZE)
+        throw std::invalid_argument("Board size must be between 5 and 19");
     currentPlayer = BLACK;
     whitePlayerPebblesTaken = 0;
     blackPlayerPebblesTaken = 0;
     gameOver = false;
+    score = 0.0;
+    hash = computeStateHash();
 }
 
 Gomoku Gomoku::clone() const
 {
-    Gomoku newCopy;
-    newCopy.boardSize = boardSize;
-    newCopy.gameType = gameType;
-    newCopy.board = board;
-    newCopy.currentPlayer = currentPlayer;
-    newCopy.whitePlayerPebblesTaken = whitePlayerPebblesTaken;
-    newCopy.blackPlayerPebblesTaken = blackPlayerPebblesTaken;
-	newCopy.backPlayeraligned4Stone = backPlayeraligned4Stone;
-	newCopy.whitePlayeraligned4Stone = whitePlayeraligned4Stone;
-    newCopy.forcedMoves = forcedMoves;  // copy
-    newCopy.gameOver = gameOver;
-	newCopy.score = score;
+    // Every member is a value (board, frontier, forced moves, undo history...),
+    // so the copy constructor makes a full independent copy.
+    Gomoku newCopy(*this);
     return newCopy;
 }
 
@@ -48,9 +48,12 @@ void Gomoku::addTiles(const std::vector<std::pair<int,int>> &tiles, const int pl
 		int r = tile.first;
 		int c = tile.second;
 		if (isWithinBounds(r, c)) {
-			board[r][c] = player;
+			removeStone(r, c);
+			if (player != EMPTY)
+				placeStone(r, c, player);
 		}
 	}
+	debugCall([&](){ verifyHash(); verifyPatternCounts(); });
 }
 
 void Gomoku::drawBoard() const
@@ -69,10 +72,10 @@ void Gomoku::drawBoard() const
         std::cout << i << ((i < 10) ? "  " : " ");
         for (int j = 0; j < boardSize; j++)
         {
-            if (board[i][j] == BLACK) {
+            if (board.get(i, j) == BLACK) {
                 std::cout << "B  ";
             }
-            else if (board[i][j] == WHITE) {
+            else if (board.get(i, j) == WHITE) {
                 std::cout << "W  ";
             }
             else {
@@ -88,77 +91,67 @@ std::vector<std::pair<int,int>> Gomoku::getAllPossibleMoves() const
     std::vector<std::pair<int,int>> possibleMoves;
     for (int r = 0; r < boardSize; r++)
     {
-        for (int c = 0; c < boardSize; c++)
+        uint32_t empties = board.emptyMask(BitBoard::ROW, r);
+        while (empties)
         {
-            if (board[r][c] == EMPTY) {
-                possibleMoves.push_back(std::make_pair(r, c));
-            }
+            int c = __builtin_ctz(empties);
+            empties &= empties - 1;
+            possibleMoves.push_back(std::make_pair(r, c));
         }
     }
     return possibleMoves;
 }
 
+/**
+ * Empty cells with at least one stone within the close-moves radius (the 8 neighbors
+ * by default), in row-major order. Read from the incrementally maintained frontier.
+ */
 std::vector<std::pair<int,int>> Gomoku::getAllCloseMoves() const
 {
-    std::vector<std::pair<int,int>> possibleMoves;
-    // Directions: horizontal, vertical, diagonals
-    std::vector<std::pair<int,int>> directions = {
-        {0,1}, {1,0}, {1,1}, {1,-1}
-    };
+    std::vector<int> cells(frontier.begin(), frontier.end());
+    std::sort(cells.begin(), cells.end());
 
-    for (int r = 0; r < boardSize; r++)
-    {
-        for (int c = 0; c < boardSize; c++)
-        {
-            if (board[r][c] == EMPTY)
-            {
-                bool hasNeighbor = false;
-                for (auto &dir : directions)
-                {
-                    int dr = dir.first;
-                    int dc = dir.second;
-
-                    // Forward neighbor
-                    int adjRF = r + dr;
-                    int adjCF = c + dc;
-                    if (isWithinBounds(adjRF, adjCF)) {
-                        if (board[adjRF][adjCF] != EMPTY) {
-                            hasNeighbor = true;
-                            break;
-                        }
-                    }
-
-                    // Backward neighbor
-                    int adjRB = r - dr;
-                    int adjCB = c - dc;
-                    if (isWithinBounds(adjRB, adjCB)) {
-                        if (board[adjRB][adjCB] != EMPTY) {
-                            hasNeighbor = true;
-                            break;
-                        }
-                    }
-                }
-                if (hasNeighbor) {
-                    possibleMoves.push_back(std::make_pair(r, c));
-                }
-            }
-        }
-    }
+    std::vector<std::pair<int,int>> possibleMoves;
+    possibleMoves.reserve(cells.size());
+    for (int cell : cells)
+        possibleMoves.push_back(std::make_pair(BitBoard::cellRow(cell), BitBoard::cellCol(cell)));
     return possibleMoves;
 }
 
+const Frontier& Gomoku::getFrontier() const
+{
+    return frontier;
+}
+
+void Gomoku::setCloseMovesRadius(int radius)
+{
+    if (radius < 1 || radius > Frontier::MAX_RADIUS)
+        throw std::invalid_argument("Close moves radius must be 1 or 2");
+    frontier.reset(board, radius);
+}
+
+int Gomoku::getCloseMovesRadius() const
+{
+    return frontier.radius();
+}
+
 std::tuple<bool, std::string, int> Gomoku::processMove(int placedRow, int placedCol)
 {
     // Early exit if the game is already over.
     if (gameOver)
         return std::make_tuple(false, "game_over", 0);
 
+    // placeStone() expects an empty cell: a stone put over another would break the hash.
+    if (!isWithinBounds(placedRow, placedCol) || board.get(placedRow, placedCol) != EMPTY)
+        return std::make_tuple(false, "occupied", 0);
+
     // Enforce forced moves: if forcedMoves is nonempty and the chosen move is not forced, reject it.
     if (processForcedMove(placedRow, placedCol))
         return std::make_tuple(false, "forced_move", 0);
 
     // Commit the move on the board.
-    board[placedRow][placedCol] = currentPlayer;
+    placeStone(placedRow, placedCol, currentPlayer);
+    lastCapturedCount = 0;
 
     int capturedCount = 0; // Declare capturedCount at the beginning of the function
 
@@ -258,9 +251,75 @@ std::tuple<bool, std::string, int> Gomoku::processMove(int placedRow, int placed
 
     // Change turn only if the game is not over.
     changePlayer();
+    debugCall([&](){ verifyHash(); verifyPatternCounts(); });
     return std::make_tuple(true, "valid_move", moveScore);
 }
 
+/**
+ * Play a move like processMove() and remember what it changed.
+ * Invalid moves leave the game untouched and are not recorded.
+ */
+std::tuple<bool, std::string, int> Gomoku::makeMove(int row, int col)
+{
+    UndoRecord record;
+    record.row = row;
+    record.col = col;
+    record.player = currentPlayer;
+    record.blackPlayerPebblesTaken = blackPlayerPebblesTaken;
+    record.whitePlayerPebblesTaken = whitePlayerPebblesTaken;
+    record.backPlayeraligned4Stone = backPlayeraligned4Stone;
+    record.whitePlayeraligned4Stone = whitePlayeraligned4Stone;
+    record.forcedMoves = forcedMoves;
+    record.gameOver = gameOver;
+    record.score = score;
+    record.hash = hash;
+
+    auto result = processMove(row, col);
+    if (!std::get<0>(result)) {
+        // processForcedMove() may have consumed the forced moves before the move was refused
+        forcedMoves = std::move(record.forcedMoves);
+        return result;
+    }
+
+    record.capturedCount = lastCapturedCount;
+    std::copy(lastCaptured.begin(), lastCaptured.begin() + lastCapturedCount, record.captured.begin());
+    history.push_back(std::move(record));
+    return result;
+}
+
+/**
+ * Revert the last move played with makeMove(). Returns false if there is none.
+ */
+bool Gomoku::unmakeMove()
+{
+    if (history.empty())
+        return false;
+
+    UndoRecord &record = history.back();
+    removeStone(record.row, record.col);
+    for (int i = 0; i < record.capturedCount; i++)
+        placeStone(record.captured[i].first, record.captured[i].second, -record.player);
+
+    currentPlayer = record.player;
+    blackPlayerPebblesTaken = record.blackPlayerPebblesTaken;
+    whitePlayerPebblesTaken = record.whitePlayerPebblesTaken;
+    backPlayeraligned4Stone = record.backPlayeraligned4Stone;
+    whitePlayeraligned4Stone = record.whitePlayeraligned4Stone;
+    forcedMoves = std::move(record.forcedMoves);
+    gameOver = record.gameOver;
+    score = record.score;
+    hash = record.hash;
+
+    history.pop_back();
+    debugCall([&](){ verifyHash(); verifyPatternCounts(); });
+    return true;
+}
+
+int Gomoku::getMoveCount() const
+{
+    return static_cast<int>(history.size());
+}
+
 // GETTERS
 int Gomoku::getBoardSize() const
 {
@@ -275,12 +334,17 @@ std::string Gomoku::getGameType() const
 int Gomoku::getBoardValue(int row, int col) const
 {
 	if (isWithinBounds(row, col)) {
-		return board[row][col];
+		return board.get(row, col);
 	} else {
 		throw std::out_of_range("Board position out of bounds");
 	}
 }
 
+const int8_t* Gomoku::getBoardData() const
+{
+	return board.data();
+}
+
 int Gomoku::getCurrentPlayer() const
 {
 	return currentPlayer;
@@ -301,7 +365,7 @@ bool Gomoku::getGameStatus() const
 	return gameOver;
 }
 
-std::vector<std::pair<int,int>> Gomoku::getForcedMoves() const
+const std::vector<std::pair<int,int>>& Gomoku::getForcedMoves() const
 {
 	return forcedMoves;
 }
@@ -309,48 +373,143 @@ std::vector<std::pair<int,int>> Gomoku::getForcedMoves() const
 //  SETTERS 
 void Gomoku::setCurrentPlayer(int player)
 {
+	hash ^= zobrist::sideToMove(currentPlayer) ^ zobrist::sideToMove(player);
 	currentPlayer = player;
 }
 
+void Gomoku::setBoardValues(const int8_t* values)
+{
+	for (int i = 0; i < boardSize * boardSize; i++) {
+		if (values[i] != EMPTY && values[i] != BLACK && values[i] != WHITE)
+			throw std::invalid_argument("Board values must be EMPTY (0), BLACK (-1) or WHITE (1)");
+	}
+
+	for (int r = 0; r < boardSize; r++) {
+		for (int c = 0; c < boardSize; c++) {
+			int value = values[r * boardSize + c];
+			if (board.get(r, c) == value)
+				continue;
+			removeStone(r, c);
+			if (value != EMPTY)
+				placeStone(r, c, value);
+		}
+	}
+	history.clear();
+	forcedMoves.clear();
+	gameOver = false;
+	debugCall([&](){ verifyHash(); verifyPatternCounts(); });
+}
+
 void Gomoku::setBlackPlayerPebblesTaken(int pebbles)
 {
+	hash ^= zobrist::captures(BLACK, blackPlayerPebblesTaken) ^ zobrist::captures(BLACK, pebbles);
 	blackPlayerPebblesTaken = pebbles;
 }
 
 void Gomoku::setWhitePlayerPebblesTaken(int pebbles)
 {
+	hash ^= zobrist::captures(WHITE, whitePlayerPebblesTaken) ^ zobrist::captures(WHITE, pebbles);
 	whitePlayerPebblesTaken = pebbles;
 }
 
 // PRIVATE METHODS
 
-std::string Gomoku::computeStateHash() const
+/**
+ * Full Zobrist hash of the position, computed from scratch.
+ * getHash() returns the same value, kept up to date move by move.
+ */
+uint64_t Gomoku::computeStateHash() const
 {
-	std::string hash;
-	hash.reserve(boardSize * boardSize + 2 * sizeof(int)); // Reserve space for efficiency
+	uint64_t fullHash = zobrist::gameType(gameType);
+	fullHash ^= zobrist::sideToMove(currentPlayer);
+	fullHash ^= zobrist::captures(BLACK, blackPlayerPebblesTaken);
+	fullHash ^= zobrist::captures(WHITE, whitePlayerPebblesTaken);
 
-	for (const auto& row : board)
+	for (int r = 0; r < boardSize; r++)
 	{
-		for (int cell : row)
+		for (int c = 0; c < boardSize; c++)
 		{
-			hash += std::to_string(cell);
+			int cell = board.get(r, c);
+			if (cell != EMPTY)
+				fullHash ^= zobrist::stone(cell, r, c);
 		}
 	}
+	return fullHash;
+}
 
-	hash += std::to_string(whitePlayerPebblesTaken);
-	hash += std::to_string(blackPlayerPebblesTaken);
-
+uint64_t Gomoku::getHash() const
+{
 	return hash;
 }
 
+/**
+ * Debug check: the incremental hash must match a full recompute.
+ */
+bool Gomoku::verifyHash() const
+{
+	uint64_t expected = computeStateHash();
+	if (expected != hash) {
+		std::cerr << "Zobrist hash mismatch: incremental " << hash
+				  << " != recomputed " << expected << std::endl;
+		return false;
+	}
+	return true;
+}
+
+bool Gomoku::verifyPatternCounts() const
+{
+	bool ok = true;
+	for (int player : {BLACK, WHITE}) {
+		if (countThreats(player) != patterns.threats(board, player)
+			|| count4Aligned(player) != patterns.openFours(board, player)) {
+			std::cerr << "Pattern counts mismatch for player " << player << ": threats "
+					  << patterns.threats(board, player) << " != " << countThreats(player) << ", open fours "
+					  << patterns.openFours(board, player) << " != " << count4Aligned(player) << std::endl;
+			ok = false;
+		}
+	}
+	return ok;
+}
+
 void Gomoku::changePlayer()
 {
+    hash ^= zobrist::sideToMove(currentPlayer) ^ zobrist::sideToMove(-currentPlayer);
     currentPlayer = -currentPlayer; // black = 1, white = -1
 }
 
 void Gomoku::undoMove(int row, int col)
 {
-    board[row][col] = EMPTY;
+    removeStone(row, col);
+}
+
+/**
+ * Put a stone on an empty cell, keeping the hash, the frontier, the pattern counts and the rule cache up to date.
+ */
+void Gomoku::placeStone(int row, int col, int player)
+{
+    // The hash and the frontier counters only add the new stone: over another one they would drift
+    if (board.get(row, col) != EMPTY)
+        throw std::logic_error("placeStone on the occupied cell (" + std::to_string(row) + ", " + std::to_string(col) + ")");
+    board.set(row, col, player);
+    hash ^= zobrist::stone(player, row, col);
+    frontier.onPlace(board, row, col);
+    patterns.onChange(board, row, col);
+    ruleCache.onChange(boardSize, row, col);
+}
+
+/**
+ * Remove the stone of (row, col) if any, keeping the hash, the frontier, the pattern counts and the rule cache up to date.
+ */
+void Gomoku::removeStone(int row, int col)
+{
+    int cell = board.get(row, col);
+    if (cell == EMPTY)
+        return;
+    board.clear(row, col);
+    hash ^= zobrist::stone(cell, row, col);
+    frontier.onRemove(row, col);
+    patterns.onChange(board, row, col);
+    ruleCache.onChange(boardSize, row, col);
 }
 
 bool Gomoku::isWithinBounds(int r, int c) const
@@ -366,11 +525,12 @@ std::vector<std::pair<int,int>> Gomoku::getAllPebblesOfPlayer(int player) const
     std::vector<std::pair<int,int>> pebbles;
     for (int r = 0; r < boardSize; r++)
     {
-        for (int c = 0; c < boardSize; c++)
+        uint32_t stones = board.line(BitBoard::ROW, player, r);
+        while (stones)
         {
-            if (board[r][c] == player) {
-                pebbles.push_back(std::make_pair(r, c));
-            }
+            int c = __builtin_ctz(stones);
+            stones &= stones - 1;
+            pebbles.push_back(std::make_pair(r, c));
         }
     }
     return pebbles;
@@ -411,102 +571,61 @@ bool Gomoku::processForcedMove(int placedRow, int placedCol)
 */
 int Gomoku::processCapture(int placedRow, int placedCol)
 {
-	// Fixed directions: horizontal, vertical, and the two diagonals.
-	static const std::vector<std::pair<int,int>> directions = {
-		{0,1}, {1,0}, {1,1}, {1,-1}
-	};
-
 	int totalCaptured = 0;
 	int opponentToken = -currentPlayer;
 
-	// Loop over each direction.
-	for (const auto &dir : directions)
+	// Loop over each direction, working on the line of the placed stone.
+	for (int dir = 0; dir < 4; dir++)
 	{
-		int dRow = dir.first;
-		int dCol = dir.second;
-		
+		int dRow = DIRECTIONS[dir][0];
+		int dCol = DIRECTIONS[dir][1];
+		int index = board.lineIndex(dir, placedRow, placedCol);
+		int pos = BitBoard::linePos(dir, placedRow, placedCol);
+		uint32_t own = board.line(dir, currentPlayer, index);
+		uint32_t opponent = board.line(dir, opponentToken, index);
+
 		// Check both forward (sign = 1) and backward (sign = -1) directions.
 		for (int sign : {1, -1})
 		{
-			// Compute positions for the two opponent stones and the cell after them.
-			int r1 = placedRow + sign * dRow;
-			int c1 = placedCol + sign * dCol;
-			int r2 = placedRow + sign * dRow * 2;
-			int c2 = placedCol + sign * dCol * 2;
-			int r3 = placedRow + sign * dRow * 3;
-			int c3 = placedCol + sign * dCol * 3;
-
-			// Check that positions are within bounds and match the capture pattern:
 			// Two opponent stones followed by a stone of the current player.
-			if (isWithinBounds(r2, c2) && isWithinBounds(r3, c3) &&
-				board[r1][c1] == opponentToken && board[r2][c2] == opponentToken &&
-				board[r3][c3] == currentPlayer)
+			if (BitBoard::bit(opponent, pos + sign) && BitBoard::bit(opponent, pos + 2 * sign) &&
+				BitBoard::bit(own, pos + 3 * sign))
 			{
 				// Remove the two captured opponent stones.
-				board[r1][c1] = EMPTY;
-				board[r2][c2] = EMPTY;
+				for (int step = 1; step <= 2; step++)
+				{
+					int r = placedRow + sign * dRow * step;
+					int c = placedCol + sign * dCol * step;
+					removeStone(r, c);
+					lastCaptured[lastCapturedCount++] = {static_cast<int8_t>(r), static_cast<int8_t>(c)};
+				}
 				totalCaptured += 2;
 				if (currentPlayer == BLACK)
-					blackPlayerPebblesTaken += 2;
+					setBlackPlayerPebblesTaken(blackPlayerPebblesTaken + 2);
 				else
-					whitePlayerPebblesTaken += 2;
+					setWhitePlayerPebblesTaken(whitePlayerPebblesTaken + 2);
 			}
 		}
 	}
 	return totalCaptured;
 }
- 
+
 
 /**
  * Check if the move at (row, col) creates a double-three configuration.
+ * An empty cell is checked as if the current player had played there.
  */
-bool Gomoku::isDoubleThree(int row, int col)
+bool Gomoku::isDoubleThree(int row, int col) const
 {
+    if (board.get(row, col) == -currentPlayer)
+        return false;
+
     int threats = 0;
-    // Directions: horizontal, vertical, diagonals
-    std::vector<std::pair<int,int>> directions = {
-        {0,1}, {1,0}, {1,1}, {1,-1}
-    };
 
-    for (auto &dir : directions)
+    for (int dir = 0; dir < 4; dir++)
     {
-        // Gather up to 4 stones in each direction from (row, col).
-        std::vector<int> colorSequence;
-        colorSequence.push_back(board[row][col]);
-
-        int dr = dir.first;
-        int dc = dir.second;
-
-        // forward direction
-        for (int i = 1; i <= 4; i++)
-        {
-            int r = row + i * dr;
-            int c = col + i * dc;
-            if (isWithinBounds(r, c)) {
-                colorSequence.push_back(board[r][c]);
-            } else {
-                break;
-            }
-        }
-
-        // backward direction: insert at the front
-        int iPos = 0;
-        for (int i = 1; i <= 4; i++)
-        {
-            int r = row - i * dr;
-            int c = col - i * dc;
-            if (isWithinBounds(r, c)) {
-                iPos++;
-                colorSequence.insert(colorSequence.begin(), board[r][c]);
-            } else {
-                break;
-            }
-        }
-
 		// If this direction creates a "three threat", increment threats
-		if (checkPattern(row, col, dr, dc, {0, currentPlayer, currentPlayer, currentPlayer, 0}) ||
-			checkPattern(row, col, dr, dc, {0, currentPlayer, currentPlayer, 0, currentPlayer, 0}) ||
-			checkPattern(row, col, dr, dc, {0, currentPlayer, 0, currentPlayer, currentPlayer, 0})) {
+		if (lineFlags(row, col, dir, currentPlayer) & linepatterns::OPEN_THREE) {
 			threats++;
 		}
 
@@ -518,43 +637,102 @@ bool Gomoku::isDoubleThree(int row, int col)
     return false;
 }
 
-// Modified to check only the current move's surroundings
-int Gomoku::getNumberOfThreatsMove(int player, int placedRow, int placedCol)
+bool Gomoku::isLegalMove(int row, int col) const
 {
-    int threats = 0;
+    if (gameOver || !isWithinBounds(row, col) || board.get(row, col) != EMPTY)
+        return false;
 
-    static const std::vector<std::vector<int>> patterns = {
-        {0, player, player, player, 0},
-        {0, player, player, 0, player, 0},
-        {0, player, 0, player, player, 0}
-    };
-
-    static const std::vector<std::vector<int>> reversedPatterns = []() {
-        std::vector<std::vector<int>> revPatterns;
-        for (const auto &pattern : patterns) {
-            std::vector<int> revPattern(pattern.rbegin(), pattern.rend());
-            revPatterns.push_back(revPattern);
-        }
-        return revPatterns;
-    }();
+    if (!forcedMoves.empty()
+        && std::find(forcedMoves.begin(), forcedMoves.end(), std::make_pair(row, col)) == forcedMoves.end())
+        return false;
 
-    static const std::vector<std::pair<int, int>> directions = {
-        {0, 1}, {1, 0}, {1, 1}, {1, -1}
-    };
+    if (!ruleCache.isKnown(currentPlayer, row, col))
+        ruleCache.store(currentPlayer, row, col, moveRuleViolation(row, col, currentPlayer) == nullptr);
+    return ruleCache.isAllowed(currentPlayer, row, col);
+}
 
-    for (const auto &[dr, dc] : directions)
+void Gomoku::getLegalMoveMask(uint8_t* out) const
+{
+    for (int row = 0; row < boardSize; row++)
+        for (int col = 0; col < boardSize; col++)
+            out[row * boardSize + col] = isLegalMove(row, col) ? 1 : 0;
+}
+
+std::string Gomoku::getIllegalMoveReason(int row, int col) const
+{
+    if (gameOver)
+        return "game_over";
+    if (!isWithinBounds(row, col) || board.get(row, col) != EMPTY)
+        return "occupied";
+    if (!forcedMoves.empty()
+        && std::find(forcedMoves.begin(), forcedMoves.end(), std::make_pair(row, col)) == forcedMoves.end())
+        return "forced_move";
+
+    const char* violation = moveRuleViolation(row, col, currentPlayer);
+    return violation ? violation : "";
+}
+
+/**
+ * Check if `player` playing on the empty cell (row, col) would capture a pair.
+ */
+bool Gomoku::canCapture(int row, int col, int player) const
+{
+    for (int dir = 0; dir < 4; dir++)
     {
-        for (size_t i = 0; i < patterns.size(); i++)
+        for (int sign : {1, -1})
         {
-            // Check both the pattern and its reverse from the placed stone position.
-            if (checkPattern(placedRow, placedCol, dr, dc, patterns[i]) ||
-                checkPattern(placedRow, placedCol, dr, dc, reversedPatterns[i]))
-            {
-                threats++;
-                break; // Count only one threat per direction
-            }
+            int dr = sign * DIRECTIONS[dir][0];
+            int dc = sign * DIRECTIONS[dir][1];
+            if (isWithinBounds(row + 3 * dr, col + 3 * dc)
+                && board.get(row + dr, col + dc) == -player
+                && board.get(row + 2 * dr, col + 2 * dc) == -player
+                && board.get(row + 3 * dr, col + 3 * dc) == player)
+                return true;
         }
     }
+    return false;
+}
+
+/**
+ * Rule of the game type that forbids `player` to play on the empty cell (row, col),
+ * as the processMove reason, or nullptr if the move is allowed:
+ * "double_three" (unless the move captures) in "normal" and "duo",
+ * "double_three" and "line_over_5" in "special".
+ */
+const char* Gomoku::moveRuleViolation(int row, int col, int player) const
+{
+    bool withCaptures = (gameType == "duo" || gameType == "normal");
+    if (!withCaptures && gameType != "special")
+        return nullptr;
+    if (withCaptures && canCapture(row, col, player))
+        return nullptr;
+
+    int threes = 0;
+    bool overline = false;
+    for (int dir = 0; dir < 4; dir++)
+    {
+        uint8_t flags = lineFlags(row, col, dir, player);
+        threes += (flags & linepatterns::OPEN_THREE) != 0;
+        overline |= (flags & linepatterns::OVERLINE) != 0;
+    }
+    if (threes >= 2)
+        return "double_three";
+    if (!withCaptures && overline)
+        return "line_over_5";
+    return nullptr;
+}
+
+// Modified to check only the current move's surroundings
+int Gomoku::getNumberOfThreatsMove(int player, int placedRow, int placedCol) const
+{
+    int threats = 0;
+
+    for (int dir = 0; dir < 4; dir++)
+    {
+        // Count only one threat per direction
+        if (lineFlags(placedRow, placedCol, dir, player) & linepatterns::OPEN_THREE)
+            threats++;
+    }
     return threats;
 }
 
@@ -563,185 +741,99 @@ std::pair<int, int> Gomoku::getNumberOf4AlignedMove(int player, int placedRow, i
 {
 	int countOpen = 0;
 	int countBlocked = 0;
-	std::vector<std::pair<int,int>> directions = {
-		{0,1}, {1,0}, {1,1}, {1,-1}
-	};
 
-	for (auto &dir : directions)
+	for (int dir = 0; dir < 4; dir++)
 	{
-		int dr = dir.first;
-		int dc = dir.second;
-		int countPlayer = 1; // include the current stone
-
-		// Check forward direction
-		int rr = placedRow + dr;
-		int cc = placedCol + dc;
-		while (isWithinBounds(rr, cc) && board[rr][cc] == player)
-		{
-			countPlayer++;
-			rr += dr;
-			cc += dc;
-		}
-
-		// Check if the forward end is open or blocked
-		bool forwardOpen = isWithinBounds(rr, cc) && board[rr][cc] == EMPTY;
-
-		// Check backward direction
-		rr = placedRow - dr;
-		cc = placedCol - dc;
-		while (isWithinBounds(rr, cc) && board[rr][cc] == player)
-		{
-			countPlayer++;
-			rr -= dr;
-			cc -= dc;
-		}
-
-		// Check if the backward end is open or blocked
-		bool backwardOpen = isWithinBounds(rr, cc) && board[rr][cc] == EMPTY;
-
-		// Count only exactly 4 aligned stones
-		if (countPlayer == 4)
-		{
-			if (forwardOpen && backwardOpen)
-				countOpen++;
-			else if (forwardOpen || backwardOpen)
-				countBlocked++;
-		}
+		// Exactly 4 aligned stones, the current one included, with one or both ends open
+		uint8_t flags = lineFlags(placedRow, placedCol, dir, player);
+		if (flags & linepatterns::OPEN_FOUR)
+			countOpen++;
+		else if (flags & linepatterns::BLOCKED_FOUR)
+			countBlocked++;
 	}
 	return {countOpen, countBlocked};
 }
 
-int Gomoku::getNumberOfThreats(int player)
+int Gomoku::getNumberOfThreats(int player) const
 {
-    std::vector<std::pair<int, int>> pebbles = getAllPebblesOfPlayer(player);
-    int threats = 0;
+    return patterns.threats(board, player);
+}
 
-    static const std::vector<std::vector<int>> patterns = {
-        {0, player, player, player, 0},
-        {0, player, player, 0, player, 0},
-        {0, player, 0, player, player, 0}
-    };
-
-    static const std::vector<std::vector<int>> reversedPatterns = []() {
-        std::vector<std::vector<int>> revPatterns;
-        for (const auto &pattern : patterns) {
-            std::vector<int> revPattern(pattern.rbegin(), pattern.rend());
-            revPatterns.push_back(revPattern);
-        }
-        return revPatterns;
-    }();
+int Gomoku::getNumberOf4Aligned(int player) const
+{
+    return patterns.openFours(board, player);
+}
 
-    static const std::vector<std::pair<int, int>> directions = {
-        {0, 1}, {1, 0}, {1, 1}, {1, -1}
-    };
+/**
+ * Full recount of the open threes of `player`, one per stone and direction.
+ */
+int Gomoku::countThreats(int player) const
+{
+    int threats = 0;
 
-    for (auto &[row, col] : pebbles)
+    for (int row = 0; row < boardSize; row++)
     {
-        for (auto &[dr, dc] : directions)
+        uint32_t stones = board.line(BitBoard::ROW, player, row);
+        while (stones)
         {
-            for (const auto &pattern : patterns)
+            int col = __builtin_ctz(stones);
+            stones &= stones - 1;
+            for (int dir = 0; dir < 4; dir++)
             {
-                if (checkPattern(row, col, dr, dc, pattern) || checkPattern(row, col, dr, dc, reversedPatterns[&pattern - &patterns[0]]))
-                {
+                if (lineFlags(row, col, dir, player) & linepatterns::OPEN_THREE)
                     threats++;
-                    break; // Stop checking once a threat is found in this direction
-                }
             }
         }
     }
     return threats;
 }
 
-int Gomoku::getNumberOf4Aligned(int player) const
+/**
+ * Full recount of the open fours of `player`, one per stone and direction.
+ */
+int Gomoku::count4Aligned(int player) const
 {
 	int count = 0;
-	// Directions: horizontal, vertical, diagonals
-	std::vector<std::pair<int,int>> directions = {
-		{0,1}, {1,0}, {1,1}, {1,-1}
-	};
-
-	std::vector<std::pair<int, int>> pebbles = getAllPebblesOfPlayer(player);
 
-	for (auto &[r, c] : pebbles)
+	for (int row = 0; row < boardSize; row++)
 	{
-		for (auto &dir : directions)
+		uint32_t stones = board.line(BitBoard::ROW, player, row);
+		while (stones)
 		{
-			int dr = dir.first;
-			int dc = dir.second;
-
-			// Forward direction
-			int rr = r + dr;
-			int cc = c + dc;
-			int countPlayer = 1; // include the current pebble
-
-			bool is_blocked_backward = false;
-			bool is_blocked_forward = false;
-
-			while (isWithinBounds(rr, cc) && board[rr][cc] == player)
-			{
-				countPlayer++;
-				rr += dr;
-				cc += dc;
-			}
-
-			// We are looking only for 4 pebble alignments without any opponent pebble at each end
-			if (!isWithinBounds(rr, cc) || board[rr][cc] != EMPTY)
-				continue; // Move to the next direction
-
-			// Backward direction
-			rr = r - dr;
-			cc = c - dc;
-			while (isWithinBounds(rr, cc) && board[rr][cc] == player)
-			{
-				countPlayer++;
-				rr -= dr;
-				cc -= dc;
-			}
-
-			// We are looking only for 4 pebble alignments without any opponent pebble at each end
-			if (!isWithinBounds(rr, cc) || board[rr][cc] != EMPTY)
-				continue; // Move to the next direction
-
-			// Check if exactly 4 aligned and no opponent pebble at each end
-			if (countPlayer == 4)
+			int col = __builtin_ctz(stones);
+			stones &= stones - 1;
+			// We are looking only for exactly 4 pebble alignments with both ends empty
+			for (int dir = 0; dir < 4; dir++)
 			{
-				count++;
+				if (lineFlags(row, col, dir, player) & linepatterns::OPEN_FOUR)
+					count++;
 			}
 		}
 	}
 	return count;
 }
 
-bool Gomoku::checkPattern(int startRow, int startCol, int dr, int dc, const std::vector<int> &pattern)
+/**
+ * Line pattern flags (see line_patterns.hpp) of a stone of `player` at (row, col)
+ * in direction `dir`. The cell itself is always counted as a stone of `player`.
+ */
+uint8_t Gomoku::lineFlags(int row, int col, int dir, int player) const
 {
-    int patternLength = pattern.size();
-    std::vector<std::pair<int, int>> offsets;
-
-    for (int i = 0; i < patternLength; i++)
-    {
-        offsets.emplace_back(i * dr, i * dc);
-    }
-
-    for (int shift = -patternLength + 1; shift <= 0; shift++)
-    {
-        bool match = true;
-        for (size_t idx = 0; idx < pattern.size(); idx++)
-        {
-            int row = startRow + offsets[idx].first + shift * dr;
-            int col = startCol + offsets[idx].second + shift * dc;
+	int index = board.lineIndex(dir, row, col);
+	int pos = BitBoard::linePos(dir, row, col);
+	return linepatterns::flags(board.line(dir, player, index), board.emptyMask(dir, index), pos);
+}
 
-            if (!isWithinBounds(row, col) || board[row][col] != pattern[idx])
-            {
-                match = false;
-                break;
-            }
-        }
-        if (match)
-        {
-            return true;
-        }
-    }
-    return false;
+void Gomoku::getLineShapes(int row, int col, int player, uint8_t own[4], uint8_t opponent[4]) const
+{
+	for (int dir = 0; dir < 4; dir++)
+	{
+		int index = board.lineIndex(dir, row, col);
+		int pos = BitBoard::linePos(dir, row, col);
+		uint32_t empty = board.emptyMask(dir, index);
+		own[dir] = linepatterns::flags(board.line(dir, player, index), empty, pos);
+		opponent[dir] = linepatterns::flags(board.line(dir, -player, index), empty, pos);
+	}
 }
 
 
@@ -775,38 +867,9 @@ bool Gomoku::process10Pebbles()
  */
 bool Gomoku::has5PebblesAligned(int placedRow, int placedCol) const
 {
-    // Directions: horizontal, vertical, diagonals
-    std::vector<std::pair<int,int>> directions = {
-        {0,1}, {1,0}, {1,1}, {1,-1}
-    };
-
-    for (auto &dir : directions)
+    for (int dir = 0; dir < 4; dir++)
     {
-        int count = 1; // count newly placed stone
-        int dr = dir.first;
-        int dc = dir.second;
-
-        // forward direction
-        int rr = placedRow + dr;
-        int cc = placedCol + dc;
-        while (isWithinBounds(rr, cc) && board[rr][cc] == currentPlayer)
-        {
-            count++;
-            rr += dr;
-            cc += dc;
-        }
-
-        // backward direction
-        rr = placedRow - dr;
-        cc = placedCol - dc;
-        while (isWithinBounds(rr, cc) && board[rr][cc] == currentPlayer)
-        {
-            count++;
-            rr -= dr;
-            cc -= dc;
-        }
-
-        if (count >= 5) {
+        if (lineFlags(placedRow, placedCol, dir, currentPlayer) & (linepatterns::FIVE | linepatterns::OVERLINE)) {
             return true;
         }
     }
@@ -816,7 +879,7 @@ bool Gomoku::has5PebblesAligned(int placedRow, int placedCol) const
 /**
  * returns possible capture points for the player, used for debugging
 */
-std::vector<std::pair<int, int>> Gomoku::getCapturePoints(int player)
+std::vector<std::pair<int, int>> Gomoku::getCapturePoints(int player) const
 {
 	std::vector<std::pair<int, int>> captureMoves;
 	int opponent = -player;
@@ -829,7 +892,7 @@ std::vector<std::pair<int, int>> Gomoku::getCapturePoints(int player)
 	{
 		for (int col = 0; col < boardSize; ++col)
 		{
-			if (board[row][col] != EMPTY) continue;
+			if (board.get(row, col) != EMPTY) continue;
 			for (const auto& dir : directions)
 			{
 				int dRow = dir.first;
@@ -845,9 +908,9 @@ std::vector<std::pair<int, int>> Gomoku::getCapturePoints(int player)
 					int c3 = col + sign * dCol * 3;
 
 					if (isWithinBounds(r3, c3) &&
-						board[r1][c1] == opponent &&
-						board[r2][c2] == opponent &&
-						board[r3][c3] == player)
+						board.get(r1, c1) == opponent &&
+						board.get(r2, c2) == opponent &&
+						board.get(r3, c3) == player)
 					{
 						captureMoves.emplace_back(row, col);
 					}
@@ -884,7 +947,7 @@ bool Gomoku::is5PebblesAlignedBreakable(int placedRow, int placedCol)
         alignedStones.insert({placedRow, placedCol});    
         // Forward
         int r = placedRow + dr, c = placedCol + dc;
-        while (isWithinBounds(r, c) && board[r][c] == originalPlayer) {
+        while (isWithinBounds(r, c) && board.get(r, c) == originalPlayer) {
             alignedStones.insert({r, c});
             r += dr;
             c += dc;
@@ -893,7 +956,7 @@ bool Gomoku::is5PebblesAlignedBreakable(int placedRow, int placedCol)
         // Backward
         r = placedRow - dr;
         c = placedCol - dc;
-        while (isWithinBounds(r, c) && board[r][c] == originalPlayer) {
+        while (isWithinBounds(r, c) && board.get(r, c) == originalPlayer) {
             alignedStones.insert({r, c});
             r -= dr;
             c -= dc;
@@ -916,15 +979,15 @@ bool Gomoku::is5PebblesAlignedBreakable(int placedRow, int placedCol)
 
             if (!isWithinBounds(r2, c2)) continue;
 
-            if (board[r][c] == originalPlayer && board[r2][c2] == originalPlayer) {
+            if (board.get(r, c) == originalPlayer && board.get(r2, c2) == originalPlayer) {
                 int r0 = r - dr;
                 int c0 = c - dc;
-                if (isWithinBounds(r0, c0) && board[r0][c0] == EMPTY) {
+                if (isWithinBounds(r0, c0) && board.get(r0, c0) == EMPTY) {
                     candidateMoves.insert({r0, c0});
                 }
                 int r3 = r2 + dr;
                 int c3 = c2 + dc;
-                if (isWithinBounds(r3, c3) && board[r3][c3] == EMPTY) {
+                if (isWithinBounds(r3, c3) && board.get(r3, c3) == EMPTY) {
                     candidateMoves.insert({r3, c3});
                 }
             }
@@ -947,8 +1010,8 @@ bool Gomoku::is5PebblesAlignedBreakable(int placedRow, int placedCol)
 		int c = move.second;
 		
 		// Save original state for reversion.
-		int originalCell = board[r][c];  // Should be EMPTY.
-		board[r][c] = opponent;  // Simulate opponent move.
+		int originalCell = board.get(r, c);  // Should be EMPTY.
+		board.set(r, c, opponent);  // Simulate opponent move.
 
 		// Capture simulation: record any stones removed.
 		std::vector<std::pair<int,int>> capturedPositions;
@@ -962,7 +1025,7 @@ bool Gomoku::is5PebblesAlignedBreakable(int placedRow, int placedCol)
 					for (int offset = 1; offset <= 2; offset++) {
 						int checkR = r + sign * dRow * offset;
 						int checkC = c + sign * dCol * offset;
-						if (isWithinBounds(checkR, checkC) && board[checkR][checkC] == originalPlayer)
+						if (isWithinBounds(checkR, checkC) && board.get(checkR, checkC) == originalPlayer)
 							tempCaptured.push_back(std::make_pair(checkR, checkC));
 						else
 							break;
@@ -970,9 +1033,9 @@ bool Gomoku::is5PebblesAlignedBreakable(int placedRow, int placedCol)
 					if (tempCaptured.size() == 2) {
 						int nextR = r + sign * dRow * 3;
 						int nextC = c + sign * dCol * 3;
-						if (isWithinBounds(nextR, nextC) && board[nextR][nextC] == opponent) {
+						if (isWithinBounds(nextR, nextC) && board.get(nextR, nextC) == opponent) {
 							for (auto &pos : tempCaptured) {
-								board[pos.first][pos.second] = EMPTY;
+								board.clear(pos.first, pos.second);
 								capturedPositions.push_back(pos);
 							}
 						}
@@ -985,9 +1048,9 @@ bool Gomoku::is5PebblesAlignedBreakable(int placedRow, int placedCol)
 		bool alignmentBroken = !has5PebblesAligned(placedRow, placedCol);
 		
 		// Revert the simulation.
-		board[r][c] = originalCell;
+		board.set(r, c, originalCell);
 		for (auto &pos : capturedPositions) {
-			board[pos.first][pos.second] = originalPlayer;
+			board.set(pos.first, pos.second, originalPlayer);
 		}
 		
 		// If the move breaks the alignment, add it to forcedMoves.
@@ -1036,9 +1099,7 @@ bool Gomoku::process5Pebbles(int placedRow, int placedCol)
 
 bool Gomoku::isBoardEmpty() const
 {
-    return !std::any_of(board.begin(), board.end(), [](const std::vector<int>& row) {
-        return std::any_of(row.begin(), row.end(), [](int cell) { return cell != EMPTY; });
-    });
+    return board.empty();
 }
 
 /**
@@ -1046,35 +1107,9 @@ bool Gomoku::isBoardEmpty() const
  */
 bool Gomoku::hasMoreThan5PebblesAligned(int placedRow, int placedCol) const
 {
-    std::vector<std::pair<int,int>> directions = {
-        {0,1}, {1,0}, {1,1}, {1,-1}
-    };
-
-    for (auto &dir : directions)
+    for (int dir = 0; dir < 4; dir++)
     {
-        int count = 1;
-        int dr = dir.first;
-        int dc = dir.second;
-
-        int rr = placedRow + dr;
-        int cc = placedCol + dc;
-        while (isWithinBounds(rr, cc) && board[rr][cc] == currentPlayer)
-        {
-            count++;
-            rr += dr;
-            cc += dc;
-        }
-
-        rr = placedRow - dr;
-        cc = placedCol - dc;
-        while (isWithinBounds(rr, cc) && board[rr][cc] == currentPlayer)
-        {
-            count++;
-            rr -= dr;
-            cc -= dc;
-        }
-
-        if (count > 5) { 
+        if (lineFlags(placedRow, placedCol, dir, currentPlayer) & linepatterns::OVERLINE) {
             return true;
         }
     }
@@ -3,22 +3,50 @@
 
 #pragma once
 
+#include <array>
+#include <cstdint>
 #include <vector>
 #include <utility>
 #include <string>
+#include <tuple>
 #include <functional>
 #include <iostream>
 
+#include "bitboard.hpp"
+#include "frontier.hpp"
+#include "pattern_counts.hpp"
+#include "rule_cache.hpp"
+
 // Global debug flag declaration (defined in gomoku.cpp)
 extern bool DEBUG;
 
 // Helper function to call a lambda only if DEBUG is true
 void debugCall(const std::function<void()>& func);
 
-// Player token definitions
-constexpr int EMPTY = 0;
-constexpr int BLACK = -1;
-constexpr int WHITE = 1;
+/**
+ * Everything makeMove() changes besides the placed stone, so that unmakeMove()
+ * can restore the previous position without copying the board.
+ * A move captures at most 2 stones in each of the 8 directions.
+ */
+struct UndoRecord
+{
+	static constexpr int MAX_CAPTURED = 16;
+
+	int row;
+	int col;
+	int player;
+	int capturedCount;
+	std::array<std::pair<int8_t,int8_t>, MAX_CAPTURED> captured;
+	int blackPlayerPebblesTaken;
+	int whitePlayerPebblesTaken;
+	int backPlayeraligned4Stone;
+	int whitePlayeraligned4Stone;
+	std::vector<std::pair<int,int>> forcedMoves;
+	bool gameOver;
+	double score;
+	uint64_t hash;
+};
+
 /**
  * Gomoku class declaration.
  */
@@ -35,27 +63,57 @@ public:
     std::vector<std::pair<int,int>> getAllPossibleMoves() const;
     std::vector<std::pair<int,int>> getAllCloseMoves() const;
 
+    // Empty cells near stones (cell = row * BitBoard::MAX_SIZE + col), kept up to date
+    // move by move. Iterating it does not allocate, but it changes with every move.
+    const Frontier& getFrontier() const;
+    void setCloseMovesRadius(int radius);
+    int getCloseMovesRadius() const;
+
 
     std::tuple<bool, std::string, int> processMove(int placedRow, int placedCol);
+
+    // Same as processMove, but a valid move can then be reverted with unmakeMove().
+    std::tuple<bool, std::string, int> makeMove(int row, int col);
+    bool unmakeMove();
+    int getMoveCount() const;
     bool process5Pebbles(int placedRow, int placedCol);
     
 	int getBoardSize() const;
     
-	bool isDoubleThree(int row, int col);
-	int getNumberOfThreats(int player);
-	int getNumberOfThreatsMove(int player, int placedRow, int placedCol);
+	bool isDoubleThree(int row, int col) const;
+
+	// Whether the side to move can play (row, col) without processMove rejecting it:
+	// empty cell, forced moves, double-three and overline rules. The rule checks are
+	// cached per cell and only recomputed near the stones that changed.
+	bool isLegalMove(int row, int col) const;
+	// isLegalMove() of every cell (1 = legal), row-major, boardSize * boardSize values.
+	void getLegalMoveMask(uint8_t* out) const;
+	// Reason processMove would give for rejecting (row, col), or "" if the move is legal.
+	std::string getIllegalMoveReason(int row, int col) const;
+	// Shapes (linepatterns::Flag) of the 4 lines (BitBoard::Direction) through the empty
+	// cell (row, col), as if `player` played there (`own`) or as if the opponent did.
+	void getLineShapes(int row, int col, int player, uint8_t own[4], uint8_t opponent[4]) const;
+	// Whether `player` playing on (row, col) would enclose a pair of opponent stones
+	// (whether the game type captures them is not checked).
+	bool canCapture(int row, int col, int player) const;
+	// Running totals, kept up to date move by move (see PatternCounts)
+	int getNumberOfThreats(int player) const;
+	int getNumberOfThreatsMove(int player, int placedRow, int placedCol) const;
 	int getNumberOf4Aligned(int player) const;
 	std::pair<int, int> getNumberOf4AlignedMove(int player, int placedRow, int placedCol) const;
     bool isBoardEmpty() const;
 
 	// GETTERS
 	int getBoardValue(int row, int col) const;
+	// Cells of the board (EMPTY, BLACK or WHITE), row-major with a row stride of BitBoard::MAX_SIZE.
+	// The pointer stays valid, and up to date, for the lifetime of the game.
+	const int8_t* getBoardData() const;
 	int getCurrentPlayer() const;
 	int getWhitePlayerPebblesTaken() const;
 	int getBlackPlayerPebblesTaken() const;
 	bool getGameStatus() const;
     std::string getGameType() const;
-	std::vector<std::pair<int,int>> getForcedMoves() const;
+	const std::vector<std::pair<int,int>>& getForcedMoves() const;
 	double getScore() const { return score; }
 
 	// SETTERS
@@ -63,13 +121,25 @@ public:
 	void setBlackPlayerPebblesTaken(int pebbles);
 	void setWhitePlayerPebblesTaken(int pebbles);
 	void setScore(double score) { this->score = score; }
+	// Replace all the stones with `values` (row-major, boardSize * boardSize cells).
+	// The move history, the forced moves and the game over flag are cleared.
+	void setBoardValues(const int8_t* values);
 
-	std::string computeStateHash() const;
+	// Zobrist hash of the position (stones, side to move, captures, game type)
+	uint64_t getHash() const;
+	uint64_t computeStateHash() const;
+	bool verifyHash() const;
+	// Debug check: the running pattern totals must match a full recount.
+	bool verifyPatternCounts() const;
 
 private:
     int boardSize;
     std::string gameType;
-    std::vector<std::vector<int>> board;
+    BitBoard board;
+    Frontier frontier;
+    // Updated lazily when the totals are read, hence mutable
+    mutable PatternCounts patterns;
+    mutable RuleCache ruleCache;
     int currentPlayer;
     int whitePlayerPebblesTaken;
     int blackPlayerPebblesTaken;
@@ -79,14 +149,26 @@ private:
     bool gameOver;
 
 	double score;
+	uint64_t hash;
+
+	// Undo records of the moves played with makeMove()
+	std::vector<UndoRecord> history;
+	// Stones removed by the last processCapture() call
+	std::array<std::pair<int8_t,int8_t>, UndoRecord::MAX_CAPTURED> lastCaptured;
+	int lastCapturedCount = 0;
 
     void changePlayer();
     void undoMove(int row, int col);
+    void placeStone(int row, int col, int player);
+    void removeStone(int row, int col);
     bool isWithinBounds(int r, int c) const;
 
-	bool checkPattern(int startRow, int startCol, int dr, int dc, const std::vector<int> &pattern);
+	uint8_t lineFlags(int row, int col, int dir, int player) const;
+	const char* moveRuleViolation(int row, int col, int player) const;
 
     std::vector<std::pair<int,int>> getAllPebblesOfPlayer(int player) const;
+    int countThreats(int player) const;
+    int count4Aligned(int player) const;
 
     bool processForcedMove(int placedRow, int placedCol);
     int processCapture(int placedRow, int placedCol);
@@ -96,7 +178,7 @@ private:
     bool has5PebblesAligned(int placedRow, int placedCol) const;
     bool hasMoreThan5PebblesAligned(int placedRow, int placedCol) const;
     bool is5PebblesAlignedBreakable(int placedRow, int placedCol);
-    std::vector<std::pair<int, int>> getCapturePoints(int player); // debug
+    std::vector<std::pair<int, int>> getCapturePoints(int player) const; // debug
 };
 
 #endif // GOMOKU_HPP
\ No newline at end of file
@@ -0,0 +1,94 @@
+#include "line_patterns.hpp"
+
+namespace linepatterns
+{
+	namespace
+	{
+		enum Cell { BLOCKED = 0, OWN = 1, EMPTY_CELL = 2 };
+
+		constexpr int WIDTH = 2 * RADIUS + 1;
+
+		// Open three shapes, as strings of cells (the reversed shapes are the same set).
+		struct Shape { int length; Cell cells[6]; };
+		constexpr Shape OPEN_THREES[] = {
+			{5, {EMPTY_CELL, OWN, OWN, OWN, EMPTY_CELL}},
+			{6, {EMPTY_CELL, OWN, OWN, EMPTY_CELL, OWN, EMPTY_CELL}},
+			{6, {EMPTY_CELL, OWN, EMPTY_CELL, OWN, OWN, EMPTY_CELL}},
+		};
+
+		uint8_t windowFlags(const Cell (&cells)[WIDTH])
+		{
+			uint8_t result = 0;
+
+			int hi = RADIUS + 1;
+			while (hi < WIDTH && cells[hi] == OWN)
+				hi++;
+			int lo = RADIUS - 1;
+			while (lo >= 0 && cells[lo] == OWN)
+				lo--;
+			int run = hi - lo - 1;
+
+			if (run == 4) {
+				// The run of 4 spans at most RADIUS - 1 cells on each side, so both ends are in the window.
+				int openEnds = (cells[lo] == EMPTY_CELL) + (cells[hi] == EMPTY_CELL);
+				if (openEnds == 2)
+					result |= OPEN_FOUR;
+				else if (openEnds == 1)
+					result |= BLOCKED_FOUR;
+			} else if (run == 5) {
+				result |= FIVE;
+			} else if (run > 5) {
+				result |= OVERLINE;
+			}
+
+			// Open threes in any window that contains the center stone.
+			for (const Shape &shape : OPEN_THREES) {
+				for (int start = RADIUS - shape.length + 1; start <= RADIUS; start++) {
+					if (start < 0 || start + shape.length > WIDTH)
+						continue;
+					bool match = true;
+					for (int i = 0; i < shape.length && match; i++)
+						match = cells[start + i] == shape.cells[i];
+					if (match)
+						result |= OPEN_THREE;
+				}
+			}
+			return result;
+		}
+
+		std::array<uint8_t, TABLE_SIZE> buildTable()
+		{
+			std::array<uint8_t, TABLE_SIZE> table{};
+			for (int index = 0; index < TABLE_SIZE; index++) {
+				Cell cells[WIDTH] = {};
+				int digits = index;
+				for (int i = 0; i < 2 * RADIUS; i++) {
+					// Neighbours 0..RADIUS-1 are before the center, the others after it.
+					int cell = (i < RADIUS) ? i : i + 1;
+					cells[cell] = static_cast<Cell>(digits % 3);
+					digits /= 3;
+				}
+				cells[RADIUS] = OWN;
+				table[index] = windowFlags(cells);
+			}
+			return table;
+		}
+
+		std::array<uint16_t, 1 << (2 * RADIUS)> buildTernary()
+		{
+			std::array<uint16_t, 1 << (2 * RADIUS)> ternary{};
+			for (int mask = 0; mask < (1 << (2 * RADIUS)); mask++) {
+				int value = 0;
+				int power = 1;
+				for (int i = 0; i < 2 * RADIUS; i++, power *= 3)
+					if (mask & (1 << i))
+						value += power;
+				ternary[mask] = static_cast<uint16_t>(value);
+			}
+			return ternary;
+		}
+	}
+
+	const std::array<uint8_t, TABLE_SIZE> TABLE = buildTable();
+	const std::array<uint16_t, 1 << (2 * RADIUS)> TERNARY = buildTernary();
+}
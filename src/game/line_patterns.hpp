@@ -0,0 +1,57 @@
+#ifndef LINE_PATTERNS_HPP
+#define LINE_PATTERNS_HPP
+
+#pragma once
+
+#include <array>
+#include <cstdint>
+
+/**
+ * Precomputed shapes of a stone along one line.
+ *
+ * The window around a stone is the stone itself plus its 5 neighbours on each
+ * side along the line. Each neighbour is a base-3 digit (0 = blocked by the
+ * opponent or the edge of the board, 1 = own stone, 2 = empty), which gives an
+ * index in [0, 3^10) into a table of flags describing the shapes the stone is
+ * part of. The stone at the center is always taken as an own stone, so the
+ * table also answers "what if the player played here".
+ *
+ * 4 neighbours per side are enough for threes and fours, the 5th one is needed
+ * to tell a five from an overline.
+ */
+namespace linepatterns
+{
+	constexpr int RADIUS = 5;
+	constexpr int TABLE_SIZE = 59049; // 3^(2 * RADIUS)
+
+	enum Flag : uint8_t
+	{
+		OPEN_THREE   = 1 << 0, // _XXX_, _XX_X_ or _X_XX_ with the stone in it
+		OPEN_FOUR    = 1 << 1, // exactly 4 in a row, both ends empty
+		BLOCKED_FOUR = 1 << 2, // exactly 4 in a row, one end empty
+		FIVE         = 1 << 3, // exactly 5 in a row
+		OVERLINE     = 1 << 4, // 6 or more in a row
+	};
+
+	// Both tables are filled once when the library is loaded.
+	extern const std::array<uint8_t, TABLE_SIZE> TABLE;
+	// Base-3 value of a 10-bit mask: bit i becomes the digit 1 at 3^i.
+	extern const std::array<uint16_t, 1 << (2 * RADIUS)> TERNARY;
+
+	/**
+	 * Flags of the stone at bit `pos` of a line, given the own stones and the
+	 * empty cells of that line (cells outside the board are neither).
+	 */
+	inline uint8_t flags(uint32_t own, uint32_t empty, int pos)
+	{
+		constexpr uint64_t SIDE = (1u << RADIUS) - 1;
+		uint64_t o = ((uint64_t)own << RADIUS) >> pos;
+		uint64_t e = ((uint64_t)empty << RADIUS) >> pos;
+		// Drop the center bit, keep the 5 cells on each side.
+		uint32_t o10 = (uint32_t)((o & SIDE) | (((o >> (RADIUS + 1)) & SIDE) << RADIUS));
+		uint32_t e10 = (uint32_t)((e & SIDE) | (((e >> (RADIUS + 1)) & SIDE) << RADIUS));
+		return TABLE[TERNARY[o10] + 2 * TERNARY[e10]];
+	}
+}
+
+#endif // LINE_PATTERNS_HPP
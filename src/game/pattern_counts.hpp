@@ -0,0 +1,96 @@
+#ifndef PATTERN_COUNTS_HPP
+#define PATTERN_COUNTS_HPP
+
+#pragma once
+
+#include <cstdint>
+
+#include "bitboard.hpp"
+#include "line_patterns.hpp"
+
+/**
+ * Running totals of the evaluation patterns of both players: the open threes
+ * and the open fours each stone is part of, counted once per direction.
+ *
+ * The flags of a stone in one direction only depend on the line of that
+ * direction going through it, so the counts are kept per line. When a stone is
+ * placed or removed, only the 4 lines through it are marked, and they are
+ * scored again the next time the totals are read. Undoing a change is just
+ * marking the same lines again, so make/unmake stays O(1) and positions that
+ * are never evaluated cost nothing.
+ */
+class PatternCounts
+{
+public:
+	PatternCounts() : lineCounts{}, totals{}, dirty{} {}
+
+	int threats(const BitBoard &board, int player)
+	{
+		flush(board);
+		return totals[BitBoard::colorIndex(player)][THREE];
+	}
+
+	int openFours(const BitBoard &board, int player)
+	{
+		flush(board);
+		return totals[BitBoard::colorIndex(player)][OPEN_FOUR];
+	}
+
+	// Score every line of the board again.
+	void reset(const BitBoard &board)
+	{
+		for (int dir = 0; dir < 4; dir++)
+		{
+			int lines = (dir == BitBoard::ROW || dir == BitBoard::COL) ? board.size() : 2 * board.size() - 1;
+			dirty[dir] = (1ull << lines) - 1;
+		}
+		flush(board);
+	}
+
+	void onChange(const BitBoard &board, int row, int col)
+	{
+		for (int dir = 0; dir < 4; dir++)
+			dirty[dir] |= 1ull << board.lineIndex(dir, row, col);
+	}
+
+private:
+	enum Kind { THREE = 0, OPEN_FOUR = 1 };
+
+	// lineCounts[direction][line index][color][kind], color 0 = BLACK, 1 = WHITE
+	int16_t lineCounts[4][BitBoard::MAX_LINES][2][2];
+	int totals[2][2];
+	// Lines changed since the last flush, one bit per line index
+	uint64_t dirty[4];
+
+	void flush(const BitBoard &board)
+	{
+		for (int dir = 0; dir < 4; dir++)
+		{
+			for (; dirty[dir]; dirty[dir] &= dirty[dir] - 1)
+				scoreLine(board, dir, __builtin_ctzll(dirty[dir]));
+		}
+	}
+
+	void scoreLine(const BitBoard &board, int dir, int index)
+	{
+		uint32_t empty = board.emptyMask(dir, index);
+		for (int color = 0; color < 2; color++)
+		{
+			uint32_t own = board.line(dir, color ? WHITE : BLACK, index);
+			int16_t counts[2] = {0, 0};
+			for (uint32_t stones = own; stones; stones &= stones - 1)
+			{
+				uint8_t flags = linepatterns::flags(own, empty, __builtin_ctz(stones));
+				counts[THREE] += (flags & linepatterns::OPEN_THREE) != 0;
+				counts[OPEN_FOUR] += (flags & linepatterns::OPEN_FOUR) != 0;
+			}
+			for (int kind = 0; kind < 2; kind++)
+			{
+				totals[color][kind] += counts[kind] - lineCounts[dir][index][color][kind];
+				lineCounts[dir][index][color][kind] = counts[kind];
+			}
+		}
+	}
+};
+
+#endif // PATTERN_COUNTS_HPP
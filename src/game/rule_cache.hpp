@@ -0,0 +1,93 @@
+#ifndef RULE_CACHE_HPP
+#define RULE_CACHE_HPP
+
+#pragma once
+
+#include <cstdint>
+
+#include "bitboard.hpp"
+#include "line_patterns.hpp"
+
+/**
+ * Cached result, per empty cell and per color, of the rules that depend on the
+ * stones around a move (double-three, overline, the capture exception).
+ *
+ * Those rules only look at the 4 lines through the cell, at most RADIUS cells
+ * away, so a stone placed or removed only invalidates the cells of its own 4
+ * lines within RADIUS. Everything is stored as one bit mask per board row.
+ */
+class RuleCache
+{
+public:
+	static constexpr int RADIUS = linepatterns::RADIUS;
+
+	RuleCache() : known{}, allowed{} {}
+
+	bool isKnown(int player, int row, int col) const
+	{
+		return (known[BitBoard::colorIndex(player)][row] >> col) & 1u;
+	}
+
+	bool isAllowed(int player, int row, int col) const
+	{
+		return (allowed[BitBoard::colorIndex(player)][row] >> col) & 1u;
+	}
+
+	void store(int player, int row, int col, bool isAllowedMove)
+	{
+		int color = BitBoard::colorIndex(player);
+		known[color][row] |= 1u << col;
+		if (isAllowedMove)
+			allowed[color][row] |= 1u << col;
+		else
+			allowed[color][row] &= ~(1u << col);
+	}
+
+	void clear()
+	{
+		for (auto &rows : known)
+			for (auto &mask : rows)
+				mask = 0;
+	}
+
+	void onChange(int boardSize, int row, int col)
+	{
+		for (int dr = -RADIUS; dr <= RADIUS; dr++)
+		{
+			int r = row + dr;
+			if (r < 0 || r >= boardSize)
+				continue;
+			uint32_t stale;
+			if (dr == 0) {
+				// The whole row segment around the stone
+				stale = rangeMask(col - RADIUS, col + RADIUS);
+			} else {
+				// Column, diagonal and anti-diagonal cells on that row
+				stale = bitAt(col) | bitAt(col + dr) | bitAt(col - dr);
+			}
+			known[0][r] &= ~stale;
+			known[1][r] &= ~stale;
+		}
+	}
+
+private:
+	// known[color][row] / allowed[color][row]: one bit per column, color 0 = BLACK, 1 = WHITE
+	uint32_t known[2][BitBoard::MAX_SIZE];
+	uint32_t allowed[2][BitBoard::MAX_SIZE];
+
+	static uint32_t bitAt(int col)
+	{
+		return (col >= 0 && col < 32) ? 1u << col : 0u;
+	}
+
+	static uint32_t rangeMask(int lo, int hi)
+	{
+		if (lo < 0)
+			lo = 0;
+		if (hi > 31)
+			hi = 31;
+		return ((hi >= 31) ? ~0u : (1u << (hi + 1)) - 1) & ~((1u << lo) - 1);
+	}
+};
+
+#endif // RULE_CACHE_HPP
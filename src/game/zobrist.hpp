@@ -0,0 +1,88 @@
+#ifndef ZOBRIST_HPP
+#define ZOBRIST_HPP
+
+#pragma once
+
+#include <cstdint>
+#include <string>
+
+#include "bitboard.hpp"
+
+/**
+ * Zobrist keys used to hash a Gomoku position into 64 bits.
+ *
+ * A position hash is the XOR of:
+ *   - one key per stone (color, cell),
+ *   - the side-to-move key when WHITE is to play,
+ *   - one key per player for its number of captured pebbles,
+ *   - one key for the game type.
+ * The keys are generated once from a fixed seed, so hashes are stable between runs.
+ */
+namespace zobrist
+{
+	constexpr int MAX_CAPTURES = 31;
+
+	struct Keys
+	{
+		uint64_t stones[2][BitBoard::MAX_SIZE * BitBoard::MAX_SIZE];
+		uint64_t captures[2][MAX_CAPTURES + 1];
+		uint64_t whiteToMove;
+	};
+
+	inline uint64_t splitmix64(uint64_t &state)
+	{
+		uint64_t z = (state += 0x9E3779B97F4A7C15ULL);
+		z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL;
+		z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL;
+		return z ^ (z >> 31);
+	}
+
+	inline const Keys &keys()
+	{
+		static const Keys table = []() {
+			Keys k;
+			uint64_t state = 0x676F6D6F6B75ULL; // "gomoku"
+			for (auto &color : k.stones)
+				for (auto &key : color)
+					key = splitmix64(state);
+			for (auto &color : k.captures)
+				for (auto &key : color)
+					key = splitmix64(state);
+			k.whiteToMove = splitmix64(state);
+			return k;
+		}();
+		return table;
+	}
+
+	inline uint64_t stone(int player, int row, int col)
+	{
+		return keys().stones[BitBoard::colorIndex(player)][row * BitBoard::MAX_SIZE + col];
+	}
+
+	inline uint64_t captures(int player, int count)
+	{
+		if (count < 0)
+			count = 0;
+		if (count > MAX_CAPTURES)
+			count = MAX_CAPTURES;
+		return keys().captures[BitBoard::colorIndex(player)][count];
+	}
+
+	inline uint64_t sideToMove(int player)
+	{
+		return (player == WHITE) ? keys().whiteToMove : 0;
+	}
+
+	// FNV-1a of the game type name, mixed so that it looks like the other keys.
+	inline uint64_t gameType(const std::string &type)
+	{
+		uint64_t h = 0xCBF29CE484222325ULL;
+		for (unsigned char ch : type) {
+			h ^= ch;
+			h *= 0x100000001B3ULL;
+		}
+		return splitmix64(h);
+	}
+}
+
+#endif // ZOBRIST_HPP
@@ -0,0 +1,92 @@
+import threading
+
+
+class AiWorker:
+    """
+    Runs one EngineSession.best_move call on a background thread, so the UI keeps
+    drawing and handling events while the AI thinks (the search releases the GIL).
+    The moves of the session must not change until the search is over.
+    """
+
+    def __init__(self, session, depth: int, time_limit_ms: int):
+        self.session = session
+        self.result = None
+        self._thread = threading.Thread(
+            target=self._run, args=(depth, time_limit_ms), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, depth: int, time_limit_ms: int) -> None:
+        self.result = self.session.best_move(time_limit_ms, depth)
+
+    def done(self) -> bool:
+        """Whether the search is over: result then holds (score, best_move)."""
+        return not self._thread.is_alive()
+
+    def progress(self):
+        """Depth, best move so far and nodes per second of the running search."""
+        return self.session.getProgress()
+
+    def cancel(self) -> None:
+        """Stop the search at once (surrender, quit) and wait for the thread."""
+        self.session.stop()
+        self._thread.join()
+
+
+class Ponderer:
+    """
+    Pondering: during the opponent's turn, the session plays the reply the previous
+    searches expect (EngineSession.getPonderMove) and searches the position after it.
+    If the opponent plays it (a ponder hit), that search becomes the search of the
+    AI turn, with the depth it already reached; otherwise it is stopped and the reply
+    taken back, and only what it left in the transposition table is reused.
+    """
+
+    def __init__(self):
+        self.session = None
+        self.worker = None
+        self.move = None
+        self.hits = 0
+        self.total = 0
+
+    def start(self, session, depth: int) -> None:
+        """Ponder on the reply the session expects for its side to move."""
+        move = session.getPonderMove()
+        if move == (-1, -1):
+            return
+        is_valid, _, _ = session.push_move(*move)
+        if not is_valid:
+            return
+        if session.game().getGameStatus():
+            session.pop_move()
+            return
+        self.session = session
+        self.move = move
+        self.worker = AiWorker(session, depth, 0)
+
+    def take(self, move):
+        """
+        Called once the opponent played `move`: returns the worker of the ponder
+        search if it was on that move (a hit: the session already holds the move).
+        Otherwise stops it, takes the pondered reply back and returns None.
+        """
+        if not self.worker:
+            return None
+        worker, self.worker = self.worker, None
+        self.total += 1
+        if move == self.move:
+            self.hits += 1
+            return worker
+        worker.cancel()
+        self.session.pop_move()
+        return None
+
+    def cancel(self) -> None:
+        """Stop pondering (end of the game, quit), without counting a miss."""
+        if self.worker:
+            self.worker.cancel()
+            self.worker = None
+            self.session.pop_move()
+
+    def hit_rate(self) -> float:
+        return self.hits / self.total if self.total else 0.0
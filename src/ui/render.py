@@ -1,12 +1,14 @@
 import pygame
 import time
 import random
+import numpy as np
 
 # Instead of importing Python Gomoku, import the C++-bound class:
 # from src.game._gomoku import Gomoku
 # from src.algo.algo import GomokuAI
-from cpp_gomoku import Gomoku, GomokuAI
+from cpp_gomoku import EngineSession, Gomoku, GomokuAI
 from src.game.playerTokens import PlayerToken
+from src.ui.ai_worker import AiWorker, Ponderer
 
 
 # Colors
@@ -24,6 +26,10 @@ QUIT_BUTTON_COLOR = (220, 20, 60)    # Color for the quit button
 HOVER_COLOR = (255, 69, 0)
 COLOR_ON = (0, 200, 0)
 COLOR_OFF = (200, 0, 0)
+# Pause between two frames while the AI thinks, in milliseconds (the search keeps the CPU)
+AI_POLL_MS = 50
+# Moves suggested by the hint of the duo games, best first
+HINT_CANDIDATES = 3
 # Temps pour chaque joueur
 player_times = {
     PlayerToken.BLACK.value: {"total_time": 0, "last_time": 0},
@@ -41,7 +47,19 @@ class GomokuUi:
         self.board_size = 19
         self.ai_suggestion = None
         self.depth_value = 3
+        # Time budget of an AI move: the search deepens up to depth_value until it runs out
+        self.ai_time_limit_ms = 500
         self.ai_process_time = 0
+        self.ai_depth_reached = 0
+        # Engine following the moves of the game, for the AI turns and the hints
+        self.session = None
+        # Search of the AI running in the background during its turn
+        self.ai_worker = None
+        self.ai_turn_start = None
+        # Set when the search comes from a ponder hit: it is then stopped by the UI
+        self.ai_deadline = None
+        # Search of the AI on the player's time (normal and special games)
+        self.ponderer = Ponderer()
         self.hint_used = False
         self.message_start_time = None
         self.turn_start_time = None
@@ -91,7 +109,7 @@ class GomokuUi:
 
         # Dessine chaque ligne
         message_x = self.screen_size + 2 * self.border_size  # Position dans le panneau latéral
-        message_y = 350  # Position de départ pour le message
+        message_y = 400  # Position de départ pour le message
         line_spacing = 35  # Espacement entre les lignes
 
         for line in lines:
@@ -203,10 +221,10 @@ class GomokuUi:
             time.sleep(duration / steps)
 
     @staticmethod
-    def get_ai_suggestion(gomoku, ia):
-        """Recovers the best AI suggestion for the current player."""
-        _, best_move = ia.minmax(3, True, True)
-        return best_move if best_move else None
+    def get_ai_suggestion(session):
+        """Recovers the best AI suggestions for the current player, best first."""
+        analysis = session.analyze(3, 500, HINT_CANDIDATES)
+        return [line.move for line in analysis.lines] or None
 
     def handle_depth_slider(self, slider_x: int, slider_y: int, slider_width: int, mouse_pos, font) -> tuple:
         """
@@ -371,14 +389,11 @@ class GomokuUi:
             y_pos = grid_start + y * self.cell_size
             pygame.draw.line(self.screen, GRID_COLOR, (grid_start, y_pos), (grid_end, y_pos))
 
-        # Draw the stones
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                value = gomoku.getBoardValue(row, col)
-                if value == PlayerToken.WHITE.value:
-                    pygame.draw.circle(self.screen, WHITE, (grid_start + col * self.cell_size, grid_start + row * self.cell_size), int(self.pion_radius))
-                elif value == PlayerToken.BLACK.value:
-                    pygame.draw.circle(self.screen, BLACK, (grid_start + col * self.cell_size, grid_start + row * self.cell_size), int(self.pion_radius))
+        # Draw the stones (the board is read once, as a read-only view of the C++ board)
+        board = gomoku.getBoard()
+        for row, col in np.argwhere(board != PlayerToken.EMPTY.value).tolist():
+            color = WHITE if board[row, col] == PlayerToken.WHITE.value else BLACK
+            pygame.draw.circle(self.screen, color, (grid_start + col * self.cell_size, grid_start + row * self.cell_size), int(self.pion_radius))
 
         # Afficher les scores et le prochain joueur
         font = pygame.font.Font(None, 32)
@@ -412,13 +427,32 @@ class GomokuUi:
         self.screen.blit(black_time_text, (text_x, time_start_y))
         self.screen.blit(white_time_text, (text_x, time_start_y + line_spacing))
 
-        if self.ai_process_time > 0:
+        if self.ai_process_time > 0 and not self.ai_worker:
             ia_time_text = font.render(
-                f"Process IA : {self.ai_process_time:.3f}s", 
+                f"Process IA : {self.ai_process_time:.3f}s (profondeur {self.ai_depth_reached})", 
                 True, TEXT_COLOR
             )
             self.screen.blit(ia_time_text, (text_x, time_start_y + 2 * line_spacing))
 
+        # Progress of the search while the AI thinks
+        if self.ai_worker:
+            progress = self.ai_worker.progress()
+            best_move = progress.best_move if progress.depth > 0 else "-"
+            ia_progress_text = font.render(
+                f"IA : profondeur {progress.depth}, coup {best_move}", True, TEXT_COLOR
+            )
+            ia_speed_text = font.render(
+                f"{progress.nodes_per_second / 1000:.0f}k noeuds/s ({progress.elapsed_ms / 1000:.1f}s)", True, TEXT_COLOR
+            )
+            self.screen.blit(ia_progress_text, (text_x, time_start_y + 2 * line_spacing))
+            self.screen.blit(ia_speed_text, (text_x, time_start_y + 3 * line_spacing))
+
+        if self.ponderer.total:
+            ponder_text = font.render(
+                f"Ponder : {self.ponderer.hits}/{self.ponderer.total} ({self.ponderer.hit_rate():.0%})", True, TEXT_COLOR
+            )
+            self.screen.blit(ponder_text, (text_x, time_start_y + 4 * line_spacing))
+
         # Afficher un message d'erreur, si nécessaire
         if forbidden_message:
             self.draw_forbidden_message(forbidden_message)
@@ -459,6 +493,9 @@ class GomokuUi:
     def initialize_game(self, game_mode: str) -> tuple:
         self.board_size = 15 if game_mode == "special" else 19
         gomoku = Gomoku(self.board_size, game_mode)
+        self.session = EngineSession(self.board_size, game_mode)
+        # Nothing the AI learned in the previous game applies to the new one
+        GomokuAI.clearHash()
         self.screen_size = self.board_size * self.cell_size
         ia_player = None
         running = True
@@ -486,14 +523,20 @@ class GomokuUi:
                 hover_color=BUTTON_HOVER_COLOR
             )
 
-            # Displays a temporary red dot if a suggestion has been made
+            # Displays temporary dots if a suggestion has been made: red for the best
+            # move, then smaller numbered ones for the next candidates
             if self.ai_suggestion:
-                pygame.draw.circle(
-                    self.screen, WINNER_COLOR, 
-                    (self.border_size + self.cell_size // 2 + self.ai_suggestion[1] * self.cell_size, 
-                    self.border_size + self.cell_size // 2 + self.ai_suggestion[0] * self.cell_size), 
-                    int(self.pion_radius / 2)
-                )
+                rank_font = pygame.font.Font(None, 22)
+                for rank, (row, col) in reversed(list(enumerate(self.ai_suggestion))):
+                    center = (self.border_size + self.cell_size // 2 + col * self.cell_size,
+                              self.border_size + self.cell_size // 2 + row * self.cell_size)
+                    if rank == 0:
+                        pygame.draw.circle(self.screen, WINNER_COLOR, center, int(self.pion_radius / 2))
+                    else:
+                        pygame.draw.circle(self.screen, HOVER_COLOR, center, int(self.pion_radius / 2.5))
+                        rank_text = rank_font.render(str(rank + 1), True, WHITE)
+                        self.screen.blit(rank_text, (center[0] - rank_text.get_width() // 2,
+                                                     center[1] - rank_text.get_height() // 2))
 
         return hint_button_rect if game_mode == "duo" else None
 
@@ -503,22 +546,42 @@ class GomokuUi:
             return None, None
         return forbidden_message
 
-    def handle_ai_turn(self, gomoku, ia_player, ai, player_times):
-        """Handle the AI's turn."""
-        time_ai_start = time.time()
-        score, best_move = ai.minmax(self.depth_value, True, True)
-        time_ai_end = time.time()
-        self.ai_process_time = time_ai_end - time_ai_start
+    def handle_ai_turn(self, gomoku, ai_worker):
+        """Play the move found by the AI once its background search is over."""
+        score, best_move = ai_worker.result
+        self.ai_process_time = time.time() - self.ai_turn_start
+        self.ai_depth_reached = ai_worker.progress().depth
         if best_move:
             row, col = best_move
             is_valid, forbidden_message, score = gomoku.processMove(row, col)
             if not is_valid:
                 self.message_start_time = time.time()
                 return forbidden_message, False, is_valid, col, row
+            self.session.push_move(row, col)
             print(f"movement play: ({row}, {col})")
 
         return None, gomoku.getGameStatus(), is_valid, col, row
 
+    def start_ai_turn(self, ai_worker=None):
+        """
+        Start the search of the AI move, or carry on with `ai_worker`, the ponder search
+        of the move just played: it has no time limit, the UI stops it at the deadline.
+        """
+        self.ai_turn_start = time.time()
+        if ai_worker:
+            self.ai_worker = ai_worker
+            self.ai_deadline = self.ai_turn_start + self.ai_time_limit_ms / 1000
+        else:
+            self.ai_worker = AiWorker(self.session, self.depth_value, self.ai_time_limit_ms)
+            self.ai_deadline = None
+
+    def stop_ai_searches(self):
+        """Stop the AI searches running in the background (AI turn, pondering), if any."""
+        if self.ai_worker:
+            self.ai_worker.cancel()
+            self.ai_worker = None
+        self.ponderer.cancel()
+
     def handle_player_turn(self, event, gomoku, color, player_times):
         """Handle the player's turn."""
         x, y = event.pos
@@ -533,6 +596,10 @@ class GomokuUi:
 
             if 0 <= row < self.board_size and 0 <= col < self.board_size:
                 if gomoku.getBoardValue(row, col) == PlayerToken.EMPTY.value:
+                    # Forbidden moves are rejected from the legal move mask, without playing them
+                    if not gomoku.legalMoveMask()[row, col]:
+                        self.message_start_time = time.time()
+                        return gomoku.getIllegalMoveReason(row, col), False, is_valid, col, row
                     is_valid, forbidden_message, score = gomoku.processMove(row, col)
                     if not is_valid:
                         self.message_start_time = time.time()
@@ -566,29 +633,55 @@ class GomokuUi:
                     color = WHITE if gomoku.getCurrentPlayer() == PlayerToken.WHITE.value else BLACK
 
                     if game_mode in ["normal", "special"] and gomoku.getCurrentPlayer() == ia_player:
-                        ai = GomokuAI(gomoku=gomoku)
                         if not self.turn_start_time:
                             self.turn_start_time = time.time()
-                        forbidden_message, game_over, is_valid, col, row = self.handle_ai_turn(
-                            gomoku, ia_player, ai, player_times
-                        )
-                        if self.turn_start_time and is_valid:
-                            self.update_opponent_time(player_times, gomoku.getCurrentPlayer())
-                        if is_valid:
-                            self.draw_animated_stone(row, col, color)
+                        if not self.ai_worker:
+                            self.start_ai_turn()
+                        # The AI thinks in the background: the player can still quit or surrender
+                        for event in pygame.event.get():
+                            if event.type == pygame.QUIT:
+                                self.stop_ai_searches()
+                                running = False
+                                self.exit_game = True
+                            elif event.type == pygame.MOUSEBUTTONDOWN and not game_over:
+                                if surrender_button_rect.collidepoint(event.pos):
+                                    self.stop_ai_searches()
+                                    game_over = True
+                                    winner = "Noir" if ia_player == PlayerToken.BLACK.value else "Blanc"
+                                    break
+                        # A search carried on from pondering keeps the move of its deepest iteration
+                        if (self.ai_worker and self.ai_deadline and time.time() >= self.ai_deadline
+                                and self.ai_worker.progress().depth >= 1):
+                            self.ai_worker.cancel()
+                        if self.ai_worker and self.ai_worker.done():
+                            ai_worker = self.ai_worker
+                            forbidden_message, game_over, is_valid, col, row = self.handle_ai_turn(
+                                gomoku, ai_worker
+                            )
+                            self.ai_worker = None
+                            if self.turn_start_time and is_valid:
+                                self.update_opponent_time(player_times, gomoku.getCurrentPlayer())
+                            if is_valid:
+                                self.draw_animated_stone(row, col, color)
+                                if not gomoku.getGameStatus():
+                                    self.ponderer.start(self.session, self.depth_value)
+                        elif self.ai_worker:
+                            pygame.time.wait(AI_POLL_MS)
                     else:
                         if not self.turn_start_time:
                             self.turn_start_time = time.time()
                         for event in pygame.event.get():
                             if event.type == pygame.QUIT:
+                                self.stop_ai_searches()
                                 running = False
                                 self.exit_game = True
                             elif event.type == pygame.MOUSEBUTTONDOWN and not game_over:
                                 if game_mode == "duo" and not self.hint_used and event.type == pygame.MOUSEBUTTONDOWN:
                                     if hint_button_rect.collidepoint(event.pos):
-                                        self.ai_suggestion = GomokuUi.get_ai_suggestion(gomoku, GomokuAI(gomoku))
+                                        self.ai_suggestion = GomokuUi.get_ai_suggestion(self.session)
                                         self.hint_used = True
                                 if surrender_button_rect.collidepoint(event.pos):
+                                    self.stop_ai_searches()
                                     game_over = True
                                     winner = "Noir" if gomoku.getCurrentPlayer() == PlayerToken.WHITE.value else "Blanc"
                                     break
@@ -599,10 +692,18 @@ class GomokuUi:
                                     self.update_opponent_time(player_times, gomoku.getCurrentPlayer())
                                 if is_valid:
                                     self.draw_animated_stone(row, col, color)
+                                    # On a ponder hit, the session already holds the move and
+                                    # the AI goes on with the search it started
+                                    pondered = self.ponderer.take((row, col))
+                                    if pondered:
+                                        self.start_ai_turn(pondered)
+                                    else:
+                                        self.session.push_move(row, col)
                     if gomoku.getGameStatus():
                         game_over = True
                         winner = "Noir" if gomoku.getCurrentPlayer() == PlayerToken.BLACK.value else "Blanc"            
                     if game_over:
+                        self.stop_ai_searches()
                         if self.pause_after_game:
                             font = pygame.font.Font(None, 40)
                             text = font.render("Press SPACE to continue...", True, WHITE)
@@ -620,14 +721,7 @@ class GomokuUi:
                         self.ai_process_time = 0
                         action = self.end_game_menu(winner)
                         if action == "replay":
-                            self.board_size = 15 if game_mode == "special" else 19
-                            gomoku = Gomoku(self.board_size, game_mode)
-                            if game_mode in ["normal", "special"]:
-                                ai = GomokuAI(gomoku=gomoku)
-                            game_over = False
-                            winner = None
-                            if game_mode in ["special"]:
-                                ia_player = random.choice([PlayerToken.BLACK.value, PlayerToken.WHITE.value])
+                            gomoku, ia_player, running, game_over, winner = self.initialize_game(game_mode)
                         elif action == "menu":
                             break
 
@@ -1,7 +1,26 @@
+import io
+import threading
+import time
+
+import numpy as np
 import pytest
-from cpp_gomoku import Gomoku
+from cpp_gomoku import EngineSession, Gomoku, GomokuAI, analyze_batch, solveCaptureRace, solveVCF, solveVCT
+import analyze_games
 from src.game.playerTokens import PlayerToken
 
+# Mid-game moves of the EngineSession fixture, BLACK to move after them
+SESSION_MOVES = [(9, 9), (8, 9), (9, 10), (10, 10), (10, 8), (11, 9), (8, 11), (7, 9)]
+
+
+@pytest.fixture
+def session():
+    """EngineSession that played SESSION_MOVES."""
+    session = EngineSession()
+    for move in SESSION_MOVES:
+        assert session.push_move(*move)[0]
+    return session
+
+
 class TestCaptureMechanism:
 
 	@pytest.fixture # This decorator is used to set up the game instance before each test
@@ -336,4 +355,1308 @@ class TestDoubleThreeDetection:
         game.setCurrentPlayer(PlayerToken.BLACK.value)
         game.addTiles([(7, 5)], PlayerToken.BLACK.value)
 
-        assert game.isDoubleThree(7, 5) is False
\ No newline at end of file
+        assert game.isDoubleThree(7, 5) is False
+
+class TestZobristHash:
+
+    @pytest.fixture
+    def setup_game(self):
+        """Set up a basic Gomoku game instance."""
+        return Gomoku()
+
+    def test_hash_matches_recompute_after_moves(self, setup_game):
+        game = setup_game
+        for row, col in [(9, 9), (9, 10), (10, 9), (8, 8), (11, 9)]:
+            assert game.processMove(row, col)[0]
+            assert game.getHash() == game.computeStateHash()
+
+    def test_hash_matches_recompute_after_capture(self, setup_game):
+        game = setup_game
+        game.addTiles([(4, 3), (4, 4)], PlayerToken.WHITE.value)
+        game.addTiles([(4, 5)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        before = game.getHash()
+
+        game.processMove(4, 2)
+
+        assert game.getBlackPlayerPebblesTaken() == 2
+        assert game.getHash() != before
+        assert game.getHash() == game.computeStateHash()
+
+    def test_occupied_cell_is_rejected(self, setup_game):
+        game = setup_game
+        assert game.processMove(9, 9)[0]
+        assert game.processMove(9, 10)[0]
+        before = game.getHash()
+
+        assert game.processMove(9, 10) == (False, "occupied", 0)
+        assert game.processMove(-1, 3) == (False, "occupied", 0)
+        assert game.getHash() == before
+        assert game.getHash() == game.computeStateHash()
+        assert game.getCurrentPlayer() == PlayerToken.BLACK.value
+
+    def test_same_position_same_hash(self):
+        first = Gomoku()
+        for row, col in [(9, 9), (5, 5), (9, 10), (5, 6)]:
+            first.processMove(row, col)
+        second = Gomoku()
+        for row, col in [(9, 10), (5, 6), (9, 9), (5, 5)]:
+            second.processMove(row, col)
+
+        assert first.getHash() == second.getHash()
+
+    def test_hash_depends_on_side_captures_and_game_type(self, setup_game):
+        game = setup_game
+        start = game.getHash()
+
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        assert game.getHash() != start
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        assert game.getHash() == start
+
+        game.setWhitePlayerPebblesTaken(4)
+        assert game.getHash() != start
+        game.setWhitePlayerPebblesTaken(0)
+        assert game.getHash() == start
+
+        assert Gomoku(19, "duo").getHash() != start
+
+
+class TestMakeUnmakeMove:
+
+    @staticmethod
+    def snapshot(game):
+        size = game.getBoardSize()
+        return (
+            [[game.getBoardValue(row, col) for col in range(size)] for row in range(size)],
+            game.getCurrentPlayer(),
+            game.getBlackPlayerPebblesTaken(),
+            game.getWhitePlayerPebblesTaken(),
+            game.getForcedMoves(),
+            game.getGameStatus(),
+            game.getHash(),
+        )
+
+    def test_unmake_restores_simple_move(self):
+        game = Gomoku()
+        before = self.snapshot(game)
+
+        assert game.makeMove(9, 9)[0]
+        assert game.getMoveCount() == 1
+        assert game.unmakeMove()
+
+        assert self.snapshot(game) == before
+        assert game.getMoveCount() == 0
+        assert game.unmakeMove() is False
+
+    def test_occupied_cell_is_not_recorded(self):
+        game = Gomoku()
+        assert game.makeMove(9, 9)[0]
+        before = self.snapshot(game)
+
+        assert game.makeMove(9, 9) == (False, "occupied", 0)
+        assert self.snapshot(game) == before
+        assert game.getMoveCount() == 1
+        assert game.unmakeMove()
+        assert game.getBoardValue(9, 9) == PlayerToken.EMPTY.value
+        assert game.getHash() == game.computeStateHash()
+
+    def test_unmake_restores_captured_stones(self):
+        game = Gomoku()
+        game.addTiles([(4, 3), (4, 4)], PlayerToken.WHITE.value)
+        game.addTiles([(4, 5)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        before = self.snapshot(game)
+
+        game.makeMove(4, 2)
+        assert game.getBoardValue(4, 3) == 0
+        assert game.getBlackPlayerPebblesTaken() == 2
+        game.unmakeMove()
+
+        assert self.snapshot(game) == before
+
+    def test_unmake_restores_forced_moves_and_game_over(self):
+        game = Gomoku()
+        # Black five on row 10 that White can break by capturing (10, 5)-(9, 5)
+        game.addTiles([(10, 2), (10, 3), (10, 4), (10, 5), (9, 5)], PlayerToken.BLACK.value)
+        game.addTiles([(11, 5), (0, 0)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        before = self.snapshot(game)
+
+        game.makeMove(10, 6)
+        assert game.getForcedMoves() == [(8, 5)]
+        assert game.makeMove(0, 1)[1] == "forced_move"
+        assert game.getForcedMoves() == [(8, 5)]
+        game.makeMove(8, 5)
+        assert game.getBoardValue(10, 5) == 0
+
+        game.unmakeMove()
+        assert game.getForcedMoves() == [(8, 5)]
+        game.unmakeMove()
+        assert self.snapshot(game) == before
+
+    def test_invalid_move_is_not_recorded(self):
+        game = Gomoku()
+        game.addTiles([(5, 4), (5, 6), (4, 5), (6, 5)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        before = self.snapshot(game)
+
+        assert game.makeMove(5, 5)[1] == "double_three"
+        assert game.getMoveCount() == 0
+        assert self.snapshot(game) == before
+
+
+class TestCloseMovesFrontier:
+
+    @staticmethod
+    def brute_force_close_moves(game, radius):
+        size = game.getBoardSize()
+        moves = []
+        for row in range(size):
+            for col in range(size):
+                if game.getBoardValue(row, col) != PlayerToken.EMPTY.value:
+                    continue
+                if any(
+                    0 <= row + dr < size and 0 <= col + dc < size
+                    and game.getBoardValue(row + dr, col + dc) != PlayerToken.EMPTY.value
+                    for dr in range(-radius, radius + 1)
+                    for dc in range(-radius, radius + 1)
+                ):
+                    moves.append((row, col))
+        return moves
+
+    @pytest.mark.parametrize("radius", [1, 2])
+    def test_frontier_follows_moves_captures_and_undo(self, radius):
+        game = Gomoku()
+        game.setCloseMovesRadius(radius)
+        assert game.getCloseMovesRadius() == radius
+        assert game.getAllCloseMoves() == []
+
+        # Black captures (4, 3) and (4, 4) with the last move
+        for row, col in [(4, 5), (4, 4), (0, 18), (4, 3), (4, 2)]:
+            game.makeMove(row, col)
+            assert game.getAllCloseMoves() == self.brute_force_close_moves(game, radius)
+        assert game.getBlackPlayerPebblesTaken() == 2
+
+        while game.unmakeMove():
+            assert game.getAllCloseMoves() == self.brute_force_close_moves(game, radius)
+
+    def test_frontier_unchanged_by_occupied_cell_replay(self):
+        game = Gomoku()
+        for row, col in [(4, 5), (4, 4), (0, 18), (4, 3)]:
+            assert game.makeMove(row, col)[0]
+        # Moves on the stones about to be captured change nothing
+        assert not game.processMove(4, 4)[0]
+        assert not game.makeMove(4, 3)[0]
+        assert game.processMove(4, 2)[0]
+        assert game.getBlackPlayerPebblesTaken() == 2
+
+        fresh = Gomoku()
+        fresh.from_array(game.to_array())
+        assert game.getAllCloseMoves() == fresh.getAllCloseMoves()
+        assert game.getAllCloseMoves() == self.brute_force_close_moves(game, 1)
+
+    def test_radius_change_rebuilds_frontier(self):
+        game = Gomoku()
+        game.addTiles([(9, 9)], PlayerToken.BLACK.value)
+        assert len(game.getAllCloseMoves()) == 8
+
+        game.setCloseMovesRadius(2)
+        assert len(game.getAllCloseMoves()) == 24
+
+        with pytest.raises(ValueError):
+            game.setCloseMovesRadius(3)
+
+
+class TestLinePatterns:
+
+    def test_empty_cell_is_checked_as_if_played(self):
+        game = Gomoku()
+        game.addTiles([(5, 4), (5, 6), (4, 5), (6, 5)], PlayerToken.BLACK.value)
+
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        assert game.isDoubleThree(5, 5) is True
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        assert game.isDoubleThree(5, 5) is False
+
+    def test_open_and_blocked_fours(self):
+        game = Gomoku()
+        game.addTiles([(9, 5), (9, 6), (9, 7), (9, 8)], PlayerToken.BLACK.value)
+        # Every stone of the open four counts
+        assert game.getNumberOf4Aligned(PlayerToken.BLACK.value) == 4
+
+        game.addTiles([(9, 4)], PlayerToken.WHITE.value)
+        assert game.getNumberOf4Aligned(PlayerToken.BLACK.value) == 0
+
+    def test_five_and_overline_on_small_board(self):
+        game = Gomoku(15, "special")
+        game.addTiles([(7, 2), (7, 3), (7, 4), (7, 6), (7, 7)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        assert game.processMove(7, 5)[:2] == (False, "line_over_5")
+
+        game = Gomoku(15, "special")
+        game.addTiles([(10, 10), (11, 11), (12, 12), (14, 14)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        assert game.processMove(13, 13)[:2] == (True, "win_alignments")
+
+    def test_python_engine_counts_the_same_threats(self):
+        import random
+        from src.game._gomoku import Gomoku as PyGomoku
+
+        rng = random.Random(5)
+        for _ in range(20):
+            game = Gomoku()
+            py_game = PyGomoku()
+            for _ in range(40):
+                row, col = rng.randrange(6, 13), rng.randrange(6, 13)
+                player = rng.choice([PlayerToken.BLACK.value, PlayerToken.WHITE.value])
+                game.addTiles([(row, col)], player)
+                py_game.board[row, col] = player
+            for player in (PlayerToken.BLACK.value, PlayerToken.WHITE.value):
+                assert py_game._get_number_of_threats(player) == game.getNumberOfThreats(player)
+
+
+class TestPatternCounts:
+
+    @pytest.mark.parametrize("board_size, game_type", [(19, "normal"), (15, "special")])
+    def test_running_totals_match_full_recount(self, board_size, game_type):
+        import random
+
+        rng = random.Random(11)
+        for _ in range(5):
+            game = Gomoku(board_size, game_type)
+            game.makeMove(board_size // 2, board_size // 2)
+            for _ in range(60):
+                moves = game.getForcedMoves() or game.getAllCloseMoves()
+                valid = game.makeMove(*rng.choice(moves))[0]
+                assert game.verifyPatternCounts()
+                if game.getGameStatus():
+                    break
+                if valid and rng.random() < 0.2:
+                    game.unmakeMove()
+                    assert game.verifyPatternCounts()
+            while game.unmakeMove():
+                assert game.verifyPatternCounts()
+            assert game.getNumberOfThreats(PlayerToken.BLACK.value) == 0
+
+    def test_totals_follow_captures(self):
+        game = Gomoku()
+        game.addTiles([(9, 5), (9, 6), (9, 7), (10, 6)], PlayerToken.WHITE.value)
+        game.addTiles([(8, 6)], PlayerToken.BLACK.value)
+        assert game.getNumberOfThreats(PlayerToken.WHITE.value) == 3
+
+        # Black captures (9, 6) and (10, 6), which breaks the open three
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        game.makeMove(11, 6)
+        assert game.getBlackPlayerPebblesTaken() == 2
+        assert game.getNumberOfThreats(PlayerToken.WHITE.value) == 0
+        assert game.verifyPatternCounts()
+
+        game.unmakeMove()
+        assert game.getNumberOfThreats(PlayerToken.WHITE.value) == 3
+        assert game.verifyPatternCounts()
+
+
+class TestBoardArray:
+
+    def test_board_view_is_read_only_and_follows_moves(self):
+        game = Gomoku()
+        board = game.getBoard()
+        assert board.shape == (19, 19)
+        assert board.dtype == np.int8
+        assert not board.flags.writeable
+        assert not board.flags.owndata
+
+        game.makeMove(3, 4)
+        assert board[3, 4] == PlayerToken.BLACK.value
+        game.unmakeMove()
+        assert board[3, 4] == PlayerToken.EMPTY.value
+        with pytest.raises(ValueError):
+            board[0, 0] = PlayerToken.WHITE.value
+
+    def test_buffer_protocol_on_small_board(self):
+        game = Gomoku(15, "special")
+        game.addTiles([(14, 14)], PlayerToken.WHITE.value)
+        board = np.asarray(game)
+        assert board.shape == (15, 15)
+        assert board[14, 14] == PlayerToken.WHITE.value
+        assert np.count_nonzero(board) == 1
+
+    def test_from_array_and_to_array(self):
+        position = np.zeros((19, 19), dtype=np.int8)
+        position[9, 9:12] = PlayerToken.BLACK.value
+        position[10, 10] = PlayerToken.WHITE.value
+
+        game = Gomoku()
+        game.addTiles([(0, 0)], PlayerToken.WHITE.value)
+        game.from_array(position)
+        assert np.array_equal(game.to_array(), position)
+        assert game.getBoardValue(0, 0) == PlayerToken.EMPTY.value
+        assert game.getHash() == game.computeStateHash()
+        assert game.verifyPatternCounts()
+        assert (0, 1) not in game.getAllCloseMoves()
+        assert (8, 8) in game.getAllCloseMoves()
+
+        copy = game.to_array()
+        copy[0, 0] = PlayerToken.BLACK.value
+        assert game.getBoardValue(0, 0) == PlayerToken.EMPTY.value
+
+    def test_from_array_rejects_bad_boards(self):
+        game = Gomoku()
+        with pytest.raises(ValueError):
+            game.from_array(np.zeros((15, 15), dtype=np.int8))
+        with pytest.raises(ValueError):
+            game.from_array(np.full((19, 19), 2, dtype=np.int8))
+
+
+class TestLegalMoveMask:
+
+    def test_mask_matches_process_move(self):
+        import random
+
+        rng = random.Random(3)
+        for board_size, game_type in [(19, "normal"), (15, "special")]:
+            game = Gomoku(board_size, game_type)
+            game.makeMove(board_size // 2, board_size // 2)
+            for _ in range(40):
+                mask = game.legalMoveMask()
+                assert mask.shape == (board_size, board_size)
+                assert mask.dtype == np.uint8
+                for row, col in game.getAllCloseMoves():
+                    assert bool(mask[row, col]) == game.clone().makeMove(row, col)[0]
+                game.makeMove(*rng.choice(game.getForcedMoves() or game.getAllCloseMoves()))
+                if game.getGameStatus():
+                    break
+
+    def test_double_three_and_capture_exception(self):
+        game = Gomoku()
+        game.addTiles([(5, 4), (5, 6), (4, 5), (6, 5)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        assert not game.isLegalMove(5, 5)
+        assert game.legalMoveMask()[5, 5] == 0
+        assert game.getIllegalMoveReason(5, 5) == "double_three"
+
+        # Cached legality is recomputed when a stone changes nearby
+        game.addTiles([(5, 7)], PlayerToken.WHITE.value)
+        assert game.isLegalMove(5, 5)
+        assert game.getIllegalMoveReason(5, 5) == ""
+
+        # A capture makes the double-three legal
+        game.addTiles([(5, 7)], PlayerToken.EMPTY.value)
+        assert not game.isLegalMove(5, 5)
+        game.addTiles([(6, 6), (7, 7)], PlayerToken.WHITE.value)
+        game.addTiles([(8, 8)], PlayerToken.BLACK.value)
+        assert game.isLegalMove(5, 5)
+
+    def test_forced_moves_and_overline(self):
+        game = Gomoku(15, "special")
+        game.addTiles([(7, 2), (7, 3), (7, 4), (7, 6), (7, 7)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        assert game.getIllegalMoveReason(7, 5) == "line_over_5"
+        assert game.legalMoveMask()[7, 5] == 0
+        assert game.legalMoveMask()[7, 8] == 1
+
+        game = Gomoku()
+        game.addTiles([(9, 5), (9, 6), (9, 7), (9, 8), (10, 7)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 7)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        game.makeMove(9, 9)
+        assert game.getForcedMoves() == [(11, 7)]
+        mask = game.legalMoveMask()
+        assert mask.sum() == 1 and mask[11, 7] == 1
+        assert game.getIllegalMoveReason(0, 0) == "forced_move"
+
+
+def _reference_minmax(game, depth, is_maximizing, score=0.0):
+    """Plain minimax (no pruning) with the scores of GomokuAI, WHITE-positive."""
+    moves = game.getForcedMoves() or game.getAllCloseMoves()
+    legal = [move for move in moves if game.isLegalMove(*move)]
+    best = None
+    for row, col in legal or moves:
+        valid, _, move_score = game.makeMove(row, col)
+        if not valid:
+            value = -1e6 - depth if is_maximizing else 1e6 + depth
+        elif game.getGameStatus():
+            value = 1e6 + depth if is_maximizing else -1e6 - depth
+        else:
+            sign = 1 if game.getCurrentPlayer() == PlayerToken.BLACK.value else -1
+            value = score + sign * (move_score + depth)
+            if depth > 1:
+                value = _reference_minmax(game, depth - 1, not is_maximizing, value)
+        if valid:
+            game.unmakeMove()
+        if best is None or (value > best if is_maximizing else value < best):
+            best = value
+    return best
+
+
+class TestAlphaBetaSearch:
+
+    def setup_method(self):
+        # The reference has no quiescence search at the leaves
+        GomokuAI.setQuiescence(False)
+
+    def teardown_method(self):
+        GomokuAI.setQuiescence(True)
+
+    def _position(self):
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 8)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 9), (10, 10), (11, 9)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        return game
+
+    @pytest.mark.parametrize("depth", [1, 2, 3])
+    def test_score_matches_plain_minimax(self, depth):
+        game = self._position()
+        expected = _reference_minmax(game.clone(), depth, True)
+        score, move = GomokuAI(game).minmax(depth, True, True)
+        assert score == expected
+        assert game.isLegalMove(*move)
+
+    def test_black_to_move(self):
+        game = self._position()
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        expected = _reference_minmax(game.clone(), 2, False)
+        score, _ = GomokuAI(game).minmax(2, False, True)
+        assert score == expected
+
+    def test_finds_winning_move(self):
+        game = Gomoku()
+        game.addTiles([(5, 5), (5, 6), (5, 7), (5, 8)], PlayerToken.WHITE.value)
+        game.addTiles([(6, 5), (6, 6), (6, 7), (12, 12)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        score, move = GomokuAI(game).minmax(3, True, True)
+        assert score >= 1e6
+        assert move in [(5, 4), (5, 9)]
+
+
+class TestIterativeDeepening:
+
+    def _position(self):
+        game = Gomoku()
+        game.addTiles([(8, 11), (8, 12), (9, 9), (9, 10), (9, 12), (10, 8), (10, 11)], PlayerToken.BLACK.value)
+        game.addTiles([(6, 9), (7, 9), (7, 10), (7, 11), (8, 10), (8, 14), (11, 8)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        return game
+
+    def test_reports_depth_and_time(self):
+        ai = GomokuAI(self._position())
+        ai.minmax(3, True, True)
+        assert ai.getDepthReached() == 3
+        assert ai.getElapsedMs() > 0
+
+    def test_time_limit_returns_a_completed_iteration(self):
+        game = self._position()
+        ai = GomokuAI(game)
+        score, move = ai.minmax(11, True, True, 100)
+        assert 1 <= ai.getDepthReached() < 11
+        assert ai.getElapsedMs() < 1000
+        assert game.isLegalMove(*move)
+
+        # Same score as a search to the depth that was reached
+        expected, _ = GomokuAI(game).minmax(ai.getDepthReached(), True, True)
+        assert score == expected
+
+
+class TestTranspositionTable:
+
+    def teardown_method(self):
+        GomokuAI.setHashSize(16)
+        GomokuAI.setQuiescence(True)
+        GomokuAI.setSelectiveSearch(True)
+
+    def test_size_in_megabytes(self):
+        GomokuAI.setHashSize(5)
+        assert GomokuAI.getHashSize() == 4
+        GomokuAI.setHashSize(16)
+        assert GomokuAI.getHashSize() == 16
+
+    def test_same_score_with_a_warm_table(self):
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 8), (8, 11)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 9), (10, 10), (11, 9), (7, 9)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+
+        # The moves reduced depend on the order, which the table changes
+        GomokuAI.setSelectiveSearch(False)
+        GomokuAI.clearHash()
+        assert GomokuAI.getHashfull() == 0
+        ai = GomokuAI(game)
+        cold_score, _ = ai.minmax(4, True, True)
+        cold_nodes = ai.getNodesSearched()
+
+        ai = GomokuAI(game)
+        warm_score, _ = ai.minmax(4, True, True)
+        assert warm_score == cold_score
+        assert ai.getNodesSearched() < cold_nodes
+
+        # A tiny table is overwritten all the time, but never gives wrong scores
+        GomokuAI.setHashSize(0)
+        assert GomokuAI(game).minmax(4, True, True)[0] == cold_score
+        GomokuAI.setQuiescence(False)
+        assert _reference_minmax(game.clone(), 2, True) == GomokuAI(game).minmax(2, True, True)[0]
+
+    def test_resize_waits_for_the_running_search(self):
+        session = EngineSession()
+        for move in [(9, 9), (9, 10), (10, 10)]:
+            session.push_move(*move)
+        search = threading.Thread(target=session.analyze)
+        search.start()
+        while not session.getProgress().running:
+            time.sleep(0.001)
+
+        resize = threading.Thread(target=GomokuAI.setHashSize, args=(8,))
+        resize.start()
+        time.sleep(0.1)
+        assert resize.is_alive() and search.is_alive()
+        assert GomokuAI.getHashSize() == 16
+
+        session.stop()
+        search.join()
+        resize.join()
+        assert GomokuAI.getHashSize() == 8
+
+    def test_resize_during_batch_analysis(self):
+        boards = np.zeros((4, 19, 19), dtype=np.int8)
+        boards[:, 9, 9] = PlayerToken.BLACK.value
+        results = {}
+        batch = threading.Thread(target=lambda: results.update(analyze_batch(
+            boards, np.full(4, PlayerToken.WHITE.value), np.zeros((4, 2)), 0.05, threads=2)))
+        batch.start()
+        GomokuAI.setHashSize(4)
+        batch.join()
+        assert GomokuAI.getHashSize() == 4
+        assert (results["depths"] >= 1).all()
+
+
+class TestSearchThreads:
+
+    def teardown_method(self):
+        GomokuAI.setThreadCount(0)
+        GomokuAI.setQuiescence(True)
+        GomokuAI.setSelectiveSearch(True)
+
+    def test_thread_count(self):
+        GomokuAI.setThreadCount(3)
+        assert GomokuAI.getThreadCount() == 3
+        GomokuAI.setThreadCount(0)
+        assert GomokuAI.getThreadCount() >= 1
+
+    @pytest.mark.parametrize("threads", [2, 4])
+    def test_same_score_with_any_thread_count(self, threads):
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 8), (8, 11)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 9), (10, 10), (11, 9), (7, 9)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+
+        # The selective search depends on what the helpers leave in the table
+        GomokuAI.setSelectiveSearch(False)
+        GomokuAI.setThreadCount(1)
+        GomokuAI.clearHash()
+        expected, _ = GomokuAI(game).minmax(4, True, True)
+
+        GomokuAI.setThreadCount(threads)
+        GomokuAI.clearHash()
+        score, move = GomokuAI(game).minmax(4, True, True)
+        assert score == expected
+        assert game.isLegalMove(*move)
+
+        GomokuAI.setQuiescence(False)
+        GomokuAI.clearHash()
+        assert GomokuAI(game).minmax(2, True, True)[0] == _reference_minmax(game.clone(), 2, True)
+
+    def test_single_forced_move_with_helpers(self):
+        game = Gomoku()
+        game.addTiles([(9, 5), (9, 6), (9, 7), (9, 8), (10, 7)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 7)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.BLACK.value)
+        game.makeMove(9, 9)
+
+        GomokuAI.setThreadCount(1)
+        GomokuAI.clearHash()
+        expected = GomokuAI(game).minmax(3, True, True)
+
+        GomokuAI.setThreadCount(3)
+        GomokuAI.clearHash()
+        assert GomokuAI(game).minmax(3, True, True) == expected
+
+    def test_time_limit_with_helpers(self):
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 8), (8, 11)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 9), (10, 10), (11, 9), (7, 9)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+
+        GomokuAI.setThreadCount(2)
+        ai = GomokuAI(game)
+        _, move = ai.minmax(11, True, True, 100)
+        assert ai.getDepthReached() >= 1
+        assert ai.getElapsedMs() < 1000
+        assert game.isLegalMove(*move)
+
+
+class TestBackgroundSearch:
+
+    def _position(self):
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 8), (8, 11)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 9), (10, 10), (11, 9), (7, 9)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        return game
+
+    def _wait_for_depth(self, ai, depth, timeout=5.0):
+        deadline = time.time() + timeout
+        while ai.getProgress().depth < depth and time.time() < deadline:
+            time.sleep(0.005)
+        return ai.getProgress()
+
+    def test_search_releases_the_gil(self):
+        ai = GomokuAI(self._position())
+        result = []
+        thread = threading.Thread(target=lambda: result.append(ai.minmax(11, True, True, 300)))
+        thread.start()
+        # This thread keeps running Python code while the search runs
+        progress = self._wait_for_depth(ai, 1)
+        assert progress.running
+        assert thread.is_alive()
+        thread.join()
+        assert len(result) == 1
+
+    def test_stop_interrupts_the_search(self):
+        ai = GomokuAI(self._position())
+        result = []
+        thread = threading.Thread(target=lambda: result.append(ai.minmax(11, True, True)))
+        thread.start()
+        progress = self._wait_for_depth(ai, 2)
+        ai.stop()
+        thread.join(1.0)
+        assert not thread.is_alive()
+        _, move = result[0]
+        assert ai.getDepthReached() >= progress.depth
+        assert self._position().isLegalMove(*move)
+        assert not ai.getProgress().running
+
+    def test_stop_as_the_search_starts(self):
+        # A stop() racing with the start of minmax must not be lost
+        for _ in range(20):
+            ai = GomokuAI(self._position())
+            thread = threading.Thread(target=ai.minmax, args=(11, True, True), daemon=True)
+            thread.start()
+            ai.stop()
+            thread.join(5.0)
+            assert not thread.is_alive()
+
+    def test_progress_of_a_finished_search(self):
+        ai = GomokuAI(self._position())
+        score, move = ai.minmax(3, True, False)
+        progress = ai.getProgress()
+        assert not progress.running
+        assert progress.depth == ai.getDepthReached() == 3
+        assert progress.best_move == move
+        assert progress.score == score
+        assert progress.nodes >= ai.getNodesSearched() > 0
+        assert progress.nodes_per_second > 0
+
+    def test_ponder_move(self):
+        game = self._position()
+        ai = GomokuAI(game)
+        assert ai.getPonderMove() == (-1, -1)
+        _, move = ai.minmax(3, True, False)
+        game.processMove(*move)
+        ponder_move = ai.getPonderMove()
+        assert ponder_move != (-1, -1)
+        assert game.isLegalMove(*ponder_move)
+
+    def test_ponder_hits_and_misses(self, session):
+        from src.ui.ai_worker import Ponderer
+
+        _, move = session.best_move(0, 3)
+        session.push_move(*move)
+        ponder_move = session.getPonderMove()
+        hash_before = session.game().getHash()
+
+        ponderer = Ponderer()
+        ponderer.start(session, 3)
+        worker = ponderer.take(ponder_move)
+        assert worker is not None
+        # The ponder search goes on as the search of the position after the reply
+        worker.cancel()
+        assert session.game().getMoveCount() == 10
+        assert session.game().isLegalMove(*worker.result[1])
+        session.pop_move()
+
+        ponderer.start(session, 3)
+        other = next(cell for cell in session.game().getAllCloseMoves() if tuple(cell) != ponder_move)
+        assert ponderer.take(tuple(other)) is None
+        # The pondered reply was taken back
+        assert session.game().getHash() == hash_before
+        assert (ponderer.hits, ponderer.total) == (1, 2)
+        assert ponderer.hit_rate() == 0.5
+
+    def test_ui_worker_cancel(self, session):
+        from src.ui.ai_worker import AiWorker
+
+        worker = AiWorker(session, 11, 0)
+        self._wait_for_depth(session, 1)
+        assert not worker.done()
+        worker.cancel()
+        assert worker.done()
+        assert worker.result is not None
+
+
+class TestEngineSession:
+
+    def test_follows_the_game(self, session):
+        game = Gomoku()
+        for move in SESSION_MOVES:
+            game.processMove(*move)
+        assert session.game().getHash() == game.getHash()
+        assert np.array_equal(session.game().getBoard(), game.getBoard())
+
+    def test_pop_move(self, session):
+        hash_before = session.game().getHash()
+        session.push_move(9, 11)
+        assert session.pop_move()
+        assert session.game().getHash() == hash_before
+        assert session.game().getCurrentPlayer() == PlayerToken.BLACK.value
+
+        empty = EngineSession()
+        assert not empty.pop_move()
+
+    def test_rejected_move(self, session):
+        hash_before = session.game().getHash()
+        assert not session.push_move(9, 9)[0]
+        assert session.game().getHash() == hash_before
+
+    def test_best_move_for_the_side_to_move(self, session):
+        GomokuAI.setThreadCount(1)
+        game = session.game().clone()
+        # Black to move: the search minimizes the WHITE-positive score
+        GomokuAI.clearHash()
+        expected = GomokuAI(game).minmax(3, False, False)
+        GomokuAI.clearHash()
+        analysis = session.analyze(3)
+        GomokuAI.setThreadCount(0)
+        assert (analysis.score, analysis.best_move) == expected
+        assert analysis.depth == 3
+        assert analysis.nodes > 0
+
+        score, move = session.best_move(0, 3)
+        assert session.game().isLegalMove(*move)
+
+    def test_principal_variation(self, session):
+        analysis = session.analyze(4)
+        assert analysis.pv[0] == analysis.best_move
+        assert 1 < len(analysis.pv) <= 4
+        game = session.game().clone()
+        for move in analysis.pv:
+            assert game.isLegalMove(*move)
+            game.makeMove(*move)
+
+    def test_analysis_lines(self, session):
+        analysis = session.analyze(3, 0, 3)
+        assert len(analysis.lines) == 3
+        assert analysis.lines[0].move == analysis.best_move
+        assert analysis.lines[0].pv == analysis.pv
+        scores = [line.score for line in analysis.lines]
+        assert scores == sorted(scores)  # Black to move: the best scores are the lowest
+        assert not analysis.cached
+
+    def test_analyses_are_cached(self, session):
+        first = session.analyze(4, 0, 3)
+        again = session.analyze(3, 0, 2)
+        assert again.cached and again.nodes == 0
+        assert again.depth == 4
+        assert [line.move for line in again.lines] == [line.move for line in first.lines[:2]]
+        # The AI move of a position already analysed is one of the best lines
+        score, move = session.best_move(500, 4)
+        assert (score, move) in [(line.score, line.move) for line in first.lines if line.score == first.score]
+        assert session.getProgress().depth == 4
+        # Deeper, or more lines, is searched again
+        assert not session.analyze(4, 0, 4).cached
+        assert not session.analyze(5, 0, 1).cached
+
+        session.push_move(*first.best_move)
+        assert not session.analyze(2).cached
+        session.pop_move()
+        # The last analysis of the position is kept
+        assert session.analyze(5).cached
+
+    def test_analyses_are_capped(self):
+        session = EngineSession()
+        session.push_move(9, 9)
+        session.analyze(1)
+        # Positions with two more stones, until more than MAX_ANALYSES were analysed
+        analysed = 1
+        cells = [(row, col) for row in range(19) for col in range(19)]
+        for first in cells:
+            if analysed > EngineSession.MAX_ANALYSES:
+                break
+            if not session.push_move(*first)[0]:
+                continue
+            for second in cells[::7]:
+                if session.push_move(*second)[0]:
+                    session.analyze(1)
+                    analysed += 1
+                    session.pop_move()
+            session.pop_move()
+            assert session.analysisCount() <= EngineSession.MAX_ANALYSES
+        # The oldest analysis was forgotten
+        assert not session.analyze(1).cached
+
+    def test_stop_until_the_position_changes(self, session):
+        session.stop()
+        session.best_move(0, 11)
+        assert session.getProgress().depth == 0
+        session.push_move(9, 11)
+        session.analyze(2)
+        assert session.getProgress().depth == 2
+
+
+class TestMultiPV:
+
+    def setup_method(self):
+        # The reference has no quiescence search, and the threat search would answer alone
+        GomokuAI.setQuiescence(False)
+        GomokuAI.setThreatSearch(False)
+        GomokuAI.setThreadCount(1)
+
+    def teardown_method(self):
+        GomokuAI.setQuiescence(True)
+        GomokuAI.setThreatSearch(True)
+        GomokuAI.setThreadCount(0)
+
+    def _position(self):
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 8), (8, 11)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 9), (10, 10), (11, 9), (7, 9)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        return game
+
+    @staticmethod
+    def _reference_root_scores(game, depth):
+        """Score of each legal root move for WHITE to move, as _reference_minmax scores it."""
+        scores = []
+        for row, col in game.getAllCloseMoves():
+            if not game.isLegalMove(row, col):
+                continue
+            _, _, move_score = game.makeMove(row, col)
+            if game.getGameStatus():
+                value = 1e6 + depth
+            else:
+                value = move_score + depth
+                if depth > 1:
+                    value = _reference_minmax(game, depth - 1, False, value)
+            game.unmakeMove()
+            scores.append(value)
+        return sorted(scores, reverse=True)
+
+    @pytest.mark.parametrize("depth", [1, 2, 3])
+    def test_scores_match_plain_minimax(self, depth):
+        game = self._position()
+        GomokuAI.clearHash()
+        ai = GomokuAI(game)
+        ai.setMultiPV(5)
+        score, move = ai.minmax(depth, True, False)
+        candidates = ai.getCandidates()
+        assert [candidate[0] for candidate in candidates] == self._reference_root_scores(game.clone(), depth)[:5]
+        assert candidates[0] == (score, move)
+        assert len({candidate[1] for candidate in candidates}) == 5
+
+    def test_single_pv_by_default(self):
+        ai = GomokuAI(self._position())
+        assert ai.getMultiPV() == 1
+        assert ai.getCandidates() == []
+        result = ai.minmax(2, True, False)
+        assert ai.getCandidates() == [result]
+
+    def test_principal_variation_of_each_candidate(self):
+        game = self._position()
+        ai = GomokuAI(game)
+        ai.setMultiPV(3)
+        ai.minmax(3, True, False)
+        for _, move in ai.getCandidates():
+            line = ai.getPrincipalVariation(move)
+            assert line[0] == move
+            replay = game.clone()
+            for cell in line:
+                assert replay.isLegalMove(*cell)
+                replay.makeMove(*cell)
+
+
+class TestBatchAnalysis:
+
+    def setup_method(self):
+        # The reference has no quiescence search, and the threat search would answer alone
+        GomokuAI.setQuiescence(False)
+        GomokuAI.setThreatSearch(False)
+
+    def teardown_method(self):
+        GomokuAI.setQuiescence(True)
+        GomokuAI.setThreatSearch(True)
+
+    @staticmethod
+    def _games():
+        """Mid-game positions, BLACK or WHITE to move, some after captures."""
+        records = [
+            [(9, 9), (9, 10), (10, 10), (8, 8), (11, 11), (12, 12), (10, 9)],
+            [(9, 9), (9, 10), (9, 11), (8, 10), (10, 10), (7, 10), (6, 10), (9, 8)],
+            [(9, 9), (9, 10), (5, 5), (9, 11), (9, 12), (6, 6), (10, 10), (7, 7)],
+        ]
+        games = []
+        for moves in records:
+            game = Gomoku()
+            for move in moves:
+                game.makeMove(*move)
+            games.append(game)
+        return games
+
+    @staticmethod
+    def _arrays(games):
+        boards = np.stack([game.to_array() for game in games])
+        sides = np.array([game.getCurrentPlayer() for game in games])
+        captures = np.array([(game.getBlackPlayerPebblesTaken(), game.getWhitePlayerPebblesTaken()) for game in games])
+        return boards, sides, captures
+
+    def test_shapes_and_types(self):
+        games = self._games()
+        results = analyze_batch(*self._arrays(games), 2, threads=2)
+        assert results["moves"].shape == (len(games), 2)
+        assert results["scores"].dtype == np.float64 and results["scores"].shape == (len(games),)
+        assert results["nodes"].dtype == np.uint64 and (results["nodes"] > 0).all()
+        assert (results["depths"] == 2).all()
+        for game, move in zip(games, results["moves"]):
+            assert game.isLegalMove(*move)
+
+    @pytest.mark.parametrize("threads", [1, 2])
+    def test_scores_match_single_searches(self, threads):
+        games = self._games()
+        assert games[2].getBlackPlayerPebblesTaken() == 2
+        boards, sides, captures = self._arrays(games)
+        GomokuAI.clearHash()
+        results = analyze_batch(boards, sides, captures, 3, threads=threads)
+        for board, side, (black, white), score in zip(boards, sides, captures, results["scores"]):
+            # The same position without its history: its score starts from 0
+            game = Gomoku()
+            game.from_array(board)
+            game.setCurrentPlayer(int(side))
+            game.setBlackPlayerPebblesTaken(int(black))
+            game.setWhitePlayerPebblesTaken(int(white))
+            is_maximizing = side == PlayerToken.WHITE.value
+            GomokuAI.clearHash()
+            assert score == GomokuAI(game).minmax(3, is_maximizing, False)[0]
+            assert score == _reference_minmax(game.clone(), 3, is_maximizing)
+
+    def test_time_per_position(self):
+        results = analyze_batch(*self._arrays(self._games()), 0.05)
+        assert (results["depths"] >= 1).all()
+
+    def test_invalid_positions(self):
+        boards, sides, captures = self._arrays(self._games())
+        with pytest.raises(ValueError):
+            analyze_batch(boards, sides[:2], captures, 2)
+        with pytest.raises(ValueError):
+            analyze_batch(boards, np.zeros_like(sides), captures, 2)
+
+    def test_annotate_game_record(self, tmp_path):
+        record = tmp_path / "games.txt"
+        record.write_text("# two games\nnormal 9,9 9,10 10,10 8,8\n\nspecial 9,9 9,10 10,10\n")
+        output = io.StringIO()
+        with open(record) as lines:
+            analyze_games.annotate(lines, output, 2, batch_size=2)
+        header, *rows = output.getvalue().splitlines()
+        assert header.split("\t") == analyze_games.COLUMNS
+        assert [row.split("\t")[:4] for row in rows] == [
+            ["0", "1", "black", "9,9"], ["0", "2", "white", "9,10"],
+            ["0", "3", "black", "10,10"], ["0", "4", "white", "8,8"],
+            ["1", "1", "black", "9,9"], ["1", "2", "white", "9,10"], ["1", "3", "black", "10,10"],
+        ]
+
+    def test_board_size_of_the_game_type(self):
+        output = io.StringIO()
+        analyze_games.annotate(["special 7,7 7,8 8,8 6,6\n", "duo 9,9 9,10\n"], output, 2)
+        rows = [row.split("\t") for row in output.getvalue().splitlines()[1:]]
+        special = [tuple(map(int, row[4].split(","))) for row in rows if row[0] == "0" and row[1] != "1"]
+        assert special and all(0 <= row < 15 and 0 <= col < 15 for row, col in special)
+        assert len(rows) == 6
+
+    def test_unknown_game_type_in_record(self):
+        with pytest.raises(ValueError, match="unknown game type"):
+            analyze_games.annotate(["renju 9,9\n"], io.StringIO(), 1)
+
+    def test_illegal_move_in_record(self):
+        with pytest.raises(ValueError, match="line 1"):
+            analyze_games.annotate(["normal 9,9 9,9\n"], io.StringIO(), 1)
+
+
+class TestMoveOrdering:
+
+    def setup_method(self):
+        # The threat search would answer the won positions before the ordering matters
+        GomokuAI.setThreatSearch(False)
+
+    def teardown_method(self):
+        GomokuAI.setThreatSearch(True)
+
+    def _position(self):
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 8), (8, 11)], PlayerToken.BLACK.value)
+        game.addTiles([(8, 9), (10, 10), (11, 9), (7, 9)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        return game
+
+    def test_search_is_deterministic(self):
+        GomokuAI.setThreadCount(1)
+        results = set()
+        for _ in range(3):
+            GomokuAI.clearHash()
+            ai = GomokuAI(self._position())
+            # Without the random pick among equal root moves
+            score, move = ai.minmax(4, True, False)
+            results.add((score, move, ai.getNodesSearched()))
+        GomokuAI.setThreadCount(0)
+        assert len(results) == 1
+
+    def test_random_pick_among_equal_root_moves(self):
+        game = Gomoku()
+        game.addTiles([(9, 9)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        moves = {GomokuAI(game).minmax(1, True, True)[1] for _ in range(40)}
+        assert len(moves) > 1
+
+    def test_winning_move_is_searched_first(self):
+        game = Gomoku()
+        game.addTiles([(5, 5), (5, 6), (5, 7), (5, 8)], PlayerToken.WHITE.value)
+        game.addTiles([(6, 5), (6, 6), (6, 7), (12, 12)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        GomokuAI.clearHash()
+        ai = GomokuAI(game)
+        score, move = ai.minmax(1, True, True)
+        assert score >= 1e6 and move in [(5, 4), (5, 9)]
+        # The win is tried first (once per aspiration window), then every other move
+        # is searched once, to be proven no better
+        assert ai.getNodesSearched() <= len(game.getAllCloseMoves()) + 2
+
+
+class TestThreatSearch:
+
+    def _double_four(self, attacker=PlayerToken.WHITE.value):
+        game = Gomoku()
+        game.addTiles([(5, 5), (5, 6), (5, 7), (6, 8), (7, 8), (8, 8)], attacker)
+        game.addTiles([(5, 4), (9, 8)], -attacker)
+        game.setCurrentPlayer(attacker)
+        return game
+
+    def test_vcf_double_four(self):
+        game = self._double_four()
+        result = solveVCF(game)
+        assert result and result.complete
+        assert result.sequence[0] == (5, 8)
+        for move in result.sequence:
+            assert not game.getGameStatus()
+            game.makeMove(*move)
+        assert game.getGameStatus()
+
+    def test_vcf_stopped_by_a_capture(self):
+        # Black at (4, 6) captures (5, 7) and (6, 8) after the double four
+        game = self._double_four()
+        game.addTiles([(4, 6)], PlayerToken.BLACK.value)
+        result = solveVCF(game)
+        assert not result.win
+        assert result.complete
+
+    def test_vcf_uses_the_double_three_ban(self):
+        game = Gomoku()
+        game.addTiles([(5, 5), (5, 6), (5, 7)], PlayerToken.WHITE.value)
+        game.addTiles([(5, 4), (6, 9), (7, 9)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        assert not solveVCF(game).win
+
+        # Black can no longer block at (5, 9): it would make two free threes
+        game.addTiles([(6, 10), (7, 11)], PlayerToken.BLACK.value)
+        result = solveVCF(game)
+        assert result.win and result.sequence == [(5, 8)]
+
+    def test_vct_win_without_vcf(self):
+        game = Gomoku(19, "special")
+        game.addTiles([(7, 9), (9, 8), (9, 9), (11, 7), (11, 9)], PlayerToken.WHITE.value)
+        game.addTiles([(10, 10), (8, 11), (11, 10)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        result = solveVCF(game)
+        assert not result.win and result.complete
+        result = solveVCT(game, max_depth=3)
+        assert result.win and result.complete
+        assert result.sequence[0] == (8, 9)
+
+        # Deeper than the search itself
+        score, move = GomokuAI(game).minmax(1, True, False)
+        assert score >= 1e6 and move == (8, 9)
+
+    def test_node_budget(self):
+        game = Gomoku(19, "special")
+        game.addTiles([(7, 9), (9, 8), (9, 9), (11, 7), (11, 9)], PlayerToken.WHITE.value)
+        game.addTiles([(10, 10), (8, 11), (11, 10)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        result = solveVCT(game, max_nodes=20)
+        assert not result.win and not result.complete
+        assert result.nodes <= 20
+
+    def test_search_plays_the_vcf(self):
+        GomokuAI.clearHash()
+        score, move = GomokuAI(self._double_four()).minmax(1, True, False)
+        assert score >= 1e6 and move == (5, 8)
+
+    def test_search_stops_the_opponent_vcf(self):
+        game = self._double_four(PlayerToken.BLACK.value)
+        game.addTiles([(12, 12)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        assert solveVCF(game.clone()).win is False
+        GomokuAI.clearHash()
+        _, move = GomokuAI(game).minmax(2, True, False)
+        game.makeMove(*move)
+        assert not solveVCF(game).win
+
+
+class TestCaptureRace:
+
+    def _position(self, white_taken=6, to_move=PlayerToken.WHITE.value):
+        # Three black pairs white can capture, at (9, 11), (7, 5) and (12, 14)
+        game = Gomoku(19, "normal")
+        game.addTiles([(9, 9), (9, 10), (5, 5), (6, 5), (12, 12), (12, 13)], PlayerToken.BLACK.value)
+        game.addTiles([(9, 8), (4, 5), (12, 11), (15, 2)], PlayerToken.WHITE.value)
+        game.setWhitePlayerPebblesTaken(white_taken)
+        game.setCurrentPlayer(to_move)
+        return game
+
+    def test_wins_by_captures(self):
+        game = self._position()
+        assert not solveVCF(game).win
+        result = solveCaptureRace(game)
+        assert result.win and result.complete
+        for move in result.sequence:
+            game.makeMove(*move)
+        assert game.getGameStatus()
+        assert game.getWhitePlayerPebblesTaken() == 10
+
+    def test_no_race_below_6_stones(self):
+        result = solveCaptureRace(self._position(white_taken=4))
+        assert not result.win and result.complete
+
+    def test_search_plays_the_race(self):
+        game = self._position()
+        GomokuAI.clearHash()
+        score, move = GomokuAI(game).minmax(3, True, False)
+        assert score >= 1e6
+        assert move == solveCaptureRace(game).sequence[0]
+
+    def test_search_stops_the_race(self):
+        game = self._position(to_move=PlayerToken.BLACK.value)
+        GomokuAI.clearHash()
+        _, move = GomokuAI(game).minmax(3, False, False)
+        game.makeMove(*move)
+        assert not solveCaptureRace(game).win
+
+
+class TestQuiescence:
+
+    def setup_method(self):
+        GomokuAI.setThreadCount(1)
+        GomokuAI.setThreatSearch(False)
+
+    def teardown_method(self):
+        GomokuAI.setThreadCount(0)
+        GomokuAI.setThreatSearch(True)
+        GomokuAI.setQuiescence(True)
+
+    def _search(self, game, depth, quiescence):
+        GomokuAI.setQuiescence(quiescence)
+        GomokuAI.clearHash()
+        ai = GomokuAI(game)
+        score, move = ai.minmax(depth, True, False)
+        return score, move, ai
+
+    def test_win_beyond_the_horizon(self):
+        # White wins with (7, 8) or (7, 12) by rebuilding its four after each capture
+        # of black: the plain search needs depth 8 to see it
+        game = TestIterativeDeepening()._position()
+        score, _, _ = self._search(game, 3, False)
+        assert score < 1e6
+        score, move, _ = self._search(game, 3, True)
+        assert score >= 1e6 and move in [(7, 8), (7, 12)]
+
+    def test_best_move_stable_across_depths(self):
+        # The white pair (9, 9) (9, 10) can be captured at (9, 11)
+        game = Gomoku()
+        game.addTiles([(9, 9), (9, 10), (10, 12), (11, 12)], PlayerToken.WHITE.value)
+        game.addTiles([(9, 8), (8, 8), (12, 9), (10, 6)], PlayerToken.BLACK.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        moves = {self._search(game, depth, True)[1] for depth in [1, 2, 3]}
+        assert moves == {(9, 12)}
+        assert self._search(game, 1, False)[1] != (9, 12)
+
+    def test_node_budget(self):
+        game = TestIterativeDeepening()._position()
+        _, _, ai = self._search(game, 3, False)
+        assert ai.getQuiescenceNodes() == 0
+        _, _, ai = self._search(game, 3, True)
+        # At most 32 moves for each leaf
+        assert 0 < ai.getQuiescenceNodes() <= 32 * ai.getNodesSearched()
+
+
+class TestSelectiveSearch:
+
+    # (game type, black, white, best moves): forced wins, then the only defenses
+    TACTICS = [
+        ("special", [(6, 10), (7, 6), (8, 8), (10, 6), (10, 8), (10, 9), (11, 12), (12, 12)],
+         [(6, 6), (6, 7), (6, 12), (7, 12), (9, 9), (9, 12), (11, 11), (12, 8)], [(8, 12)]),
+        ("normal", [(6, 6), (7, 9), (8, 8), (9, 6), (9, 10), (10, 6), (10, 7), (10, 12), (11, 6), (12, 10)],
+         [(6, 7), (6, 9), (6, 10), (7, 7), (8, 10), (9, 7), (9, 11), (10, 9), (11, 7), (12, 11)], [(6, 11)]),
+        ("normal", [(8, 6), (9, 6), (9, 11), (10, 8), (10, 9), (11, 6), (11, 10), (12, 7)],
+         [(6, 9), (6, 10), (7, 9), (8, 9), (9, 8), (10, 10), (11, 7), (12, 9)], [(5, 9)]),
+        ("special", [(6, 8), (8, 7), (9, 10), (9, 11), (10, 8), (10, 9), (10, 10), (11, 8), (12, 10)],
+         [(6, 11), (6, 12), (7, 9), (7, 10), (9, 8), (10, 6), (11, 6), (11, 9), (12, 11)], [(5, 12)]),
+        ("normal", [(6, 6), (7, 7), (8, 9), (9, 9), (10, 10), (10, 11), (11, 6), (11, 9), (12, 6)],
+         [(6, 9), (7, 11), (7, 12), (9, 8), (9, 11), (9, 12), (10, 8), (12, 10), (12, 11)], [(8, 8)]),
+        ("special", [(6, 7), (7, 8), (7, 12), (8, 6), (9, 10), (9, 12), (10, 10), (11, 9), (12, 8)],
+         [(6, 8), (7, 9), (10, 6), (10, 11), (10, 12), (11, 8), (12, 7), (12, 9), (12, 12)], [(9, 11)]),
+    ]
+
+    def setup_method(self):
+        GomokuAI.setThreadCount(1)
+        GomokuAI.setThreatSearch(False)
+
+    def teardown_method(self):
+        GomokuAI.setThreadCount(0)
+        GomokuAI.setThreatSearch(True)
+        GomokuAI.setSelectiveSearch(True)
+
+    @pytest.mark.parametrize("game_type, black, white, best_moves", TACTICS)
+    def test_tactical_positions(self, game_type, black, white, best_moves):
+        game = Gomoku(19, game_type)
+        game.addTiles(black, PlayerToken.BLACK.value)
+        game.addTiles(white, PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+        GomokuAI.clearHash()
+        _, move = GomokuAI(game).minmax(4, True, False)
+        assert move in best_moves
+
+    @pytest.mark.parametrize("game_type", ["normal", "special"])
+    def test_counters(self, game_type):
+        game = Gomoku(19, game_type)
+        game.addTiles([(9, 9), (10, 11), (7, 7)], PlayerToken.BLACK.value)
+        game.addTiles([(9, 10), (8, 8)], PlayerToken.WHITE.value)
+        game.setCurrentPlayer(PlayerToken.WHITE.value)
+
+        GomokuAI.setSelectiveSearch(False)
+        GomokuAI.clearHash()
+        full = GomokuAI(game)
+        full.minmax(5, True, False)
+        assert full.getReductions() == full.getResearches() == full.getNullMoveCutoffs() == 0
+
+        GomokuAI.setSelectiveSearch(True)
+        GomokuAI.clearHash()
+        ai = GomokuAI(game)
+        ai.minmax(5, True, False)
+        assert 0 < ai.getResearches() < ai.getReductions()
+        assert ai.getNullMoveCutoffs() > 0
+        assert ai.getNodesSearched() < full.getNodesSearched()
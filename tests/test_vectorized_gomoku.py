@@ -0,0 +1,88 @@
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+from src.game._gomoku import Gomoku
+from src.game._vectorized_gomoku import VectorizedGomoku
+from src.game.playerTokens import PlayerToken
+
+
+def game_state(game):
+    return (
+        game.board.tolist(),
+        game.current_player,
+        game.white_player_pebbles_taken,
+        game.black_player_pebbles_taken,
+        list(game.forced_moves),
+        game.game_over,
+        game.get_all_close_moves(),
+        game._get_number_of_threats(PlayerToken.WHITE.value),
+        game._get_number_of_threats(PlayerToken.BLACK.value),
+        game._get_all_pebble_of_player(PlayerToken.BLACK.value),
+    )
+
+
+class TestVectorizedGomoku:
+
+    def test_board_is_int8(self):
+        game = VectorizedGomoku()
+        assert game.board.dtype == np.int8
+        assert game.copy().board.dtype == np.int8
+        assert isinstance(game.copy(), VectorizedGomoku)
+
+    def test_close_moves_on_the_edge(self):
+        game = VectorizedGomoku()
+        game.board[0, 0] = PlayerToken.BLACK.value
+        assert game.get_all_close_moves() == [(0, 1), (1, 0), (1, 1)]
+
+    def test_capture_in_two_directions(self):
+        game = VectorizedGomoku()
+        game.board[5, 6] = game.board[5, 7] = PlayerToken.WHITE.value
+        game.board[6, 5] = game.board[7, 5] = PlayerToken.WHITE.value
+        game.board[5, 8] = game.board[8, 5] = PlayerToken.BLACK.value
+
+        assert game.process_move(5, 5) == (True, "valid_move")
+        assert game.black_player_pebbles_taken == 4
+        assert game._get_all_pebble_of_player(PlayerToken.WHITE.value) == []
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_same_rules_as_the_loop_version(self, seed):
+        rng = random.Random(seed)
+        loop_game, vectorized_game = Gomoku(), VectorizedGomoku()
+        for _ in range(100):
+            moves = loop_game.forced_moves or loop_game.get_all_close_moves() or [(9, 9)]
+            move = rng.choice(moves)
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert loop_game.process_move(*move) == vectorized_game.process_move(*move)
+            assert game_state(loop_game) == game_state(vectorized_game)
+            if loop_game.game_over:
+                break
+
+
+@pytest.mark.parametrize("engine", [Gomoku, VectorizedGomoku])
+class TestBreakableFive:
+
+    def test_capture_that_breaks_the_five_is_forced(self, engine):
+        game = engine()
+        for col in range(5, 9):
+            game.board[9, col] = PlayerToken.BLACK.value
+        game.board[10, 7] = PlayerToken.BLACK.value
+        game.board[8, 7] = PlayerToken.WHITE.value
+
+        assert game.process_move(9, 9) == (True, "valid_move")
+        assert game.forced_moves == [(11, 7)]
+        assert not game.game_over
+
+    def test_capture_outside_the_five_does_not_break_it(self, engine):
+        game = engine()
+        for col in range(5, 9):
+            game.board[9, col] = PlayerToken.BLACK.value
+        game.board[11, 7] = game.board[12, 7] = PlayerToken.BLACK.value
+        game.board[10, 7] = PlayerToken.WHITE.value
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert game.process_move(9, 9) == (True, "win_alignments")
+        assert game.forced_moves == []
+        assert game.game_over